@@ -8,7 +8,7 @@ import os
 import sys
 import threading
 from time import monotonic
-from typing import TYPE_CHECKING, Any, Dict, Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
 
 import voluptuous as vol
 import yarl
@@ -21,10 +21,15 @@ from homeassistant.const import (
     REQUIRED_NEXT_PYTHON_VER,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_per_platform, storage
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
+    DATA_IMPORT_TIME,
+    DATA_PLATFORMS_LOADED,
     DATA_SETUP,
     DATA_SETUP_STARTED,
+    DATA_SETUP_TIME,
+    async_preimport_integrations,
     async_set_domains_to_be_loaded,
     async_setup_component,
 )
@@ -49,6 +54,9 @@ STAGE_2_TIMEOUT = 300
 WRAP_UP_TIMEOUT = 300
 COOLDOWN_TIME = 60
 
+IMPORT_PROFILE_STORAGE_KEY = "core.import_profile"
+IMPORT_PROFILE_STORAGE_VERSION = 1
+
 DEBUGGER_INTEGRATIONS = {"debugpy", "ptvsd"}
 CORE_INTEGRATIONS = ("homeassistant", "persistent_notification")
 LOGGING_INTEGRATIONS = {
@@ -385,6 +393,86 @@ def _get_domains(hass: core.HomeAssistant, config: Dict[str, Any]) -> Set[str]:
     return domains
 
 
+def _get_config_platforms(
+    config: Dict[str, Any], domains: Set[str]
+) -> Dict[str, Set[str]]:
+    """Return the platforms configured per integration."""
+    platforms: Dict[str, Set[str]] = {}
+    for domain in domains:
+        for p_name, _ in config_per_platform(config, domain):
+            if isinstance(p_name, str):
+                platforms.setdefault(p_name, set()).add(domain)
+    return platforms
+
+
+async def _async_preimport_integrations(
+    hass: core.HomeAssistant,
+    integration_cache: Dict[str, loader.Integration],
+    platforms: Dict[str, Set[str]],
+    profile: Dict[str, Any],
+) -> List[str]:
+    """Start importing the integrations to set up and the configured platforms.
+
+    The integrations that took the longest to import last time are started
+    first. Returns the domains of the integrations being imported.
+    """
+    integrations = dict(integration_cache)
+    for int_or_exc in await asyncio.gather(
+        *(
+            loader.async_get_integration(hass, domain)
+            for domain in platforms
+            if domain not in integrations
+        ),
+        return_exceptions=True,
+    ):
+        if isinstance(int_or_exc, loader.Integration):
+            await int_or_exc.resolve_dependencies()
+            integrations[int_or_exc.domain] = int_or_exc
+
+    to_import = {
+        domain: set(platforms.get(domain, ()))
+        | set(profile.get(domain, {}).get("platforms", ()))
+        for domain in integrations
+    }
+    async_preimport_integrations(
+        hass,
+        sorted(
+            integrations.values(),
+            key=lambda itg: profile.get(itg.domain, {}).get("import", 0),
+            reverse=True,
+        ),
+        to_import,
+    )
+    return list(integrations)
+
+
+@core.callback
+def _async_save_import_profile(
+    hass: core.HomeAssistant,
+    store: storage.Store,
+    profile: Dict[str, Any],
+    domains: List[str],
+) -> None:
+    """Store how long the integrations took to import and set up this time."""
+    measurements = {
+        "import": hass.data.get(DATA_IMPORT_TIME, {}),
+        "setup": hass.data.get(DATA_SETUP_TIME, {}),
+    }
+    platforms_loaded = hass.data.get(DATA_PLATFORMS_LOADED, {})
+
+    new_profile = {}
+    for domain in domains:
+        entry = dict(profile.get(domain, {}))
+        for key, times in measurements.items():
+            if domain in times:
+                entry[key] = round(times[domain], 3)
+        if domain in platforms_loaded:
+            entry["platforms"] = sorted(platforms_loaded[domain])
+        new_profile[domain] = entry
+
+    hass.async_create_task(store.async_save(new_profile))
+
+
 async def _async_log_pending_setups(
     domains: Set[str], setup_started: Dict[str, datetime]
 ) -> None:
@@ -472,6 +560,18 @@ async def _async_set_up_integrations(
 
     _LOGGER.info("Domains to be set up: %s", domains_to_setup)
 
+    # Import while the integrations are set up stage by stage
+    profile_store = storage.Store(
+        hass, IMPORT_PROFILE_STORAGE_VERSION, IMPORT_PROFILE_STORAGE_KEY, private=True
+    )
+    profile = await profile_store.async_load() or {}
+    preimported = await _async_preimport_integrations(
+        hass,
+        integration_cache,
+        _get_config_platforms(config, domains_to_setup),
+        profile,
+    )
+
     logging_domains = domains_to_setup & LOGGING_INTEGRATIONS
 
     # Load logging as soon as possible
@@ -551,3 +651,5 @@ async def _async_set_up_integrations(
             await hass.async_block_till_done()
     except asyncio.TimeoutError:
         _LOGGER.warning("Setup timed out for bootstrap - moving forward")
+
+    _async_save_import_profile(hass, profile_store, profile, preimported)
@@ -1,6 +1,5 @@
 """Allows the creation of a sensor that filters state property."""
 from collections import Counter, deque
-from copy import copy
 from datetime import timedelta
 from functools import partial
 import logging
@@ -190,27 +189,58 @@ class SensorFilter(Entity):
         if new_state is None or new_state.state in [STATE_UNKNOWN, STATE_UNAVAILABLE]:
             return
 
-        temp_state = new_state
+        value = _state_value(new_state.state)
+        timestamp = new_state.last_updated
 
         try:
             for filt in self._filters:
-                filtered_state = filt.filter_state(copy(temp_state))
+                filtered = filt.filter_value(value, timestamp)
                 _LOGGER.debug(
                     "%s(%s=%s) -> %s",
                     filt.name,
                     self._entity,
-                    temp_state.state,
-                    "skip" if filt.skip_processing else filtered_state.state,
+                    value,
+                    "skip" if filt.skip_processing else filtered,
                 )
                 if filt.skip_processing:
                     return
-                temp_state = filtered_state
+                value = filtered
         except ValueError:
-            _LOGGER.error("Could not convert state: %s to number", self._state)
+            _LOGGER.error("Could not convert state: %s to number", value)
             return
 
-        self._state = temp_state.state
+        self._state = value
+        self._update_from_source_attributes(new_state)
 
+        if update_ha:
+            self.async_write_ha_state()
+
+    @callback
+    def _replay_history(self, history_list):
+        """Pass the recorded states through the filter chain.
+
+        Each filter processes all values before the next one starts, values
+        a filter skips or cannot convert do not reach the later filters.
+        """
+        samples = [
+            (_state_value(state.state), state.last_updated, state)
+            for state in history_list
+            if state.state not in [STATE_UNKNOWN, STATE_UNAVAILABLE]
+        ]
+        for filt in self._filters:
+            if not samples:
+                return
+            samples = filt.filter_values(samples)
+
+        if samples:
+            self._state = samples[-1][0]
+            # The first state that made it through the chain, as when the
+            # states are processed one at a time
+            self._update_from_source_attributes(samples[0][2])
+
+    @callback
+    def _update_from_source_attributes(self, new_state):
+        """Take the icon and unit from the source state if not known yet."""
         if self._icon is None:
             self._icon = new_state.attributes.get(ATTR_ICON, ICON)
 
@@ -219,9 +249,6 @@ class SensorFilter(Entity):
                 ATTR_UNIT_OF_MEASUREMENT
             )
 
-        if update_ha:
-            self.async_write_ha_state()
-
     async def async_added_to_hass(self):
         """Register callbacks."""
 
@@ -282,8 +309,7 @@ class SensorFilter(Entity):
             )
 
             # Replay history through the filter chain
-            for state in history_list:
-                self._update_filter_sensor_state(state, False)
+            self._replay_history(history_list)
 
         self.async_on_remove(
             async_track_state_change_event(
@@ -322,34 +348,20 @@ class SensorFilter(Entity):
         return {ATTR_ENTITY_ID: self._entity}
 
 
-class FilterState:
-    """State abstraction for filter usage."""
-
-    def __init__(self, state):
-        """Initialize with HA State object."""
-        self.timestamp = state.last_updated
-        try:
-            self.state = float(state.state)
-        except ValueError:
-            self.state = state.state
-
-    def set_precision(self, precision):
-        """Set precision of Number based states."""
-        if isinstance(self.state, Number):
-            value = round(float(self.state), precision)
-            self.state = int(value) if precision == 0 else value
-
-    def __str__(self):
-        """Return state as the string representation of FilterState."""
-        return str(self.state)
-
-    def __repr__(self):
-        """Return timestamp and state as the representation of FilterState."""
-        return f"{self.timestamp} : {self.state}"
+def _state_value(state):
+    """Return a state as number if it is numeric."""
+    try:
+        return float(state)
+    except ValueError:
+        return state
 
 
 class Filter:
-    """Filter skeleton."""
+    """Filter skeleton.
+
+    Filters work on plain values and their timestamps. The previous values
+    are kept in a ring buffer of window_size values.
+    """
 
     def __init__(
         self,
@@ -365,10 +377,10 @@ class Filter:
         :param entity: used for debugging only
         """
         if isinstance(window_size, int):
-            self.states = deque(maxlen=window_size)
+            self.values = deque(maxlen=window_size)
             self.window_unit = WINDOW_SIZE_UNIT_NUMBER_EVENTS
         else:
-            self.states = deque(maxlen=0)
+            self.values = deque(maxlen=0)
             self.window_unit = WINDOW_SIZE_UNIT_TIME
         self.precision = precision
         self._name = name
@@ -393,23 +405,55 @@ class Filter:
         """Return whether the current filter_state should be skipped."""
         return self._skip_processing
 
-    def _filter_state(self, new_state):
+    @property
+    def states(self):
+        """Return the previous values, the former name of values."""
+        return self.values
+
+    def _filter_value(self, value, timestamp):
         """Implement filter."""
         raise NotImplementedError()
 
-    def filter_state(self, new_state):
-        """Implement a common interface for filters."""
-        fstate = FilterState(new_state)
-        if self._only_numbers and not isinstance(fstate.state, Number):
+    def filter_value(self, value, timestamp):
+        """Filter a value set at timestamp and return the filtered value.
+
+        Raises ValueError when the filter needs a number.
+        """
+        if self._only_numbers and not isinstance(value, Number):
             raise ValueError
 
-        filtered = self._filter_state(fstate)
-        filtered.set_precision(self.precision)
-        if self._store_raw:
-            self.states.append(copy(FilterState(new_state)))
-        else:
-            self.states.append(copy(filtered))
-        new_state.state = filtered.state
+        filtered = self._filter_value(value, timestamp)
+        if isinstance(filtered, Number):
+            filtered = round(float(filtered), self.precision)
+            if self.precision == 0:
+                filtered = int(filtered)
+        self.values.append(value if self._store_raw else filtered)
+        return filtered
+
+    def filter_values(self, samples):
+        """Filter a list of samples, oldest first.
+
+        A sample is a tuple of a value and its timestamp, further items are
+        passed on unchanged. The values go through filter_value one by one.
+        Returns the samples with their filtered values, without the samples
+        that were skipped or are not numbers.
+        """
+        filtered_samples = []
+        for value, timestamp, *extra in samples:
+            try:
+                filtered = self.filter_value(value, timestamp)
+            except ValueError:
+                _LOGGER.error("Could not convert state: %s to number", value)
+                continue
+            if not self._skip_processing:
+                filtered_samples.append((filtered, timestamp, *extra))
+        return filtered_samples
+
+    def filter_state(self, new_state):
+        """Filter the state of a State object in place and return it."""
+        new_state.state = self.filter_value(
+            _state_value(new_state.state), new_state.last_updated
+        )
         return new_state
 
 
@@ -438,34 +482,36 @@ class RangeFilter(Filter):
         self._upper_bound = upper_bound
         self._stats_internal = Counter()
 
-    def _filter_state(self, new_state):
+    def _filter_value(self, value, timestamp):
         """Implement the range filter."""
 
-        if self._upper_bound is not None and new_state.state > self._upper_bound:
+        if self._upper_bound is not None and value > self._upper_bound:
 
             self._stats_internal["erasures_up"] += 1
 
             _LOGGER.debug(
-                "Upper outlier nr. %s in %s: %s",
+                "Upper outlier nr. %s in %s: %s : %s",
                 self._stats_internal["erasures_up"],
                 self._entity,
-                new_state,
+                timestamp,
+                value,
             )
-            new_state.state = self._upper_bound
+            return self._upper_bound
 
-        elif self._lower_bound is not None and new_state.state < self._lower_bound:
+        if self._lower_bound is not None and value < self._lower_bound:
 
             self._stats_internal["erasures_low"] += 1
 
             _LOGGER.debug(
-                "Lower outlier nr. %s in %s: %s",
+                "Lower outlier nr. %s in %s: %s : %s",
                 self._stats_internal["erasures_low"],
                 self._entity,
-                new_state,
+                timestamp,
+                value,
             )
-            new_state.state = self._lower_bound
+            return self._lower_bound
 
-        return new_state
+        return value
 
 
 @FILTERS.register(FILTER_NAME_OUTLIER)
@@ -485,25 +531,26 @@ class OutlierFilter(Filter):
         self._stats_internal = Counter()
         self._store_raw = True
 
-    def _filter_state(self, new_state):
+    def _filter_value(self, value, timestamp):
         """Implement the outlier filter."""
 
-        median = statistics.median([s.state for s in self.states]) if self.states else 0
+        median = statistics.median(self.values) if self.values else 0
         if (
-            len(self.states) == self.states.maxlen
-            and abs(new_state.state - median) > self._radius
+            len(self.values) == self.values.maxlen
+            and abs(value - median) > self._radius
         ):
 
             self._stats_internal["erasures"] += 1
 
             _LOGGER.debug(
-                "Outlier nr. %s in %s: %s",
+                "Outlier nr. %s in %s: %s : %s",
                 self._stats_internal["erasures"],
                 self._entity,
-                new_state,
+                timestamp,
+                value,
             )
-            new_state.state = median
-        return new_state
+            return median
+        return value
 
 
 @FILTERS.register(FILTER_NAME_LOWPASS)
@@ -515,19 +562,15 @@ class LowPassFilter(Filter):
         super().__init__(FILTER_NAME_LOWPASS, window_size, precision, entity)
         self._time_constant = time_constant
 
-    def _filter_state(self, new_state):
+    def _filter_value(self, value, timestamp):
         """Implement the low pass filter."""
 
-        if not self.states:
-            return new_state
+        if not self.values:
+            return value
 
         new_weight = 1.0 / self._time_constant
         prev_weight = 1.0 - new_weight
-        new_state.state = (
-            prev_weight * self.states[-1].state + new_weight * new_state.state
-        )
-
-        return new_state
+        return prev_weight * self.values[-1] + new_weight * value
 
 
 @FILTERS.register(FILTER_NAME_TIME_SMA)
@@ -545,35 +588,34 @@ class TimeSMAFilter(Filter):
         :param type: type of algorithm used to connect discrete values
         """
         super().__init__(FILTER_NAME_TIME_SMA, window_size, precision, entity)
-        self._time_window = window_size
+        self._time_window = window_size.total_seconds()
         self.last_leak = None
-        self.queue = deque()
+        self._timestamps = deque()
+        self._queue = deque()
 
     def _leak(self, left_boundary):
         """Remove timeouted elements."""
-        while self.queue:
-            if self.queue[0].timestamp + self._time_window <= left_boundary:
-                self.last_leak = self.queue.popleft()
-            else:
-                return
+        timestamps = self._timestamps
+        while timestamps and timestamps[0] + self._time_window <= left_boundary:
+            timestamps.popleft()
+            self.last_leak = self._queue.popleft()
 
-    def _filter_state(self, new_state):
+    def _filter_value(self, value, timestamp):
         """Implement the Simple Moving Average filter."""
-
-        self._leak(new_state.timestamp)
-        self.queue.append(copy(new_state))
+        timestamp = timestamp.timestamp()
+        self._leak(timestamp)
+        self._timestamps.append(timestamp)
+        self._queue.append(value)
 
         moving_sum = 0
-        start = new_state.timestamp - self._time_window
-        prev_state = self.last_leak or self.queue[0]
-        for state in self.queue:
-            moving_sum += (state.timestamp - start).total_seconds() * prev_state.state
-            start = state.timestamp
-            prev_state = state
-
-        new_state.state = moving_sum / self._time_window.total_seconds()
+        start = timestamp - self._time_window
+        prev_value = self._queue[0] if self.last_leak is None else self.last_leak
+        for state_timestamp, state_value in zip(self._timestamps, self._queue):
+            moving_sum += (state_timestamp - start) * prev_value
+            start = state_timestamp
+            prev_value = state_value
 
-        return new_state
+        return moving_sum / self._time_window
 
 
 @FILTERS.register(FILTER_NAME_THROTTLE)
@@ -588,15 +630,15 @@ class ThrottleFilter(Filter):
         super().__init__(FILTER_NAME_THROTTLE, window_size, precision, entity)
         self._only_numbers = False
 
-    def _filter_state(self, new_state):
+    def _filter_value(self, value, timestamp):
         """Implement the throttle filter."""
-        if not self.states or len(self.states) == self.states.maxlen:
-            self.states.clear()
+        if not self.values or len(self.values) == self.values.maxlen:
+            self.values.clear()
             self._skip_processing = False
         else:
             self._skip_processing = True
 
-        return new_state
+        return value
 
 
 @FILTERS.register(FILTER_NAME_TIME_THROTTLE)
@@ -613,13 +655,13 @@ class TimeThrottleFilter(Filter):
         self._last_emitted_at = None
         self._only_numbers = False
 
-    def _filter_state(self, new_state):
+    def _filter_value(self, value, timestamp):
         """Implement the filter."""
-        window_start = new_state.timestamp - self._time_window
+        window_start = timestamp - self._time_window
         if not self._last_emitted_at or self._last_emitted_at <= window_start:
-            self._last_emitted_at = new_state.timestamp
+            self._last_emitted_at = timestamp
             self._skip_processing = False
         else:
             self._skip_processing = True
 
-        return new_state
+        return value
@@ -1,13 +1,15 @@
 """Provide pre-made queries on top of the recorder component."""
+import asyncio
 from collections import defaultdict
 from datetime import datetime as dt, timedelta
 from itertools import groupby
 import json
 import logging
+import threading
 import time
 from typing import Iterable, Optional, cast
 
-from aiohttp import web
+from aiohttp import hdrs, web
 from sqlalchemy import and_, bindparam, func, not_, or_
 from sqlalchemy.ext import baked
 import voluptuous as vol
@@ -15,16 +17,27 @@ import voluptuous as vol
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
+    Statistics,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.statistics import (
+    PERIOD_5MINUTE,
+    PERIOD_HOUR,
+    merge_statistics_rows,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_FRIENDLY_NAME,
+    ATTR_UNIT_OF_MEASUREMENT,
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
 from homeassistant.core import Context, State, split_entity_id
@@ -32,7 +45,9 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
+    generate_filter,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.typing import HomeAssistantType
 import homeassistant.util.dt as dt_util
 
@@ -45,6 +60,7 @@ CONF_ORDER = "use_include_order"
 
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
+ATTRIBUTES_KEY = "attributes"
 
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
@@ -79,13 +95,43 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
+    # Shared attributes replace the inline attributes of older rows
+    func.coalesce(StateAttributes.shared_attrs, States.attributes).label("attributes"),
     States.last_changed,
     States.last_updated,
 ]
 
+QUERY_STATISTICS = [
+    Statistics.entity_id,
+    Statistics.start,
+    Statistics.min,
+    Statistics.max,
+    Statistics.mean,
+    Statistics.last,
+    Statistics.count,
+    Statistics.unit_of_measurement,
+]
+
+STATISTICS_RESOLUTIONS = {"5minute": PERIOD_5MINUTE, "hour": PERIOD_HOUR}
+
+ATTR_MIN = "min"
+ATTR_MAX = "max"
+ATTR_LAST = "last"
+
 HISTORY_BAKERY = "history_bakery"
 
+# Rows fetched from the database at once when streaming
+STREAM_ROWS_PER_FETCH = 1000
+# Entity arrays waiting to be written to a streamed response
+STREAM_QUEUE_SIZE = 4
+
+
+def _query_states(session):
+    """Query the states columns with their shared attributes."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
@@ -103,6 +149,7 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    compact_response=False,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -110,13 +157,53 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With compact_response every entity is a single dict, see
+    _compact_entity_states.
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
     )
 
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        compact_response,
+    )
+
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query for the significant states ordered by entity_id."""
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -142,34 +229,154 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
 
-    return _sorted_states_to_json(
+def _stream_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+    compact_response=False,
+):
+    """Yield the significant states of one entity at a time.
+
+    Works like _get_significant_states, but only the rows of the entity
+    that is yielded are held in memory. Entities are yielded ordered by
+    entity_id, followed by the entities without changes in the period.
+    """
+    initial_states = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            initial_states[state.entity_id] = state
+
+    states = _significant_states_query(
         hass,
         session,
-        states,
         start_time,
+        end_time,
         entity_ids,
         filters,
-        include_start_time_state,
-        minimal_response,
+        significant_changes_only,
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_ROWS_PER_FETCH))
+
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        initial_state = initial_states.pop(ent_id, None)
+        if compact_response:
+            yield _compact_entity_states(ent_id, initial_state, group)
+            continue
+        ent_results = []
+        if initial_state is not None:
+            ent_results.append(initial_state)
+        _append_entity_states(ent_results, ent_id, group, minimal_response)
+        yield ent_results
+
+    for ent_id, initial_state in initial_states.items():
+        if compact_response:
+            yield _compact_entity_states(ent_id, initial_state, ())
+        else:
+            yield [initial_state]
+
+
+def statistics_during_period(
+    hass, start_time, end_time=None, entity_ids=None, period=PERIOD_HOUR
+):
+    """Wrap _get_statistics_during_period with a sql session."""
+    with session_scope(hass=hass) as session:
+        return _get_statistics_during_period(
+            hass, session, start_time, end_time, entity_ids, period
+        )
+
+
+def _get_statistics_during_period(
+    hass, session, start_time, end_time=None, entity_ids=None, period=PERIOD_HOUR
+):
+    """Return the statistics during UTC period start_time - end_time.
+
+    Every period of an entity is returned as one state with the mean as
+    state and the min, max and last value as attributes.
+    """
+    timer_start = time.perf_counter()
+
+    baked_query = hass.data[HISTORY_BAKERY](
+        lambda session: session.query(*QUERY_STATISTICS)
     )
 
+    baked_query += lambda q: q.filter(Statistics.period == bindparam("period"))
+    # Include the period that was running at start_time
+    baked_query += lambda q: q.filter(Statistics.start > bindparam("start_time"))
+
+    if entity_ids is not None:
+        baked_query += lambda q: q.filter(
+            Statistics.entity_id.in_(bindparam("entity_ids", expanding=True))
+        )
+
+    if end_time is not None:
+        baked_query += lambda q: q.filter(Statistics.start < bindparam("end_time"))
+
+    baked_query += lambda q: q.order_by(
+        Statistics.entity_id, Statistics.start, Statistics.id
+    )
+
+    rows = execute(
+        baked_query(session).params(
+            period=period,
+            start_time=start_time - timedelta(seconds=period),
+            end_time=end_time,
+            entity_ids=entity_ids,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_statistics_during_period took %fs", elapsed)
+
+    result = {}
+    for ent_id, group in groupby(rows, lambda row: row.entity_id):
+        current = hass.states.get(ent_id)
+        friendly_name = current and current.attributes.get(ATTR_FRIENDLY_NAME)
+        ent_results = result[ent_id] = []
+        for stat in merge_statistics_rows(group):
+            attributes = {
+                ATTR_MIN: stat["min"],
+                ATTR_MAX: stat["max"],
+                ATTR_LAST: stat["last"],
+            }
+            if stat["unit_of_measurement"] is not None:
+                attributes[ATTR_UNIT_OF_MEASUREMENT] = stat["unit_of_measurement"]
+            if friendly_name is not None:
+                attributes[ATTR_FRIENDLY_NAME] = friendly_name
+            start = process_timestamp(stat["start"])
+            ent_results.append(
+                State(
+                    ent_id,
+                    str(stat["mean"]),
+                    attributes,
+                    start,
+                    start,
+                    validate_entity_id=False,
+                )
+            )
+
+    return result
+
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -182,7 +389,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -203,13 +412,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -270,7 +479,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -318,9 +527,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -344,6 +551,7 @@ def _sorted_states_to_json(
     filters=None,
     include_start_time_state=True,
     minimal_response=False,
+    compact_response=False,
 ):
     """Convert SQL results into JSON friendly data structure.
 
@@ -377,53 +585,136 @@ def _sorted_states_to_json(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
-    # Called in a tight loop so cache the function
-    # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+    if compact_response:
+        compact = {}
+        for ent_id, group in groupby(states, lambda state: state.entity_id):
+            initial = result.pop(ent_id, None)
+            compact[ent_id] = _compact_entity_states(
+                ent_id, initial[0] if initial else None, group
+            )
+        # Entities without changes during the period
+        for ent_id, initial in result.items():
+            if initial:
+                compact[ent_id] = _compact_entity_states(ent_id, initial[0], ())
+        if entity_ids is None:
+            return compact
+        return {ent_id: compact[ent_id] for ent_id in entity_ids if ent_id in compact}
 
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
-
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
-
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
-
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+        _append_entity_states(result[ent_id], ent_id, group, minimal_response)
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
 
 
+def _compact_entity_states(ent_id, initial_state, group):
+    """Return the states of one entity in the compact format.
+
+    States and their last_changed timestamps are parallel lists, the
+    timestamps are seconds since the epoch. Attributes are only sent when
+    they change, as [index, attributes] pairs where index is the first
+    state they apply to. Rows without a change of state or attributes
+    are left out, rows that share their attributes are only decoded once.
+    """
+    states = []
+    last_changed = []
+    attributes = []
+    if initial_state is not None:
+        states.append(initial_state.state)
+        last_changed.append(initial_state.last_changed.timestamp())
+        attributes.append([0, dict(initial_state.attributes)])
+
+    prev_json = None
+    for row in group:
+        attrs_changed = False
+        if row.attributes != prev_json:
+            prev_json = row.attributes
+            attrs = _decode_attributes(row)
+            attrs_changed = not attributes or attrs != attributes[-1][1]
+        if not attrs_changed and states and row.state == states[-1]:
+            continue
+        if attrs_changed:
+            attributes.append([len(states), attrs])
+        states.append(row.state)
+        last_changed.append(process_timestamp(row.last_changed).timestamp())
+
+    return {
+        ATTR_ENTITY_ID: ent_id,
+        STATE_KEY: states,
+        LAST_CHANGED_KEY: last_changed,
+        ATTRIBUTES_KEY: attributes,
+    }
+
+
+def _compact_native_states(ent_id, states):
+    """Return State objects of one entity in the compact format."""
+    compact = _compact_entity_states(ent_id, None, ())
+    attributes = compact[ATTRIBUTES_KEY]
+    for state in states:
+        attrs = dict(state.attributes)
+        if not attributes or attrs != attributes[-1][1]:
+            attributes.append([len(compact[STATE_KEY]), attrs])
+        compact[STATE_KEY].append(state.state)
+        compact[LAST_CHANGED_KEY].append(state.last_changed.timestamp())
+    return compact
+
+
+def _decode_attributes(row):
+    """Decode the attributes of a states row."""
+    if not row.attributes:
+        return {}
+    try:
+        return json.loads(row.attributes)
+    except ValueError:
+        # When json.loads fails
+        _LOGGER.exception("Error converting row to state attributes: %s", row)
+        return {}
+
+
+def _append_entity_states(ent_results, ent_id, group, minimal_response):
+    """Append the states of one entity to its results."""
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(LazyState(db_state) for db_state in group)
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if not ent_results:
+        ent_results.append(LazyState(next(group)))
+
+    prev_state = ent_results[-1]
+    initial_state_count = len(ent_results)
+
+    # Called in a tight loop so cache the function
+    # here
+    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                    db_state.last_changed
+                ),
+            }
+        )
+        prev_state = db_state
+
+    if prev_state and len(ent_results) != initial_state_count:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = LazyState(prev_state)
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = get_states(hass, utc_point_in_time, (entity_id,), run)
@@ -501,6 +792,14 @@ class HistoryPeriodView(HomeAssistantView):
         )
 
         minimal_response = "minimal_response" in request.query
+        compact_response = "compact_response" in request.query
+
+        period = None
+        resolution = request.query.get("resolution")
+        if resolution is not None:
+            period = STATISTICS_RESOLUTIONS.get(resolution)
+            if period is None:
+                return self.json_message("Invalid resolution", HTTP_BAD_REQUEST)
 
         hass = request.app["hass"]
 
@@ -511,6 +810,24 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        # Reordering by the include order needs the complete result
+        if (
+            "stream" in request.query
+            and period is None
+            and not (self.filters and self.use_include_order)
+        ):
+            return await self._async_stream_significant_states(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                compact_response,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -522,6 +839,8 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                period,
+                compact_response,
             ),
         )
 
@@ -534,22 +853,39 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        period=None,
+        compact_response=False,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
 
         with session_scope(hass=hass) as session:
-            result = _get_significant_states(
-                hass,
-                session,
-                start_time,
-                end_time,
-                entity_ids,
-                self.filters,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-            )
+            if period is None:
+                result = _get_significant_states(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    self.filters,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                    compact_response,
+                )
+            else:
+                result = self._statistics_or_significant_states(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                    period,
+                    compact_response,
+                )
 
         result = list(result.values())
         if _LOGGER.isEnabledFor(logging.DEBUG):
@@ -562,7 +898,11 @@ class HistoryPeriodView(HomeAssistantView):
             sorted_result = []
             for order_entity in self.filters.included_entities:
                 for state_list in result:
-                    if state_list[0].entity_id == order_entity:
+                    if isinstance(state_list, dict):
+                        entity_id = state_list[ATTR_ENTITY_ID]
+                    else:
+                        entity_id = state_list[0].entity_id
+                    if entity_id == order_entity:
                         sorted_result.append(state_list)
                         result.remove(state_list)
                         break
@@ -571,6 +911,162 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    async def _async_stream_significant_states(
+        self,
+        request,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        compact_response,
+    ):
+        """Stream the significant states as json, one entity at a time.
+
+        The executor fetches the rows and encodes the array of an entity
+        while the previous array is written, the bounded queue holds the
+        executor back when the client reads slower than we query.
+        """
+        chunks = asyncio.Queue(STREAM_QUEUE_SIZE)
+        cancelled = threading.Event()
+
+        def put(chunk):
+            """Hand a chunk to the event loop, waits while the queue is full."""
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), hass.loop).result()
+
+        def produce():
+            """Encode the entity arrays in the executor."""
+            try:
+                with session_scope(hass=hass) as session:
+                    separator = b""
+                    for ent_results in _stream_significant_states(
+                        hass,
+                        session,
+                        start_time,
+                        end_time,
+                        entity_ids,
+                        self.filters,
+                        include_start_time_state,
+                        significant_changes_only,
+                        minimal_response,
+                        compact_response,
+                    ):
+                        if cancelled.is_set():
+                            return
+                        put(
+                            separator
+                            + json.dumps(
+                                ent_results, cls=JSONEncoder, allow_nan=False
+                            ).encode("UTF-8")
+                        )
+                        separator = b","
+            finally:
+                put(None)
+
+        response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+        producer = hass.async_add_executor_job(produce)
+
+        try:
+            await response.write(b"[")
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                await response.write(chunk)
+        except BaseException:
+            # Let the executor run into the cancellation instead of
+            # waiting for room in the queue forever
+            cancelled.set()
+            while await chunks.get() is not None:
+                pass
+            raise
+
+        # Raises if fetching the states failed, the client sees a
+        # truncated response instead of a valid but incomplete one
+        await producer
+        await response.write(b"]")
+        await response.write_eof()
+        return response
+
+    def _statistics_or_significant_states(
+        self,
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        period,
+        compact_response=False,
+    ):
+        """Fetch statistics and fall back to states for non numeric entities.
+
+        Without entity_ids the entities without statistics get their states,
+        the result is ordered by entity id.
+        """
+        statistics = _get_statistics_during_period(
+            hass, session, start_time, end_time, entity_ids, period
+        )
+        if compact_response:
+            statistics = {
+                ent_id: _compact_native_states(ent_id, states)
+                for ent_id, states in statistics.items()
+            }
+        if entity_ids is None:
+            if self.filters:
+                entity_filter = self.filters.entity_filter_function()
+                statistics = {
+                    ent_id: states
+                    for ent_id, states in statistics.items()
+                    if entity_filter(ent_id)
+                }
+            states = _get_significant_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                None,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                compact_response,
+            )
+            return {
+                ent_id: statistics.get(ent_id) or states[ent_id]
+                for ent_id in sorted({*statistics, *states})
+            }
+
+        missing = [ent_id for ent_id in entity_ids if ent_id not in statistics]
+        if not missing:
+            return {ent_id: statistics[ent_id] for ent_id in entity_ids}
+
+        states = _get_significant_states(
+            hass,
+            session,
+            start_time,
+            end_time,
+            missing,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            compact_response,
+        )
+        # Keep the requested order
+        result = {}
+        for ent_id in entity_ids:
+            ent_results = statistics.get(ent_id) or states.get(ent_id)
+            if ent_results:
+                result[ent_id] = ent_results
+        return result
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
     """Build a sql filter from config."""
@@ -634,6 +1130,17 @@ class Filters:
 
         baked_query += lambda q: q.filter(self.entity_filter())
 
+    def entity_filter_function(self):
+        """Generate a function that filters entity ids in Python."""
+        return generate_filter(
+            self.included_domains,
+            self.included_entities,
+            self.excluded_domains,
+            self.excluded_entities,
+            self.included_entity_globs,
+            self.excluded_entity_globs,
+        )
+
     def entity_filter(self):
         """Generate the entity filter query."""
         includes = []
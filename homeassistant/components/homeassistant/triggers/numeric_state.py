@@ -1,5 +1,7 @@
 """Offer numeric state listening automation rules."""
+from datetime import timedelta
 import logging
+from typing import Dict, List, Optional, Set
 
 import voluptuous as vol
 
@@ -13,9 +15,10 @@ from homeassistant.const import (
     CONF_PLATFORM,
     CONF_VALUE_TEMPLATE,
 )
-from homeassistant.core import CALLBACK_TYPE, HassJob, callback
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, State, callback
 from homeassistant.helpers import condition, config_validation as cv, template
 from homeassistant.helpers.event import (
+    Event,
     async_track_same_state,
     async_track_state_change_event,
 )
@@ -58,28 +61,51 @@ TRIGGER_SCHEMA = vol.All(
 
 _LOGGER = logging.getLogger(__name__)
 
+DATA_NUMERIC_STATE_TRIGGERS = "numeric_state_triggers"
+
 
 async def async_attach_trigger(
     hass, config, action, automation_info, *, platform_type="numeric_state"
 ) -> CALLBACK_TYPE:
     """Listen for state changes based on configuration."""
-    entity_id = config.get(CONF_ENTITY_ID)
-    below = config.get(CONF_BELOW)
-    above = config.get(CONF_ABOVE)
-    time_delta = config.get(CONF_FOR)
-    template.attach(hass, time_delta)
-    value_template = config.get(CONF_VALUE_TEMPLATE)
-    unsub_track_same = {}
-    entities_triggered = set()
-    period: dict = {}
-    attribute = config.get(CONF_ATTRIBUTE)
-    job = HassJob(action)
-
-    if value_template is not None:
-        value_template.hass = hass
+    dispatcher = hass.data.get(DATA_NUMERIC_STATE_TRIGGERS)
+    if dispatcher is None:
+        dispatcher = hass.data[
+            DATA_NUMERIC_STATE_TRIGGERS
+        ] = NumericStateTriggerDispatcher(hass)
+
+    return dispatcher.async_add(
+        NumericStateTrigger(hass, config, action, automation_info, platform_type)
+    )
+
+
+class NumericStateTrigger:
+    """Numeric state trigger compiled from its configuration."""
+
+    def __init__(self, hass, config, action, automation_info, platform_type) -> None:
+        """Initialize the trigger."""
+        self.hass = hass
+        self.entity_ids: List[str] = config[CONF_ENTITY_ID]
+        self.below = config.get(CONF_BELOW)
+        self.above = config.get(CONF_ABOVE)
+        self.time_delta = config.get(CONF_FOR)
+        template.attach(hass, self.time_delta)
+        self.value_template = config.get(CONF_VALUE_TEMPLATE)
+        if self.value_template is not None:
+            self.value_template.hass = hass
+        self.attribute = config.get(CONF_ATTRIBUTE)
+        self.in_range = condition.async_compile_numeric_range(
+            hass, self.below, self.above
+        )
+        self.job = HassJob(action)
+        self.name = automation_info["name"] if automation_info else None
+        self.platform_type = platform_type
+        self._unsub_track_same: Dict[str, CALLBACK_TYPE] = {}
+        self._entities_triggered: Set[str] = set()
+        self._period: Dict[str, timedelta] = {}
 
     @callback
-    def check_numeric_state(entity, from_s, to_s):
+    def check_numeric_state(self, entity, from_s, to_s) -> bool:
         """Return True if criteria are now met."""
         if to_s is None:
             return False
@@ -88,18 +114,19 @@ async def async_attach_trigger(
             "trigger": {
                 "platform": "numeric_state",
                 "entity_id": entity,
-                "below": below,
-                "above": above,
-                "attribute": attribute,
+                "below": self.below,
+                "above": self.above,
+                "attribute": self.attribute,
             }
         }
-        return condition.async_numeric_state(
-            hass, to_s, below, above, value_template, variables, attribute
+        value = condition.async_numeric_state_value(
+            self.hass, to_s, self.value_template, variables, self.attribute
         )
+        return value is not None and self.in_range(value)
 
     @callback
-    def state_automation_listener(event):
-        """Listen for state changes and calls action."""
+    def async_handle(self, event: Event, matching: bool) -> None:
+        """Handle a state change of an entity, matching the criteria or not."""
         entity = event.data.get("entity_id")
         from_s = event.data.get("old_state")
         to_s = event.data.get("new_state")
@@ -107,71 +134,144 @@ async def async_attach_trigger(
         @callback
         def call_action():
             """Call action with right context."""
-            hass.async_run_hass_job(
-                job,
+            self.hass.async_run_hass_job(
+                self.job,
                 {
                     "trigger": {
-                        "platform": platform_type,
+                        "platform": self.platform_type,
                         "entity_id": entity,
-                        "below": below,
-                        "above": above,
+                        "below": self.below,
+                        "above": self.above,
                         "from_state": from_s,
                         "to_state": to_s,
-                        "for": time_delta if not time_delta else period[entity],
+                        "for": self.time_delta
+                        if not self.time_delta
+                        else self._period[entity],
                         "description": f"numeric state of {entity}",
                     }
                 },
                 to_s.context,
             )
 
-        matching = check_numeric_state(entity, from_s, to_s)
-
         if not matching:
-            entities_triggered.discard(entity)
-        elif entity not in entities_triggered:
-            entities_triggered.add(entity)
+            self._entities_triggered.discard(entity)
+            return
+        if entity in self._entities_triggered:
+            return
 
-            if time_delta:
-                variables = {
-                    "trigger": {
-                        "platform": "numeric_state",
-                        "entity_id": entity,
-                        "below": below,
-                        "above": above,
-                    }
-                }
-
-                try:
-                    period[entity] = cv.positive_time_period(
-                        template.render_complex(time_delta, variables)
-                    )
-                except (exceptions.TemplateError, vol.Invalid) as ex:
-                    _LOGGER.error(
-                        "Error rendering '%s' for template: %s",
-                        automation_info["name"],
-                        ex,
-                    )
-                    entities_triggered.discard(entity)
-                    return
-
-                unsub_track_same[entity] = async_track_same_state(
-                    hass,
-                    period[entity],
-                    call_action,
-                    entity_ids=entity,
-                    async_check_same_func=check_numeric_state,
-                )
-            else:
-                call_action()
+        self._entities_triggered.add(entity)
 
-    unsub = async_track_state_change_event(hass, entity_id, state_automation_listener)
+        if not self.time_delta:
+            call_action()
+            return
+
+        variables = {
+            "trigger": {
+                "platform": "numeric_state",
+                "entity_id": entity,
+                "below": self.below,
+                "above": self.above,
+            }
+        }
+
+        try:
+            self._period[entity] = cv.positive_time_period(
+                template.render_complex(self.time_delta, variables)
+            )
+        except (exceptions.TemplateError, vol.Invalid) as ex:
+            _LOGGER.error("Error rendering '%s' for template: %s", self.name, ex)
+            self._entities_triggered.discard(entity)
+            return
+
+        self._unsub_track_same[entity] = async_track_same_state(
+            self.hass,
+            self._period[entity],
+            call_action,
+            entity_ids=entity,
+            async_check_same_func=self.check_numeric_state,
+        )
 
     @callback
-    def async_remove():
-        """Remove state listeners async."""
-        unsub()
-        for async_remove in unsub_track_same.values():
+    def async_remove(self) -> None:
+        """Cancel the fors that are waiting."""
+        for async_remove in self._unsub_track_same.values():
             async_remove()
-        unsub_track_same.clear()
+        self._unsub_track_same.clear()
+
+
+class NumericStateTriggerDispatcher:
+    """Run the numeric state triggers of all automations.
+
+    Triggers are indexed by entity. The triggers of an entity are evaluated
+    together in the order they were added, the numeric value of a state or
+    attribute is only converted once for all triggers without a value
+    template.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._index: Dict[str, List[NumericStateTrigger]] = {}
+        self._unsub_entities: Dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_add(self, trigger: NumericStateTrigger) -> CALLBACK_TYPE:
+        """Add a trigger, return a callback that removes it."""
+        for entity_id in trigger.entity_ids:
+            triggers = self._index.get(entity_id)
+            if triggers is None:
+                triggers = self._index[entity_id] = []
+                self._unsub_entities[entity_id] = async_track_state_change_event(
+                    self.hass, entity_id, self._async_state_changed
+                )
+            triggers.append(trigger)
+
+        @callback
+        def async_remove() -> None:
+            """Remove the trigger and the fors it started."""
+            self._async_remove(trigger)
 
-    return async_remove
+        return async_remove
+
+    @callback
+    def _async_remove(self, trigger: NumericStateTrigger) -> None:
+        """Remove a trigger."""
+        trigger.async_remove()
+        for entity_id in trigger.entity_ids:
+            triggers = self._index[entity_id]
+            triggers.remove(trigger)
+            if not triggers:
+                del self._index[entity_id]
+                self._unsub_entities.pop(entity_id)()
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Evaluate the triggers of an entity for a state change."""
+        entity_id: str = event.data["entity_id"]
+        from_s: Optional[State] = event.data.get("old_state")
+        to_s: Optional[State] = event.data.get("new_state")
+        # Numeric values of the state and attributes by attribute
+        values: Dict[Optional[str], Optional[float]] = {}
+
+        for trigger in list(self._index.get(entity_id, ())):
+            try:
+                if to_s is None:
+                    matching = False
+                elif trigger.value_template is not None:
+                    matching = trigger.check_numeric_state(entity_id, from_s, to_s)
+                else:
+                    attribute = trigger.attribute
+                    if attribute in values:
+                        value = values[attribute]
+                    else:
+                        value = values[attribute] = condition.async_numeric_state_value(
+                            self.hass, to_s, attribute=attribute
+                        )
+                    matching = value is not None and trigger.in_range(value)
+                trigger.async_handle(event, matching)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while processing numeric state trigger of %s for %s",
+                    trigger.name,
+                    entity_id,
+                )
@@ -1,7 +1,11 @@
 """Offer state listening automation rules."""
-from datetime import timedelta
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
 import logging
-from typing import Any, Dict, Optional
+from operator import attrgetter
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import voluptuous as vol
 
@@ -11,10 +15,11 @@ from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, State, cal
 from homeassistant.helpers import config_validation as cv, template
 from homeassistant.helpers.event import (
     Event,
-    async_track_same_state,
+    async_track_point_in_utc_time,
     async_track_state_change_event,
     process_state_match,
 )
+import homeassistant.util.dt as dt_util
 
 # mypy: allow-incomplete-defs, allow-untyped-calls, allow-untyped-defs
 # mypy: no-check-untyped-defs
@@ -25,6 +30,8 @@ CONF_ENTITY_ID = "entity_id"
 CONF_FROM = "from"
 CONF_TO = "to"
 
+DATA_STATE_TRIGGERS = "state_triggers"
+
 BASE_SCHEMA = {
     vol.Required(CONF_PLATFORM): "state",
     vol.Required(CONF_ENTITY_ID): cv.entity_ids,
@@ -72,75 +79,101 @@ async def async_attach_trigger(
     platform_type: str = "state",
 ) -> CALLBACK_TYPE:
     """Listen for state changes based on configuration."""
-    entity_id = config.get(CONF_ENTITY_ID)
-    from_state = config.get(CONF_FROM, MATCH_ALL)
-    to_state = config.get(CONF_TO, MATCH_ALL)
-    time_delta = config.get(CONF_FOR)
-    template.attach(hass, time_delta)
-    match_all = from_state == MATCH_ALL and to_state == MATCH_ALL
-    unsub_track_same = {}
-    period: Dict[str, timedelta] = {}
-    match_from_state = process_state_match(from_state)
-    match_to_state = process_state_match(to_state)
-    attribute = config.get(CONF_ATTRIBUTE)
-    job = HassJob(action)
+    dispatcher = hass.data.get(DATA_STATE_TRIGGERS)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_STATE_TRIGGERS] = StateTriggerDispatcher(hass)
 
-    @callback
-    def state_automation_listener(event: Event):
-        """Listen for state changes and calls action."""
-        entity: str = event.data["entity_id"]
-        from_s: Optional[State] = event.data.get("old_state")
-        to_s: Optional[State] = event.data.get("new_state")
+    return dispatcher.async_add(
+        StateTrigger(hass, config, action, automation_info, platform_type)
+    )
 
-        if from_s is None:
-            old_value = None
-        elif attribute is None:
-            old_value = from_s.state
-        else:
-            old_value = from_s.attributes.get(attribute)
-
-        if to_s is None:
-            new_value = None
-        elif attribute is None:
-            new_value = to_s.state
-        else:
-            new_value = to_s.attributes.get(attribute)
-
-        # When we listen for state changes with `match_all`, we
-        # will trigger even if just an attribute changes. When
-        # we listen to just an attribute, we should ignore all
-        # other attribute changes.
-        if attribute is not None and old_value == new_value:
-            return
 
-        if (
-            not match_from_state(old_value)
-            or not match_to_state(new_value)
-            or (not match_all and old_value == new_value)
+def _values_to_match(parameter: Any) -> Optional[Tuple[Any, ...]]:
+    """Return the values a from or to parameter matches, None for any value."""
+    if parameter is None or parameter == MATCH_ALL:
+        return None
+    if isinstance(parameter, str) or not hasattr(parameter, "__iter__"):
+        return (parameter,)
+    return tuple(dict.fromkeys(parameter))
+
+
+def _state_value(state: Optional[State], attribute: Optional[str]) -> Any:
+    """Return the state or an attribute of a state."""
+    if state is None:
+        return None
+    if attribute is None:
+        return state.state
+    return state.attributes.get(attribute)
+
+
+class _PendingFor:
+    """Trigger waiting for a state to stay the same for a while."""
+
+    __slots__ = ("trigger", "entity_id", "old_value", "new_value", "action", "cancel")
+
+    def __init__(
+        self,
+        trigger: "StateTrigger",
+        entity_id: str,
+        old_value: Any,
+        new_value: Any,
+        action: Callable[[], None],
+    ) -> None:
+        """Initialize the pending trigger."""
+        self.trigger = trigger
+        self.entity_id = entity_id
+        self.old_value = old_value
+        self.new_value = new_value
+        self.action = action
+        self.cancel: Optional[CALLBACK_TYPE] = None
+
+
+class StateTrigger:
+    """State trigger compiled from its configuration."""
+
+    _next_seq = 0
+
+    def __init__(self, hass, config, action, automation_info, platform_type) -> None:
+        """Initialize the trigger."""
+        self.hass = hass
+        self.entity_ids: List[str] = config[CONF_ENTITY_ID]
+        self.attribute: Optional[str] = config.get(CONF_ATTRIBUTE)
+        from_state = config.get(CONF_FROM, MATCH_ALL)
+        to_state = config.get(CONF_TO, MATCH_ALL)
+        self.match_all = from_state == MATCH_ALL and to_state == MATCH_ALL
+        self.match_from_state = process_state_match(from_state)
+        # Matched by the dispatcher when looking up the triggers of a state
+        self.to_values = _values_to_match(to_state)
+        # A for with only a from waits for the state to stay changed
+        self.for_changed = CONF_FROM in config and CONF_TO not in config
+        self.time_delta = config.get(CONF_FOR)
+        template.attach(hass, self.time_delta)
+        self.job = HassJob(action)
+        self.name = automation_info["name"] if automation_info else None
+        self.platform_type = platform_type
+        self.seq = StateTrigger._next_seq
+        StateTrigger._next_seq += 1
+
+    @callback
+    def async_handle(
+        self,
+        dispatcher: "StateTriggerDispatcher",
+        event: Event,
+        old_value: Any,
+        new_value: Any,
+    ) -> None:
+        """Handle a state change that matches the to state of the trigger."""
+        if not self.match_from_state(old_value) or (
+            not self.match_all and old_value == new_value
         ):
             return
 
-        @callback
-        def call_action():
-            """Call action with right context."""
-            hass.async_run_hass_job(
-                job,
-                {
-                    "trigger": {
-                        "platform": platform_type,
-                        "entity_id": entity,
-                        "from_state": from_s,
-                        "to_state": to_s,
-                        "for": time_delta if not time_delta else period[entity],
-                        "attribute": attribute,
-                        "description": f"state of {entity}",
-                    }
-                },
-                event.context,
-            )
+        entity: str = event.data["entity_id"]
+        from_s: Optional[State] = event.data.get("old_state")
+        to_s: Optional[State] = event.data.get("new_state")
 
-        if not time_delta:
-            call_action()
+        if not self.time_delta:
+            self._async_call_action(entity, from_s, to_s, None, event)
             return
 
         variables = {
@@ -153,45 +186,232 @@ async def async_attach_trigger(
         }
 
         try:
-            period[entity] = cv.positive_time_period(
-                template.render_complex(time_delta, variables)
+            period = cv.positive_time_period(
+                template.render_complex(self.time_delta, variables)
             )
         except (exceptions.TemplateError, vol.Invalid) as ex:
-            _LOGGER.error(
-                "Error rendering '%s' for template: %s", automation_info["name"], ex
-            )
+            _LOGGER.error("Error rendering '%s' for template: %s", self.name, ex)
+            return
+
+        dispatcher.async_wait_same_state(
+            _PendingFor(
+                self,
+                entity,
+                old_value,
+                new_value,
+                lambda: self._async_call_action(entity, from_s, to_s, period, event),
+            ),
+            dt_util.utcnow() + period,
+        )
+
+    @callback
+    def _async_call_action(self, entity, from_s, to_s, period, event) -> None:
+        """Call action with right context."""
+        self.hass.async_run_hass_job(
+            self.job,
+            {
+                "trigger": {
+                    "platform": self.platform_type,
+                    "entity_id": entity,
+                    "from_state": from_s,
+                    "to_state": to_s,
+                    "for": period,
+                    "attribute": self.attribute,
+                    "description": f"state of {entity}",
+                }
+            },
+            event.context,
+        )
+
+    def is_same_state(self, pending: _PendingFor, new_state: Optional[State]) -> bool:
+        """Return if a pending trigger still has the state it waits for."""
+        if new_state is None:
+            return False
+
+        cur_value = _state_value(new_state, self.attribute)
+        if self.for_changed:
+            return cur_value != pending.old_value  # type: ignore
+        return cur_value == pending.new_value  # type: ignore
+
+
+class _AttributeTriggers:
+    """Triggers of an entity that watch the same state or attribute."""
+
+    __slots__ = ("by_to_value", "any_to_value")
+
+    def __init__(self) -> None:
+        """Initialize the triggers."""
+        self.by_to_value: Dict[Any, List[StateTrigger]] = {}
+        self.any_to_value: List[StateTrigger] = []
+
+    def __bool__(self) -> bool:
+        """Return if there are any triggers."""
+        return bool(self.by_to_value or self.any_to_value)
+
+    def add(self, trigger: StateTrigger) -> None:
+        """Add a trigger."""
+        if trigger.to_values is None:
+            self.any_to_value.append(trigger)
+            return
+        for value in trigger.to_values:
+            self.by_to_value.setdefault(value, []).append(trigger)
+
+    def remove(self, trigger: StateTrigger) -> None:
+        """Remove a trigger."""
+        if trigger.to_values is None:
+            self.any_to_value.remove(trigger)
+            return
+        for value in trigger.to_values:
+            triggers = self.by_to_value[value]
+            triggers.remove(trigger)
+            if not triggers:
+                del self.by_to_value[value]
+
+    def match(self, new_value: Any) -> List[StateTrigger]:
+        """Return the triggers for a new state, in the order they were added."""
+        try:
+            by_to_value = self.by_to_value.get(new_value)
+        except TypeError:
+            # Unhashable attribute values can't equal one of the to values
+            by_to_value = None
+        if not by_to_value:
+            return self.any_to_value
+        if not self.any_to_value:
+            return by_to_value
+        return sorted(by_to_value + self.any_to_value, key=attrgetter("seq"))
+
+
+class StateTriggerDispatcher:
+    """Run the state triggers of all automations.
+
+    Triggers are indexed by entity, watched attribute and to state, so a
+    state change only looks at the triggers it can match and computes each
+    compared value once. Triggers with a for wait on the timer wheel of
+    async_track_point_in_utc_time, a wait that is cancelled is removed
+    from the wheel right away. The time spent evaluating triggers is
+    counted per automation.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._index: Dict[str, Dict[Optional[str], _AttributeTriggers]] = {}
+        self._unsub_entities: Dict[str, CALLBACK_TYPE] = {}
+        self._pending: Dict[str, Dict[StateTrigger, _PendingFor]] = {}
+        self.evaluation_time: Dict[Optional[str], float] = defaultdict(float)
+
+    @callback
+    def async_add(self, trigger: StateTrigger) -> CALLBACK_TYPE:
+        """Add a trigger, return a callback that removes it."""
+        for entity_id in trigger.entity_ids:
+            attributes = self._index.get(entity_id)
+            if attributes is None:
+                attributes = self._index[entity_id] = {}
+                self._unsub_entities[entity_id] = async_track_state_change_event(
+                    self.hass, entity_id, self._async_state_changed
+                )
+            triggers = attributes.get(trigger.attribute)
+            if triggers is None:
+                triggers = attributes[trigger.attribute] = _AttributeTriggers()
+            triggers.add(trigger)
+
+        @callback
+        def async_remove() -> None:
+            """Remove the trigger and the timers it started."""
+            self._async_remove(trigger)
+
+        return async_remove
+
+    @callback
+    def _async_remove(self, trigger: StateTrigger) -> None:
+        """Remove a trigger."""
+        for entity_id in trigger.entity_ids:
+            self._async_cancel(entity_id, trigger)
+            attributes = self._index[entity_id]
+            triggers = attributes[trigger.attribute]
+            triggers.remove(trigger)
+            if triggers:
+                continue
+            del attributes[trigger.attribute]
+            if not attributes:
+                del self._index[entity_id]
+                self._unsub_entities.pop(entity_id)()
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Run the triggers of a state change."""
+        entity_id: str = event.data["entity_id"]
+        from_s: Optional[State] = event.data.get("old_state")
+        to_s: Optional[State] = event.data.get("new_state")
+
+        pending = self._pending.get(entity_id)
+        if pending:
+            for trigger, waiting in list(pending.items()):
+                if not trigger.is_same_state(waiting, to_s):
+                    self._async_cancel(entity_id, trigger)
+
+        attributes = self._index.get(entity_id)
+        if attributes is None:
             return
 
-        def _check_same_state(_, _2, new_st: State):
-            if new_st is None:
-                return False
+        matched: List[Tuple[StateTrigger, Any, Any]] = []
+        groups = 0
+        for attribute, triggers in attributes.items():
+            old_value = _state_value(from_s, attribute)
+            new_value = _state_value(to_s, attribute)
 
-            if attribute is None:
-                cur_value = new_st.state
-            else:
-                cur_value = new_st.attributes.get(attribute)
+            # When we listen for state changes with `match_all`, we
+            # will trigger even if just an attribute changes. When
+            # we listen to just an attribute, we should ignore all
+            # other attribute changes.
+            if attribute is not None and old_value == new_value:
+                continue
 
-            if CONF_FROM in config and CONF_TO not in config:
-                return cur_value != old_value
+            to_match = triggers.match(new_value)
+            if to_match:
+                groups += 1
+                matched.extend((trigger, old_value, new_value) for trigger in to_match)
 
-            return cur_value == new_value
+        if groups > 1:
+            matched.sort(key=lambda item: item[0].seq)
 
-        unsub_track_same[entity] = async_track_same_state(
-            hass,
-            period[entity],
-            call_action,
-            _check_same_state,
-            entity_ids=entity,
+        evaluation_time = self.evaluation_time
+        for trigger, old_value, new_value in matched:
+            start = time.perf_counter()
+            try:
+                trigger.async_handle(self, event, old_value, new_value)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while processing state trigger of %s for %s",
+                    trigger.name,
+                    entity_id,
+                )
+            evaluation_time[trigger.name] += time.perf_counter() - start
+
+    @callback
+    def async_wait_same_state(self, pending: _PendingFor, deadline: datetime) -> None:
+        """Run the action of a trigger if the state stays the same until deadline."""
+        self._async_cancel(pending.entity_id, pending.trigger)
+        self._pending.setdefault(pending.entity_id, {})[pending.trigger] = pending
+        pending.cancel = async_track_point_in_utc_time(
+            self.hass, partial(self._async_due, pending), deadline
         )
 
-    unsub = async_track_state_change_event(hass, entity_id, state_automation_listener)
+    @callback
+    def _async_cancel(self, entity_id: str, trigger: StateTrigger) -> None:
+        """Cancel the pending for of a trigger."""
+        pending = self._pending.get(entity_id)
+        if pending is None or trigger not in pending:
+            return
+        cancel = pending.pop(trigger).cancel
+        if cancel is not None:
+            cancel()
+        if not pending:
+            del self._pending[entity_id]
 
     @callback
-    def async_remove():
-        """Remove state listeners async."""
-        unsub()
-        for async_remove in unsub_track_same.values():
-            async_remove()
-        unsub_track_same.clear()
-
-    return async_remove
+    def _async_due(self, pending: _PendingFor, now: datetime) -> None:
+        """Run the action of a trigger whose state stayed the same."""
+        pending.cancel = None
+        self._async_cancel(pending.entity_id, pending.trigger)
+        pending.action()
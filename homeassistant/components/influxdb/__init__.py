@@ -1,15 +1,17 @@
 """Support for sending data to an Influx database."""
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import logging
 import math
+import os
 import queue
 import threading
 import time
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from influxdb import InfluxDBClient, exceptions
 from influxdb_client import InfluxDBClient as InfluxDBClientV2
-from influxdb_client.client.write_api import ASYNCHRONOUS, SYNCHRONOUS
+from influxdb_client.client.write_api import SYNCHRONOUS
 from influxdb_client.rest import ApiException
 import requests.exceptions
 import urllib3.exceptions
@@ -34,6 +36,7 @@ from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     convert_include_exclude_filter,
 )
+from homeassistant.helpers.storage import STORAGE_DIR
 
 from .const import (
     API_VERSION_2,
@@ -45,12 +48,14 @@ from .const import (
     CODE_INVALID_INPUTS,
     COMPONENT_CONFIG_SCHEMA_CONNECTION,
     CONF_API_VERSION,
+    CONF_BATCH_SIZE,
     CONF_BUCKET,
     CONF_COMPONENT_CONFIG,
     CONF_COMPONENT_CONFIG_DOMAIN,
     CONF_COMPONENT_CONFIG_GLOB,
     CONF_DB_NAME,
     CONF_DEFAULT_MEASUREMENT,
+    CONF_FLUSH_INTERVAL,
     CONF_HOST,
     CONF_IGNORE_ATTRIBUTES,
     CONF_MEASUREMENT_ATTR,
@@ -74,27 +79,29 @@ from .const import (
     DEFAULT_SSL_V2,
     DOMAIN,
     EVENT_NEW_STATE,
-    INFLUX_CONF_FIELDS,
-    INFLUX_CONF_MEASUREMENT,
     INFLUX_CONF_ORG,
     INFLUX_CONF_STATE,
-    INFLUX_CONF_TAGS,
-    INFLUX_CONF_TIME,
     INFLUX_CONF_VALUE,
     QUERY_ERROR,
     QUEUE_BACKLOG_SECONDS,
     RE_DECIMAL,
     RE_DIGIT_TAIL,
+    REPLAYED_MESSAGE,
     RESUMED_MESSAGE,
     RETRY_DELAY,
     RETRY_INTERVAL,
     RETRY_MESSAGE,
+    SPILL_FILE,
+    SPILL_FULL_MESSAGE,
+    SPILL_MAX_SIZE,
     TEST_QUERY_V1,
     TEST_QUERY_V2,
     TIMEOUT,
+    WRITE_CONCURRENCY,
     WRITE_ERROR,
     WROTE_MESSAGE,
 )
+from .line_protocol import PRECISION_DIVISORS, encode_line, encode_timestamp
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -156,6 +163,12 @@ _CUSTOMIZE_ENTITY_SCHEMA = vol.Schema(
 _INFLUX_BASE_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
     {
         vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
+        vol.Optional(CONF_BATCH_SIZE, default=BATCH_BUFFER_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(CONF_FLUSH_INTERVAL, default=BATCH_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
         vol.Optional(CONF_DEFAULT_MEASUREMENT): cv.string,
         vol.Optional(CONF_MEASUREMENT_ATTR, default=DEFAULT_MEASUREMENT_ATTR): vol.In(
             ["unit_of_measurement", "domain__device_class", "entity_id"]
@@ -192,8 +205,8 @@ CONFIG_SCHEMA = vol.Schema(
 )
 
 
-def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
-    """Build event to json converter and add to config."""
+def _generate_event_to_line(conf: Dict) -> Callable[[Dict], Optional[str]]:
+    """Build event to line protocol converter and add to config."""
     entity_filter = convert_include_exclude_filter(conf)
     tags = conf.get(CONF_TAGS)
     tags_attributes = conf.get(CONF_TAGS_ATTRIBUTES)
@@ -206,9 +219,10 @@ def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
         conf[CONF_COMPONENT_CONFIG_DOMAIN],
         conf[CONF_COMPONENT_CONFIG_GLOB],
     )
+    divisor = PRECISION_DIVISORS[conf.get(CONF_PRECISION)]
 
-    def event_to_json(event: Dict) -> str:
-        """Convert event into json in format Influx expects."""
+    def event_to_line(event: Dict) -> Optional[str]:
+        """Convert event into a line of the Influx line protocol."""
         state = event.data.get(EVENT_NEW_STATE)
         if (
             state is None
@@ -257,61 +271,57 @@ def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
                 else:
                     include_uom = measurement_attr != "unit_of_measurement"
 
-        json = {
-            INFLUX_CONF_MEASUREMENT: measurement,
-            INFLUX_CONF_TAGS: {
-                CONF_DOMAIN: state.domain,
-                CONF_ENTITY_ID: state.object_id,
-            },
-            INFLUX_CONF_TIME: event.time_fired,
-            INFLUX_CONF_FIELDS: {},
-        }
+        point_tags = {CONF_DOMAIN: state.domain, CONF_ENTITY_ID: state.object_id}
+        fields = {}
         if _include_state:
-            json[INFLUX_CONF_FIELDS][INFLUX_CONF_STATE] = state.state
+            fields[INFLUX_CONF_STATE] = state.state
         if _include_value:
-            json[INFLUX_CONF_FIELDS][INFLUX_CONF_VALUE] = _state_as_value
+            fields[INFLUX_CONF_VALUE] = _state_as_value
 
         ignore_attributes = set(entity_config.get(CONF_IGNORE_ATTRIBUTES, []))
         ignore_attributes.update(global_ignore_attributes)
         for key, value in state.attributes.items():
             if key in tags_attributes:
-                json[INFLUX_CONF_TAGS][key] = value
+                point_tags[key] = value
             elif (
                 (key != CONF_UNIT_OF_MEASUREMENT or include_uom)
                 and (key != "device_class" or include_dc)
                 and key not in ignore_attributes
             ):
                 # If the key is already in fields
-                if key in json[INFLUX_CONF_FIELDS]:
+                if key in fields:
                     key = f"{key}_"
                 # Prevent column data errors in influxDB.
                 # For each value we try to cast it as float
                 # But if we can not do it we store the value
                 # as string add "_str" postfix to the field key
                 try:
-                    json[INFLUX_CONF_FIELDS][key] = float(value)
+                    fields[key] = float(value)
                 except (ValueError, TypeError):
                     new_key = f"{key}_str"
                     new_value = str(value)
-                    json[INFLUX_CONF_FIELDS][new_key] = new_value
+                    fields[new_key] = new_value
 
                     if RE_DIGIT_TAIL.match(new_value):
-                        json[INFLUX_CONF_FIELDS][key] = float(
-                            RE_DECIMAL.sub("", new_value)
-                        )
+                        fields[key] = float(RE_DECIMAL.sub("", new_value))
 
                 # Infinity and NaN are not valid floats in InfluxDB
                 try:
-                    if not math.isfinite(json[INFLUX_CONF_FIELDS][key]):
-                        del json[INFLUX_CONF_FIELDS][key]
+                    if not math.isfinite(fields[key]):
+                        del fields[key]
                 except (KeyError, TypeError):
                     pass
 
-        json[INFLUX_CONF_TAGS].update(tags)
+        point_tags.update(tags)
 
-        return json
+        return encode_line(
+            measurement,
+            point_tags,
+            fields,
+            encode_timestamp(event.time_fired, divisor),
+        )
 
-    return event_to_json
+    return event_to_line
 
 
 @dataclass
@@ -338,8 +348,9 @@ def get_influx_connection(conf, test_write=False, test_read=False):
         bucket = conf.get(CONF_BUCKET)
         influx = InfluxDBClientV2(**kwargs)
         query_api = influx.query_api()
-        initial_write_mode = SYNCHRONOUS if test_write else ASYNCHRONOUS
-        write_api = influx.write_api(write_options=initial_write_mode)
+        # Batches are written from the writer threads, a synchronous write
+        # only returns once InfluxDB accepted the points
+        write_api = influx.write_api(write_options=SYNCHRONOUS)
 
         def write_v2(json):
             """Write data to V2 influx."""
@@ -380,7 +391,6 @@ def get_influx_connection(conf, test_write=False, test_read=False):
                 write_v2(b"")
             except ValueError:
                 pass
-            write_api = influx.write_api(write_options=ASYNCHRONOUS)
 
         if test_read:
             tables = query_v2(TEST_QUERY_V2)
@@ -418,9 +428,12 @@ def get_influx_connection(conf, test_write=False, test_read=False):
     influx = InfluxDBClient(**kwargs)
 
     def write_v1(json):
-        """Write data to V1 influx."""
+        """Write lines or points to V1 influx."""
         try:
-            influx.write_points(json, time_precision=precision)
+            if json and isinstance(json[0], str):
+                influx.write_points(json, time_precision=precision, protocol="line")
+            else:
+                influx.write_points(json, time_precision=precision)
         except (
             requests.exceptions.RequestException,
             exceptions.InfluxDBServerError,
@@ -471,9 +484,16 @@ def setup(hass, config):
         event_helper.call_later(hass, RETRY_INTERVAL, lambda _: setup(hass, config))
         return True
 
-    event_to_json = _generate_event_to_json(conf)
-    max_tries = conf.get(CONF_RETRY_COUNT)
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    event_to_line = _generate_event_to_line(conf)
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass,
+        influx,
+        event_to_line,
+        conf[CONF_RETRY_COUNT],
+        conf[CONF_BATCH_SIZE],
+        conf[CONF_FLUSH_INTERVAL],
+        SpillBuffer(hass.config.path(STORAGE_DIR, SPILL_FILE), SPILL_MAX_SIZE),
+    )
     instance.start()
 
     def shutdown(event):
@@ -487,18 +507,92 @@ def setup(hass, config):
     return True
 
 
-class InfluxThread(threading.Thread):
-    """A threaded event handler class."""
+class SpillBuffer:
+    """Line protocol points kept on disk while InfluxDB cannot be written."""
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
+    def __init__(self, path: str, max_size: int) -> None:
+        """Initialize the buffer."""
+        self.path = path
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        try:
+            self.size = os.path.getsize(path)
+        except OSError:
+            self.size = 0
+
+    def append(self, lines: List[str]) -> int:
+        """Append lines, return how many did not fit and were dropped."""
+        data = "".join(f"{line}\n" for line in lines)
+        with self._lock:
+            if self.size + len(data) > self.max_size:
+                return len(lines)
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as spill_file:
+                    spill_file.write(data)
+            except OSError as err:
+                _LOGGER.error("Could not buffer events on disk: %s", err)
+                return len(lines)
+            self.size += len(data)
+        return 0
+
+    def take(self) -> List[str]:
+        """Remove and return all buffered lines."""
+        with self._lock:
+            if not self.size:
+                return []
+            try:
+                with open(self.path, encoding="utf-8") as spill_file:
+                    lines = spill_file.read().splitlines()
+                os.remove(self.path)
+            except OSError as err:
+                _LOGGER.error("Could not read events buffered on disk: %s", err)
+                return []
+            self.size = 0
+        return lines
+
+
+class InfluxThread(threading.Thread):
+    """A threaded event handler class.
+
+    Batches of line protocol points are written by a pool of writers so
+    a slow write does not hold up the next batches. Points that cannot be
+    written after the retries, or that waited in the queue for too long,
+    are kept in the spill buffer and written once InfluxDB accepts writes
+    again.
+    """
+
+    def __init__(
+        self,
+        hass,
+        influx,
+        event_to_line,
+        max_tries,
+        batch_size,
+        flush_interval,
+        spill,
+    ):
         """Initialize the listener."""
         threading.Thread.__init__(self, name=DOMAIN)
         self.queue = queue.Queue()
         self.influx = influx
-        self.event_to_json = event_to_json
+        self.event_to_line = event_to_line
         self.max_tries = max_tries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill = spill
         self.write_errors = 0
         self.shutdown = False
+        self.points_written = 0
+        self.points_spilled = 0
+        self.points_dropped = 0
+        self.write_latency = 0.0
+        self._writers = ThreadPoolExecutor(
+            WRITE_CONCURRENCY, thread_name_prefix=f"{DOMAIN}_writer"
+        )
+        self._writer_slots = threading.BoundedSemaphore(WRITE_CONCURRENCY)
+        self._stats_lock = threading.Lock()
+        self._replaying = False
         hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
 
     @callback
@@ -507,78 +601,163 @@ class InfluxThread(threading.Thread):
         item = (time.monotonic(), event)
         self.queue.put(item)
 
-    @staticmethod
-    def batch_timeout():
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return the queue depth, write latency and point counters."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "write_latency": self.write_latency,
+            "points_written": self.points_written,
+            "points_spilled": self.points_spilled,
+            "points_dropped": self.points_dropped,
+            "spill_size": self.spill.size,
+        }
+
+    def batch_timeout(self):
         """Return number of seconds to wait for more events."""
-        return BATCH_TIMEOUT
+        return self.flush_interval
 
-    def get_events_json(self):
+    def get_events_lines(self):
         """Return a batch of events formatted for writing."""
         queue_seconds = QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
 
         count = 0
-        json = []
-
-        dropped = 0
+        lines = []
+        old_lines = []
+        deadline = None
 
         try:
-            while len(json) < BATCH_BUFFER_SIZE and not self.shutdown:
-                timeout = None if count == 0 else self.batch_timeout()
+            while len(lines) < self.batch_size and not self.shutdown:
+                timeout = None
+                if count:
+                    if deadline is None:
+                        deadline = time.monotonic() + self.batch_timeout()
+                    timeout = max(deadline - time.monotonic(), 0)
                 item = self.queue.get(timeout=timeout)
                 count += 1
 
                 if item is None:
                     self.shutdown = True
+                    continue
+
+                timestamp, event = item
+                line = self.event_to_line(event)
+                if not line:
+                    continue
+                if time.monotonic() - timestamp < queue_seconds:
+                    lines.append(line)
                 else:
-                    timestamp, event = item
-                    age = time.monotonic() - timestamp
-
-                    if age < queue_seconds:
-                        event_json = self.event_to_json(event)
-                        if event_json:
-                            json.append(event_json)
-                    else:
-                        dropped += 1
+                    old_lines.append(line)
 
         except queue.Empty:
             pass
 
+        if old_lines:
+            _LOGGER.warning(CATCHING_UP_MESSAGE, len(old_lines))
+            self._spill_lines(old_lines)
+
+        return count, lines
+
+    def _spill_lines(self, lines):
+        """Keep lines on disk to write them later."""
+        dropped = self.spill.append(lines)
+        with self._stats_lock:
+            self.points_spilled += len(lines) - dropped
+            self.points_dropped += dropped
         if dropped:
-            _LOGGER.warning(CATCHING_UP_MESSAGE, dropped)
+            _LOGGER.error(SPILL_FULL_MESSAGE, dropped)
 
-        return count, json
+    def write_to_influxdb(self, lines):
+        """Write preprocessed events to influxdb, with retry.
 
-    def write_to_influxdb(self, json):
-        """Write preprocessed events to influxdb, with retry."""
+        Returns whether InfluxDB accepted writes.
+        """
         for retry in range(self.max_tries + 1):
             try:
-                self.influx.write(json)
-
-                if self.write_errors:
-                    _LOGGER.error(RESUMED_MESSAGE, self.write_errors)
-                    self.write_errors = 0
-
-                _LOGGER.debug(WROTE_MESSAGE, len(json))
-                break
+                start = time.monotonic()
+                self.influx.write(lines)
+                latency = time.monotonic() - start
+
+                with self._stats_lock:
+                    self.write_latency = latency
+                    self.points_written += len(lines)
+                    write_errors, self.write_errors = self.write_errors, 0
+                if write_errors:
+                    _LOGGER.error(RESUMED_MESSAGE, write_errors)
+
+                _LOGGER.debug(WROTE_MESSAGE, len(lines))
+                return True
             except ValueError as err:
                 _LOGGER.error(err)
-                break
+                with self._stats_lock:
+                    self.points_dropped += len(lines)
+                return True
             except ConnectionError as err:
                 if retry < self.max_tries:
                     time.sleep(RETRY_DELAY)
-                else:
-                    if not self.write_errors:
-                        _LOGGER.error(err)
-                    self.write_errors += len(json)
+                    continue
+                with self._stats_lock:
+                    write_errors = self.write_errors
+                    self.write_errors += len(lines)
+                if not write_errors:
+                    _LOGGER.error(err)
+                self._spill_lines(lines)
+        return False
+
+    def _replay_spilled(self):
+        """Write the lines buffered on disk, in batches."""
+        with self._stats_lock:
+            if self._replaying or not self.spill.size:
+                return
+            self._replaying = True
+
+        try:
+            lines = self.spill.take()
+            for index in range(0, len(lines), self.batch_size):
+                batch = lines[index : index + self.batch_size]
+                try:
+                    self.influx.write(batch)
+                except ValueError as err:
+                    _LOGGER.error(err)
+                    with self._stats_lock:
+                        self.points_dropped += len(batch)
+                    continue
+                except ConnectionError:
+                    dropped = self.spill.append(lines[index:])
+                    if dropped:
+                        _LOGGER.error(SPILL_FULL_MESSAGE, dropped)
+                        with self._stats_lock:
+                            self.points_dropped += dropped
+                    return
+                with self._stats_lock:
+                    self.points_written += len(batch)
+            if lines:
+                _LOGGER.debug(REPLAYED_MESSAGE, len(lines))
+        finally:
+            self._replaying = False
+
+    def _write_batch(self, lines, count):
+        """Write a batch in a writer thread and mark its events done."""
+        try:
+            if self.write_to_influxdb(lines):
+                self._replay_spilled()
+        finally:
+            self._writer_slots.release()
+            for _ in range(count):
+                self.queue.task_done()
 
     def run(self):
         """Process incoming events."""
         while not self.shutdown:
-            count, json = self.get_events_json()
-            if json:
-                self.write_to_influxdb(json)
-            for _ in range(count):
-                self.queue.task_done()
+            count, lines = self.get_events_lines()
+            if not lines:
+                for _ in range(count):
+                    self.queue.task_done()
+                continue
+            # Wait for a free writer, events queue up in the meantime
+            self._writer_slots.acquire()
+            self._writers.submit(self._write_batch, lines, count)
+        self._writers.shutdown()
 
     def block_till_done(self):
         """Block till all events processed."""
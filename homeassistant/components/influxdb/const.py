@@ -31,6 +31,8 @@ CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_RETRY_COUNT = "max_retries"
 CONF_IGNORE_ATTRIBUTES = "ignore_attributes"
 CONF_PRECISION = "precision"
+CONF_BATCH_SIZE = "batch_size"
+CONF_FLUSH_INTERVAL = "flush_interval"
 
 CONF_LANGUAGE = "language"
 CONF_QUERIES = "queries"
@@ -77,6 +79,9 @@ QUEUE_BACKLOG_SECONDS = 30
 RETRY_INTERVAL = 60  # seconds
 BATCH_TIMEOUT = 1
 BATCH_BUFFER_SIZE = 100
+WRITE_CONCURRENCY = 4
+SPILL_FILE = "influxdb.spill"
+SPILL_MAX_SIZE = 32 * 1024 * 1024
 LANGUAGE_INFLUXQL = "influxQL"
 LANGUAGE_FLUX = "flux"
 TEST_QUERY_V1 = "SHOW DATABASES;"
@@ -116,9 +121,11 @@ QUERY_ERROR = (
     "Could not execute query '%s' due to '%s'. Check the syntax of your query."
 )
 RETRY_MESSAGE = f"%s Retrying in {RETRY_INTERVAL} seconds."
-CATCHING_UP_MESSAGE = "Catching up, dropped %d old events."
-RESUMED_MESSAGE = "Resumed, lost %d events."
+CATCHING_UP_MESSAGE = "Catching up, buffered %d old events on disk."
+RESUMED_MESSAGE = "Resumed, buffered %d events on disk."
 WROTE_MESSAGE = "Wrote %d events."
+REPLAYED_MESSAGE = "Wrote %d events buffered on disk."
+SPILL_FULL_MESSAGE = "Disk buffer is full, dropped %d events."
 RUNNING_QUERY_MESSAGE = "Running query: %s."
 QUERY_NO_RESULTS_MESSAGE = "Query returned no results, sensor state set to UNKNOWN: %s."
 QUERY_MULTIPLE_RESULTS_MESSAGE = (
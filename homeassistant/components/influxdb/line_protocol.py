@@ -0,0 +1,93 @@
+"""Encoding of points in the InfluxDB line protocol."""
+from datetime import datetime, timezone
+from numbers import Integral
+from typing import Dict, Optional, Union
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Nanoseconds per unit of the write precision
+PRECISION_DIVISORS = {
+    None: 1,
+    "n": 1,
+    "ns": 1,
+    "u": 10 ** 3,
+    "us": 10 ** 3,
+    "ms": 10 ** 6,
+    "s": 10 ** 9,
+}
+
+_KEY_ESCAPES = str.maketrans(
+    {"\\": "\\\\", " ": "\\ ", ",": "\\,", "=": "\\=", "\n": "\\n"}
+)
+_STRING_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
+
+def escape_key(key: str) -> str:
+    """Escape a measurement, tag key or field key."""
+    return key.translate(_KEY_ESCAPES)
+
+
+def escape_tag_value(value) -> str:
+    """Escape a tag value."""
+    if value is None:
+        return ""
+    escaped = str(value).translate(_KEY_ESCAPES)
+    if escaped.endswith("\\"):
+        escaped += " "
+    return escaped
+
+
+def encode_field_value(value: Union[float, str]) -> str:
+    """Encode a float or string field value."""
+    if isinstance(value, str):
+        if not value:
+            return ""
+        return f'"{value.translate(_STRING_ESCAPES)}"'
+    return repr(value)
+
+
+def encode_timestamp(timestamp: Union[datetime, int], divisor: int) -> int:
+    """Return a timestamp as integer in units of divisor nanoseconds.
+
+    Integer timestamps are assumed to be in the write precision already.
+    """
+    if isinstance(timestamp, Integral):
+        return timestamp
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    delta = timestamp - EPOCH
+    nanoseconds = (
+        (delta.days * 86400 + delta.seconds) * 10 ** 6 + delta.microseconds
+    ) * 1000
+    return nanoseconds // divisor
+
+
+def encode_line(
+    measurement,
+    tags: Dict[str, str],
+    fields: Dict[str, Union[float, str]],
+    timestamp: Optional[int],
+) -> Optional[str]:
+    """Encode a point as line, None if it has no fields.
+
+    Tags and fields are sorted by key and the ones with an empty value are
+    left out, as the InfluxDB clients do.
+    """
+    key = escape_key(str(measurement))
+    for tag_key in sorted(tags):
+        tag_value = escape_tag_value(tags[tag_key])
+        if tag_key and tag_value:
+            key += f",{escape_key(tag_key)}={tag_value}"
+
+    field_set = []
+    for field_key in sorted(fields):
+        field_value = encode_field_value(fields[field_key])
+        if field_key and field_value:
+            field_set.append(f"{escape_key(field_key)}={field_value}")
+    if not field_set:
+        return None
+
+    line = f"{key} {','.join(field_set)}"
+    if timestamp is not None:
+        line += f" {timestamp}"
+    return line
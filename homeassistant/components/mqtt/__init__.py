@@ -1,6 +1,7 @@
 """Support for MQTT message handling."""
 import asyncio
-from functools import lru_cache, partial, wraps
+from collections import deque
+from functools import partial, wraps
 import inspect
 from itertools import groupby
 import json
@@ -9,7 +10,7 @@ from operator import attrgetter
 import os
 import ssl
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
 
 import attr
 import certifi
@@ -83,6 +84,7 @@ from .discovery import (
 )
 from .models import Message, MessageCallbackType, PublishPayloadType
 from .subscription import async_subscribe_topics, async_unsubscribe_topics
+from .trie import TopicTrie
 from .util import _VALID_QOS_SCHEMA, valid_publish_topic, valid_subscribe_topic
 
 _LOGGER = logging.getLogger(__name__)
@@ -135,6 +137,10 @@ CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
 DISCOVERY_COOLDOWN = 2
 TIMEOUT_ACK = 10
 
+# Messages handled before other jobs on the event loop get a turn
+MAX_MESSAGES_PER_DRAIN = 1000
+MESSAGE_RATE_INTERVAL = 10
+
 PLATFORMS = [
     "alarm_control_panel",
     "binary_sensor",
@@ -631,7 +637,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str = attr.ib(default="utf-8")
@@ -655,6 +660,7 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: List[Subscription] = []
+        self.subscription_trie = TopicTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -663,6 +669,14 @@ class MQTT:
 
         self._pending_operations = {}
 
+        # Appended by the paho thread, drained by the event loop
+        self._messages: Deque[Any] = deque()
+        self._drain_scheduled = False
+        self.messages_received = 0
+        self.message_rate = 0.0
+        self._rate_started = time.monotonic()
+        self._rate_received = 0
+
         if self.hass.state == CoreState.running:
             self._ha_started.set()
         else:
@@ -840,11 +854,9 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
         self.subscriptions.append(subscription)
-        self._matching_subscriptions.cache_clear()
+        self.subscription_trie.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -857,7 +869,7 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
-            self._matching_subscriptions.cache_clear()
+            self.subscription_trie.remove(topic, subscription)
 
             if any(other.topic == topic for other in self.subscriptions):
                 # Other subscriptions on topic remaining - don't unsubscribe.
@@ -944,17 +956,53 @@ class MQTT:
             birth_message = Message(**self.conf[CONF_BIRTH_MESSAGE])
             self.hass.loop.create_task(publish_birth_message(birth_message))
 
+    @property
+    def message_backlog(self) -> int:
+        """Return the number of received messages not handled yet."""
+        return len(self._messages)
+
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
 
-    @lru_cache(2048)
-    def _matching_subscriptions(self, topic):
-        subscriptions = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+        Only the first message of a batch wakes up the event loop.
+        """
+        self._messages.append(msg)
+        self.messages_received += 1
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.hass.loop.call_soon_threadsafe(self._mqtt_handle_messages)
+
+    @callback
+    def _mqtt_handle_messages(self) -> None:
+        """Handle the messages received since the last time."""
+        # Cleared first, messages appended from now on schedule another run
+        self._drain_scheduled = False
+        messages = self._messages
+        for _ in range(MAX_MESSAGES_PER_DRAIN):
+            if not messages:
+                break
+            msg = messages.popleft()
+            try:
+                self._mqtt_handle_message(msg)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling message on topic %s", msg.topic)
+        else:
+            if messages and not self._drain_scheduled:
+                self._drain_scheduled = True
+                self.hass.loop.call_soon(self._mqtt_handle_messages)
+
+        now = time.monotonic()
+        elapsed = now - self._rate_started
+        if elapsed >= MESSAGE_RATE_INTERVAL:
+            received = self.messages_received
+            self.message_rate = (received - self._rate_received) / elapsed
+            self._rate_started = now
+            self._rate_received = received
+            _LOGGER.debug(
+                "Receiving %.1f messages per second, %s waiting",
+                self.message_rate,
+                len(messages),
+            )
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -966,14 +1014,19 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        subscriptions = self._matching_subscriptions(msg.topic)
+        subscriptions = self.subscription_trie.match(msg.topic)
+        # The payload is decoded once per encoding
+        payloads: Dict[Optional[str], SubscribePayloadType] = {None: msg.payload}
 
         for subscription in subscriptions:
 
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
+            if subscription.encoding in payloads:
+                payload = payloads[subscription.encoding]
+            else:
                 try:
-                    payload = msg.payload.decode(subscription.encoding)
+                    payload = payloads[subscription.encoding] = msg.payload.decode(
+                        subscription.encoding
+                    )
                 except (AttributeError, UnicodeDecodeError):
                     _LOGGER.warning(
                         "Can't decode payload %s on %s with encoding %s (for %s)",
@@ -1064,16 +1117,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
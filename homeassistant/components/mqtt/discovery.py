@@ -1,5 +1,6 @@
 """Support for MQTT discovery."""
 import asyncio
+from collections import deque
 import functools
 import json
 import logging
@@ -8,6 +9,7 @@ import time
 
 from homeassistant.components import mqtt
 from homeassistant.const import CONF_DEVICE, CONF_PLATFORM
+from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.loader import async_get_mqtt
@@ -75,30 +77,62 @@ async def async_start(
 ) -> bool:
     """Start MQTT Discovery."""
     mqtt_integrations = {}
-
-    async def async_entity_message_received(msg):
-        """Process the received message."""
+    # Retained discovery messages arrive in floods when connecting, they
+    # are queued and processed in batches by a single task
+    pending = deque()
+    worker = None
+
+    @callback
+    def async_entity_message_received(msg):
+        """Queue the received message."""
+        nonlocal worker
         hass.data[LAST_DISCOVERY] = time.time()
+        pending.append(msg)
+        if worker is None or worker.done():
+            worker = hass.async_create_task(async_process_messages())
+
+    async def async_process_messages():
+        """Process the queued messages in batches."""
+        while pending:
+            batch = [parse_message(pending.popleft()) for _ in range(len(pending))]
+            discovered = [item for item in batch if item is not None]
+
+            # The platforms of all new components are set up before any
+            # of the discovered items is sent to them
+            components = {}
+            for component, _, _, payload in discovered:
+                if payload:
+                    components[component] = None
+            for component in components:
+                await async_setup_component_entry(component)
+
+            for component, discovery_id, discovery_hash, payload in discovered:
+                async_dispatch_discovered(
+                    component, discovery_id, discovery_hash, payload
+                )
+
+    def parse_message(msg):
+        """Parse a received message, None if it is not a discovery message."""
         payload = msg.payload
         topic = msg.topic
         topic_trimmed = topic.replace(f"{discovery_topic}/", "", 1)
         match = TOPIC_MATCHER.match(topic_trimmed)
 
         if not match:
-            return
+            return None
 
         component, node_id, object_id = match.groups()
 
         if component not in SUPPORTED_COMPONENTS:
             _LOGGER.warning("Integration %s is not supported", component)
-            return
+            return None
 
         if payload:
             try:
                 payload = json.loads(payload)
             except ValueError:
                 _LOGGER.warning("Unable to parse JSON %s: '%s'", object_id, payload)
-                return
+                return None
 
         payload = MQTTConfig(payload)
 
@@ -139,6 +173,34 @@ async def async_start(
 
             payload[CONF_PLATFORM] = "mqtt"
 
+        return component, discovery_id, discovery_hash, payload
+
+    async def async_setup_component_entry(component):
+        """Set up the platform of a component for the config entry once."""
+        config_entries_key = f"{component}.mqtt"
+        async with hass.data[DATA_CONFIG_ENTRY_LOCK]:
+            if config_entries_key not in hass.data[CONFIG_ENTRY_IS_SETUP]:
+                if component == "device_automation":
+                    # Local import to avoid circular dependencies
+                    # pylint: disable=import-outside-toplevel
+                    from . import device_automation
+
+                    await device_automation.async_setup_entry(hass, config_entry)
+                elif component == "tag":
+                    # Local import to avoid circular dependencies
+                    # pylint: disable=import-outside-toplevel
+                    from . import tag
+
+                    await tag.async_setup_entry(hass, config_entry)
+                else:
+                    await hass.config_entries.async_forward_entry_setup(
+                        config_entry, component
+                    )
+                hass.data[CONFIG_ENTRY_IS_SETUP].add(config_entries_key)
+
+    @callback
+    def async_dispatch_discovered(component, discovery_id, discovery_hash, payload):
+        """Send a discovered item to its platform."""
         if ALREADY_DISCOVERED not in hass.data:
             hass.data[ALREADY_DISCOVERED] = {}
         if discovery_hash in hass.data[ALREADY_DISCOVERED]:
@@ -155,28 +217,6 @@ async def async_start(
             # Add component
             _LOGGER.info("Found new component: %s %s", component, discovery_id)
             hass.data[ALREADY_DISCOVERED][discovery_hash] = None
-
-            config_entries_key = f"{component}.mqtt"
-            async with hass.data[DATA_CONFIG_ENTRY_LOCK]:
-                if config_entries_key not in hass.data[CONFIG_ENTRY_IS_SETUP]:
-                    if component == "device_automation":
-                        # Local import to avoid circular dependencies
-                        # pylint: disable=import-outside-toplevel
-                        from . import device_automation
-
-                        await device_automation.async_setup_entry(hass, config_entry)
-                    elif component == "tag":
-                        # Local import to avoid circular dependencies
-                        # pylint: disable=import-outside-toplevel
-                        from . import tag
-
-                        await tag.async_setup_entry(hass, config_entry)
-                    else:
-                        await hass.config_entries.async_forward_entry_setup(
-                            config_entry, component
-                        )
-                    hass.data[CONFIG_ENTRY_IS_SETUP].add(config_entries_key)
-
             async_dispatcher_send(
                 hass, MQTT_DISCOVERY_NEW.format(component, "mqtt"), payload
             )
@@ -0,0 +1,96 @@
+"""Index of values by MQTT topic filter."""
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
+
+
+class _Node:
+    """Level of a topic filter."""
+
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, "_Node"] = {}
+        self.values: List[Tuple[int, Any]] = []
+
+
+class TopicTrie:
+    """Values stored by topic filter, found by the topics the filters match.
+
+    Each level of a filter is a node, so matching a topic only visits the
+    nodes of its levels and of the + and # wildcards next to them. Values
+    are returned in the order they were added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root = _Node()
+        self._next_seq = 0
+        self.lookups = 0
+        self.nodes_visited = 0
+
+    def add(self, topic_filter: str, value: Any) -> None:
+        """Add a value for a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _Node()
+            node = child
+        node.values.append((self._next_seq, value))
+        self._next_seq += 1
+
+    def remove(self, topic_filter: str, value: Any) -> None:
+        """Remove a value for a topic filter, raise KeyError if not found."""
+        path = []
+        node = self._root
+        for level in topic_filter.split("/"):
+            path.append((node, level))
+            node = node.children[level]
+
+        for index, (_, stored) in enumerate(node.values):
+            if stored is value:
+                del node.values[index]
+                break
+        else:
+            raise KeyError(topic_filter)
+
+        # Drop the levels no other filter uses
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.children or child.values:
+                break
+            del parent.children[level]
+
+    def match(self, topic: str) -> List[Any]:
+        """Return the values of the filters matching a topic."""
+        levels = topic.split("/")
+        depth = len(levels)
+        # Wildcards at the first level don't match topics starting with $
+        root_wildcards = not topic.startswith("$")
+
+        found: List[Tuple[int, Any]] = []
+        stack = [(self._root, 0)]
+        visited = 0
+        while stack:
+            node, index = stack.pop()
+            visited += 1
+            children = node.children
+            wildcards = index > 0 or root_wildcards
+            # A # also matches the parent level, sport/# matches sport
+            if wildcards and "#" in children:
+                found.extend(children["#"].values)
+            if index == depth:
+                found.extend(node.values)
+                continue
+            child = children.get(levels[index])
+            if child is not None:
+                stack.append((child, index + 1))
+            if wildcards and "+" in children:
+                stack.append((children["+"], index + 1))
+
+        self.lookups += 1
+        self.nodes_visited += visited
+        if len(found) > 1:
+            found.sort(key=itemgetter(0))
+        return [value for _, value in found]
@@ -32,8 +32,10 @@ from homeassistant.const import (
     TEMP_CELSIUS,
     TEMP_FAHRENHEIT,
 )
+from homeassistant.core import callback
 from homeassistant.helpers import entityfilter, state as state_helper
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.entity_values import EntityValues
 from homeassistant.util.temperature import fahrenheit_to_celsius
 
@@ -79,8 +81,6 @@ CONFIG_SCHEMA = vol.Schema(
 
 def setup(hass, config):
     """Activate Prometheus component."""
-    hass.http.register_view(PrometheusView(prometheus_client))
-
     conf = config[DOMAIN]
     entity_filter = conf[CONF_FILTER]
     namespace = conf.get(CONF_PROM_NAMESPACE)
@@ -103,10 +103,39 @@ def setup(hass, config):
         default_metric,
     )
 
+    hass.http.register_view(PrometheusView(prometheus_client, metrics))
+
     hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    hass.bus.listen(
+        EVENT_ENTITY_REGISTRY_UPDATED, metrics.handle_entity_registry_updated
+    )
     return True
 
 
+class _Collected:
+    """Registry for rendering already collected metric families."""
+
+    def __init__(self, families):
+        """Initialize with the families to render."""
+        self._families = families
+
+    def collect(self):
+        """Return the families."""
+        return self._families
+
+
+class _EntityMetrics:
+    """Label values and metric children of an entity."""
+
+    __slots__ = ("friendly_name", "label_values", "children")
+
+    def __init__(self, state):
+        """Initialize from the state of the entity."""
+        self.friendly_name = state.attributes.get(ATTR_FRIENDLY_NAME)
+        self.label_values = (state.entity_id, self.friendly_name, state.domain)
+        self.children = {}
+
+
 class PrometheusMetrics:
     """Model all of the metrics which should be exposed to Prometheus."""
 
@@ -140,11 +169,28 @@ class PrometheusMetrics:
             self.metrics_prefix = ""
         self._metrics = {}
         self._climate_units = climate_units
-
+        self._handlers = {
+            name[len("_handle_") :]: getattr(self, name)
+            for name in dir(self)
+            if name.startswith("_handle_") and name != "_handle_attributes"
+        }
+        self._entities = {}
+        # Metrics are kept apart from the default collectors so their
+        # output can be rendered per series
+        self._registry = prometheus_cli.CollectorRegistry(auto_describe=True)
+        self._labelnames = {}
+        # Header and sample lines per block of the output of each metric,
+        # counters have a second block for their _created samples
+        self._headers = {}
+        self._series = {}
+        self._dirty = {}
+
+    @callback
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
         state = event.data.get("new_state")
         if state is None:
+            self._entities.pop(event.data["entity_id"], None)
             return
 
         entity_id = state.entity_id
@@ -154,30 +200,104 @@ class PrometheusMetrics:
         if not self._filter(state.entity_id):
             return
 
-        handler = f"_handle_{domain}"
+        entity = self._entities.get(entity_id)
+        if (
+            entity is None
+            or entity.friendly_name != state.attributes.get(ATTR_FRIENDLY_NAME)
+            or entity.label_values[2] != state.domain
+        ):
+            entity = self._entities[entity_id] = _EntityMetrics(state)
+
+        handler = self._handlers.get(domain)
 
-        if hasattr(self, handler) and state.state != STATE_UNAVAILABLE:
-            getattr(self, handler)(state)
+        if handler is not None and state.state != STATE_UNAVAILABLE:
+            handler(state)
 
-        labels = self._labels(state)
         state_change = self._metric(
             "state_change", self.prometheus_cli.Counter, "The number of state changes"
         )
-        state_change.labels(**labels).inc()
+        self._child(state, state_change).inc()
 
         entity_available = self._metric(
             "entity_available",
             self.prometheus_cli.Gauge,
             "Entity is available (not in the unavailable state)",
         )
-        entity_available.labels(**labels).set(float(state.state != STATE_UNAVAILABLE))
+        self._child(state, entity_available).set(
+            float(state.state != STATE_UNAVAILABLE)
+        )
 
         last_updated_time_seconds = self._metric(
             "last_updated_time_seconds",
             self.prometheus_cli.Gauge,
             "The last_updated timestamp",
         )
-        last_updated_time_seconds.labels(**labels).set(state.last_updated.timestamp())
+        self._child(state, last_updated_time_seconds).set(
+            state.last_updated.timestamp()
+        )
+
+    @callback
+    def handle_entity_registry_updated(self, event):
+        """Forget the cached labels of removed or renamed entities."""
+        self._entities.pop(event.data["entity_id"], None)
+        if "old_entity_id" in event.data:
+            self._entities.pop(event.data["old_entity_id"], None)
+
+    def _child(self, state, metric, *extra_label_values):
+        """Return the child of a metric for an entity and extra labels.
+
+        The series of the child is rendered again with the next scrape.
+        """
+        entity = self._entities[state.entity_id]
+        key = (metric, extra_label_values)
+        child = entity.children.get(key)
+        if child is None:
+            child = entity.children[key] = metric.labels(
+                *entity.label_values, *extra_label_values
+            )
+        self._dirty[(metric, entity.label_values + extra_label_values)] = child
+        return child
+
+    def _render_series(self, metric, label_values, child):
+        """Render the sample lines of a single series of a metric."""
+        labels = dict(zip(self._labelnames[metric], map(str, label_values)))
+        families = child.collect()
+        for family in families:
+            family.samples = [
+                sample._replace(labels=labels) for sample in family.samples
+            ]
+
+        # Every run of comment lines starts a block
+        headers = []
+        samples = []
+        for line in self.prometheus_cli.generate_latest(
+            _Collected(families)
+        ).splitlines(keepends=True):
+            if not line.startswith(b"#"):
+                samples[-1] += line
+            elif headers and not samples[-1]:
+                headers[-1] += line
+            else:
+                headers.append(line)
+                samples.append(b"")
+        self._headers[metric] = headers
+        self._series.setdefault(metric, {})[label_values] = samples
+
+    def generate_latest(self):
+        """Render the metrics, only the series that changed since the last time."""
+        dirty, self._dirty = self._dirty, {}
+        for (metric, label_values), child in dirty.items():
+            self._render_series(metric, label_values, child)
+
+        output = [self.prometheus_cli.generate_latest()]
+        for metric in self._metrics.values():
+            series = self._series.get(metric)
+            if not series:
+                continue
+            for index, header in enumerate(self._headers[metric]):
+                output.append(header)
+                output.extend(samples[index] for samples in series.values())
+        return b"".join(output)
 
     def _handle_attributes(self, state):
         for key, value in state.attributes.items():
@@ -187,24 +307,28 @@ class PrometheusMetrics:
                 f"{key} attribute of {state.domain} entity",
             )
 
+            if not isinstance(value, (int, float, str)):
+                continue
             try:
                 value = float(value)
-                metric.labels(**self._labels(state)).set(value)
-            except (ValueError, TypeError):
+                self._child(state, metric).set(value)
+            except ValueError:
                 pass
 
     def _metric(self, metric, factory, documentation, extra_labels=None):
-        labels = ["entity", "friendly_name", "domain"]
-        if extra_labels is not None:
-            labels.extend(extra_labels)
-
         try:
             return self._metrics[metric]
         except KeyError:
+            labels = ["entity", "friendly_name", "domain"]
+            if extra_labels is not None:
+                labels.extend(extra_labels)
             full_metric_name = self._sanitize_metric_name(
                 f"{self.metrics_prefix}{metric}"
             )
-            self._metrics[metric] = factory(full_metric_name, documentation, labels)
+            self._metrics[metric] = factory(
+                full_metric_name, documentation, labels, registry=self._registry
+            )
+            self._labelnames[self._metrics[metric]] = labels
             return self._metrics[metric]
 
     @staticmethod
@@ -231,14 +355,6 @@ class PrometheusMetrics:
             value = 0
         return value
 
-    @staticmethod
-    def _labels(state):
-        return {
-            "entity": state.entity_id,
-            "domain": state.domain,
-            "friendly_name": state.attributes.get(ATTR_FRIENDLY_NAME),
-        }
-
     def _battery(self, state):
         if "battery_level" in state.attributes:
             metric = self._metric(
@@ -248,7 +364,7 @@ class PrometheusMetrics:
             )
             try:
                 value = float(state.attributes[ATTR_BATTERY_LEVEL])
-                metric.labels(**self._labels(state)).set(value)
+                self._child(state, metric).set(value)
             except ValueError:
                 pass
 
@@ -259,7 +375,7 @@ class PrometheusMetrics:
             "State of the binary sensor (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(state, metric).set(value)
 
     def _handle_input_boolean(self, state):
         metric = self._metric(
@@ -268,7 +384,7 @@ class PrometheusMetrics:
             "State of the input boolean (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(state, metric).set(value)
 
     def _handle_device_tracker(self, state):
         metric = self._metric(
@@ -277,14 +393,14 @@ class PrometheusMetrics:
             "State of the device tracker (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(state, metric).set(value)
 
     def _handle_person(self, state):
         metric = self._metric(
             "person_state", self.prometheus_cli.Gauge, "State of the person (0/1)"
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(state, metric).set(value)
 
     def _handle_light(self, state):
         metric = self._metric(
@@ -297,7 +413,7 @@ class PrometheusMetrics:
             else:
                 value = self.state_as_number(state)
             value = value * 100
-            metric.labels(**self._labels(state)).set(value)
+            self._child(state, metric).set(value)
         except ValueError:
             pass
 
@@ -306,7 +422,7 @@ class PrometheusMetrics:
             "lock_state", self.prometheus_cli.Gauge, "State of the lock (0/1)"
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(state, metric).set(value)
 
     def _handle_climate(self, state):
         temp = state.attributes.get(ATTR_TEMPERATURE)
@@ -318,7 +434,7 @@ class PrometheusMetrics:
                 self.prometheus_cli.Gauge,
                 "Temperature in degrees Celsius",
             )
-            metric.labels(**self._labels(state)).set(temp)
+            self._child(state, metric).set(temp)
 
         current_temp = state.attributes.get(ATTR_CURRENT_TEMPERATURE)
         if current_temp:
@@ -329,7 +445,7 @@ class PrometheusMetrics:
                 self.prometheus_cli.Gauge,
                 "Current Temperature in degrees Celsius",
             )
-            metric.labels(**self._labels(state)).set(current_temp)
+            self._child(state, metric).set(current_temp)
 
         current_action = state.attributes.get(ATTR_HVAC_ACTION)
         if current_action:
@@ -340,9 +456,7 @@ class PrometheusMetrics:
                 ["action"],
             )
             for action in CURRENT_HVAC_ACTIONS:
-                metric.labels(**dict(self._labels(state), action=action)).set(
-                    float(action == current_action)
-                )
+                self._child(state, metric, action).set(float(action == current_action))
 
     def _handle_humidifier(self, state):
         humidifier_target_humidity_percent = state.attributes.get(ATTR_HUMIDITY)
@@ -352,7 +466,7 @@ class PrometheusMetrics:
                 self.prometheus_cli.Gauge,
                 "Target Relative Humidity",
             )
-            metric.labels(**self._labels(state)).set(humidifier_target_humidity_percent)
+            self._child(state, metric).set(humidifier_target_humidity_percent)
 
         metric = self._metric(
             "humidifier_state",
@@ -361,7 +475,7 @@ class PrometheusMetrics:
         )
         try:
             value = self.state_as_number(state)
-            metric.labels(**self._labels(state)).set(value)
+            self._child(state, metric).set(value)
         except ValueError:
             pass
 
@@ -375,9 +489,7 @@ class PrometheusMetrics:
                 ["mode"],
             )
             for mode in available_modes:
-                metric.labels(**dict(self._labels(state), mode=mode)).set(
-                    float(mode == current_mode)
-                )
+                self._child(state, metric, mode).set(float(mode == current_mode))
 
     def _handle_sensor(self, state):
         unit = self._unit_string(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT))
@@ -396,7 +508,7 @@ class PrometheusMetrics:
                 value = self.state_as_number(state)
                 if unit == TEMP_FAHRENHEIT:
                     value = fahrenheit_to_celsius(value)
-                _metric.labels(**self._labels(state)).set(value)
+                self._child(state, _metric).set(value)
             except ValueError:
                 pass
 
@@ -454,7 +566,7 @@ class PrometheusMetrics:
 
         try:
             value = self.state_as_number(state)
-            metric.labels(**self._labels(state)).set(value)
+            self._child(state, metric).set(value)
         except ValueError:
             pass
 
@@ -470,7 +582,7 @@ class PrometheusMetrics:
             "Count of times an automation has been triggered",
         )
 
-        metric.labels(**self._labels(state)).inc()
+        self._child(state, metric).inc()
 
 
 class PrometheusView(HomeAssistantView):
@@ -479,15 +591,16 @@ class PrometheusView(HomeAssistantView):
     url = API_ENDPOINT
     name = "api:prometheus"
 
-    def __init__(self, prometheus_cli):
+    def __init__(self, prometheus_cli, metrics):
         """Initialize Prometheus view."""
         self.prometheus_cli = prometheus_cli
+        self.metrics = metrics
 
     async def get(self, request):
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
         return web.Response(
-            body=self.prometheus_cli.generate_latest(),
+            body=self.metrics.generate_latest(),
             content_type=CONTENT_TYPE_TEXT_PLAIN,
         )
@@ -35,8 +35,11 @@ from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
 from . import migration, purge
+from .bulk import BulkWriter
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .dedup import EventDataManager, StateAttributesManager
+from .models import Base, Events, RecorderRuns, States, Statistics
+from .statistics import StatisticsCompiler
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -59,6 +62,7 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_BULK_WRITE = False
 KEEPALIVE_TIME = 30
 
 # Controls how often we clean up
@@ -66,6 +70,7 @@ KEEPALIVE_TIME = 30
 EXPIRE_AFTER_COMMITS = 120
 
 CONF_AUTO_PURGE = "auto_purge"
+CONF_BULK_WRITE = "bulk_write"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
@@ -97,6 +102,9 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_BULK_WRITE, default=DEFAULT_BULK_WRITE
+                    ): cv.boolean,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -161,6 +169,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    bulk_write = conf[CONF_BULK_WRITE]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
@@ -181,6 +190,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         db_integrity_check=db_integrity_check,
+        bulk_write=bulk_write,
     )
     instance.async_initialize()
     instance.start()
@@ -218,6 +228,7 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: List[str],
         db_integrity_check: bool,
+        bulk_write: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -245,9 +256,16 @@ class Recorder(threading.Thread):
         self._keepalive_count = 0
         self._old_states = {}
         self._pending_expunge = []
+        self._state_attributes = StateAttributesManager()
+        self._event_data = EventDataManager()
+        self._statistics = StatisticsCompiler()
+        self.bulk_writer = (
+            BulkWriter(self._state_attributes, self._event_data) if bulk_write else None
+        )
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
+        self.purge_progress = None
 
     @callback
     def async_initialize(self):
@@ -360,9 +378,13 @@ class Recorder(threading.Thread):
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
+                # Pending rows may reference shared attributes or
+                # event data that the purge would otherwise consider unused
+                self._commit_event_session_or_retry()
                 # Schedule a new purge task if this one didn't finish
                 if not purge.purge_old_data(self, event.keep_days, event.repack):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
+                self._reset_shared_data()
                 continue
             if isinstance(event, WaitTask):
                 self._queue_watch.set()
@@ -386,11 +408,32 @@ class Recorder(threading.Thread):
                 if not self.entity_filter(entity_id):
                     continue
 
+            if event.event_type == EVENT_STATE_CHANGED:
+                new_state = event.data.get("new_state")
+                if new_state is not None:
+                    try:
+                        self._statistics.add_state(new_state)
+                    except Exception as err:  # pylint: disable=broad-except
+                        # Must catch the exception to prevent the loop from collapsing
+                        _LOGGER.exception("Error adding statistics: %s", err)
+
+            if self.bulk_writer is not None:
+                self._add_event_to_bulk_writer(event)
+                continue
+
             try:
                 if event.event_type == EVENT_STATE_CHANGED:
                     dbevent = Events.from_event(event, event_data="{}")
                 else:
-                    dbevent = Events.from_event(event)
+                    dbevent = Events(**Events.row_from_event(event))
+                    event_data = self._event_data.get_for_event(
+                        self.event_session, event
+                    )
+                    if event_data.data_id:
+                        dbevent.data_id = event_data.data_id
+                    else:
+                        dbevent.event_data_rel = event_data
+                        self._pending_expunge.append(event_data)
                 dbevent.created = event.time_fired
                 self.event_session.add(dbevent)
             except (TypeError, ValueError):
@@ -401,7 +444,15 @@ class Recorder(threading.Thread):
 
             if dbevent and event.event_type == EVENT_STATE_CHANGED:
                 try:
-                    dbstate = States.from_event(event)
+                    dbstate = States(**States.row_from_event(event))
+                    state_attributes = self._state_attributes.get_for_event(
+                        self.event_session, event
+                    )
+                    if state_attributes.attributes_id:
+                        dbstate.attributes_id = state_attributes.attributes_id
+                    else:
+                        dbstate.state_attributes = state_attributes
+                        self._pending_expunge.append(state_attributes)
                     has_new_state = event.data.get("new_state")
                     if dbstate.entity_id in self._old_states:
                         old_state = self._old_states.pop(dbstate.entity_id)
@@ -431,6 +482,21 @@ class Recorder(threading.Thread):
             if not self.commit_interval:
                 self._commit_event_session_or_retry()
 
+    def _add_event_to_bulk_writer(self, event):
+        """Queue an event for the next bulk write."""
+        try:
+            self.bulk_writer.add_event(self.event_session, event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding event: %s", err)
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -481,7 +547,17 @@ class Recorder(threading.Thread):
         )
         self._reopen_event_session()
 
+    def _reset_shared_data(self):
+        """Forget shared rows that may not exist in the database."""
+        self._state_attributes.reset()
+        self._event_data.reset()
+
     def _reopen_event_session(self):
+        self._reset_shared_data()
+        self._statistics.reset()
+        if self.bulk_writer is not None:
+            self.bulk_writer.reset()
+
         try:
             self.event_session.rollback()
         except Exception as err:  # pylint: disable=broad-except
@@ -505,6 +581,13 @@ class Recorder(threading.Thread):
         self._commits_without_expire += 1
 
         try:
+            if self.bulk_writer is not None:
+                self.bulk_writer.flush(self.event_session, self.queue.qsize())
+            self._statistics.close_ended(dt_util.utcnow())
+            if self._statistics.pending:
+                self.event_session.execute(
+                    Statistics.__table__.insert(), self._statistics.pending
+                )
             if self._pending_expunge:
                 self.event_session.flush()
                 for dbstate in self._pending_expunge:
@@ -517,8 +600,14 @@ class Recorder(threading.Thread):
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            # Shared rows written in this transaction are gone
+            self._reset_shared_data()
             raise
 
+        if self.bulk_writer is not None:
+            self.bulk_writer.committed()
+        self._statistics.committed()
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -563,6 +652,9 @@ class Recorder(threading.Thread):
                 old_isolation = dbapi_connection.isolation_level
                 dbapi_connection.isolation_level = None
                 cursor = dbapi_connection.cursor()
+                # Lets purge release free pages without a full VACUUM,
+                # only applies to new databases until the next VACUUM
+                cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
                 cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.close()
                 dbapi_connection.isolation_level = old_isolation
@@ -636,6 +728,9 @@ class Recorder(threading.Thread):
         if self.event_session is not None:
             self.run_info.end = dt_util.utcnow()
             self.event_session.add(self.run_info)
+            # Keep the partial periods, history merges them with the
+            # rest of the period after a restart
+            self._statistics.close_ended()
             self._commit_event_session_or_retry()
             self.event_session.close()
 
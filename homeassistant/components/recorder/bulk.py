@@ -0,0 +1,222 @@
+"""Batched multi-row INSERT writer for the recorder."""
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, text
+
+from homeassistant.const import EVENT_STATE_CHANGED
+
+from .dedup import EventDataManager, StateAttributesManager
+from .models import EventData, Events, StateAttributes, States
+
+_LOGGER = logging.getLogger(__name__)
+
+POSTGRESQL_DIALECT = "postgresql"
+
+
+class BulkWriter:
+    """Collect a commit interval's worth of events and write them in batches.
+
+    Rows are built as plain column dicts and written with one executemany
+    INSERT per table instead of going through the ORM unit of work.
+    Primary keys are assigned in process so states can reference their
+    event and previous state without reading ids back from the database.
+    The recorder thread must be the only writer of the recorder tables
+    while bulk writing is enabled.
+    """
+
+    def __init__(
+        self, state_attributes: StateAttributesManager, event_data: EventDataManager
+    ) -> None:
+        """Initialize the bulk writer."""
+        self._state_attributes = state_attributes
+        self._event_data = event_data
+        self._pending: List[List[Any]] = []
+        self._pending_attributes: List[StateAttributes] = []
+        self._pending_event_data: List[EventData] = []
+        self._old_state_ids: Dict[str, int] = {}
+        self._last_event_id: Optional[int] = None
+        self._last_state_id: Optional[int] = None
+        self._last_attributes_id: Optional[int] = None
+        self._last_data_id: Optional[int] = None
+        self._flush_started: Optional[float] = None
+        self.rows_written = 0
+        self.rows_per_second = 0.0
+        self.queue_depth = 0
+
+    @property
+    def pending_rows(self) -> int:
+        """Return the number of rows waiting to be written."""
+        return (
+            len(self._pending_attributes)
+            + len(self._pending_event_data)
+            + sum(1 if pending[1] is None else 2 for pending in self._pending)
+        )
+
+    def add_event(self, session, event) -> None:
+        """Build the rows for an event and queue them for the next flush.
+
+        Raises TypeError or ValueError when the event is not JSON serializable.
+        """
+        if event.event_type != EVENT_STATE_CHANGED:
+            event_data = self._event_data.get_for_event(session, event)
+            self._pending.append(
+                [Events.row_from_event(event), None, False, None, event_data]
+            )
+            return
+
+        state_row = States.row_from_event(event)
+        has_new_state = event.data.get("new_state") is not None
+        if not has_new_state:
+            state_row["state"] = None
+        state_row["created"] = event.time_fired
+        state_row["old_state_id"] = None
+        state_attributes = self._state_attributes.get_for_event(session, event)
+        event_row = Events.row_from_event(event, event_data="{}")
+        self._pending.append(
+            [event_row, state_row, has_new_state, state_attributes, None]
+        )
+
+    def flush(self, session, queue_depth: int) -> None:
+        """Write all pending rows within the session transaction.
+
+        Rows keep their assigned ids until the commit succeeds so a
+        retried commit writes exactly the same rows.
+        """
+        if not self._pending:
+            return
+
+        if self._flush_started is None:
+            self._flush_started = time.monotonic()
+        self.queue_depth = queue_depth
+
+        if self._last_event_id is None:
+            self._last_event_id = session.query(func.max(Events.event_id)).scalar() or 0
+            self._last_state_id = session.query(func.max(States.state_id)).scalar() or 0
+            self._last_attributes_id = (
+                session.query(func.max(StateAttributes.attributes_id)).scalar() or 0
+            )
+            self._last_data_id = (
+                session.query(func.max(EventData.data_id)).scalar() or 0
+            )
+
+        event_rows = []
+        state_rows = []
+        for pending in self._pending:
+            event_row, state_row = pending[:2]
+            if "event_id" not in event_row:
+                self._assign_ids(*pending)
+            event_rows.append(event_row)
+            if state_row is not None:
+                state_rows.append(state_row)
+
+        if self._pending_attributes:
+            session.execute(
+                StateAttributes.__table__.insert(),
+                [
+                    {
+                        "attributes_id": attributes.attributes_id,
+                        "hash": attributes.hash,
+                        "shared_attrs": attributes.shared_attrs,
+                    }
+                    for attributes in self._pending_attributes
+                ],
+            )
+        if self._pending_event_data:
+            session.execute(
+                EventData.__table__.insert(),
+                [
+                    {
+                        "data_id": event_data.data_id,
+                        "hash": event_data.hash,
+                        "shared_data": event_data.shared_data,
+                    }
+                    for event_data in self._pending_event_data
+                ],
+            )
+        session.execute(Events.__table__.insert(), event_rows)
+        if state_rows:
+            session.execute(States.__table__.insert(), state_rows)
+
+        if session.bind.dialect.name == POSTGRESQL_DIALECT:
+            # Explicit ids do not advance the sequences
+            self._sync_sequence(session, "events_event_id_seq", self._last_event_id)
+            self._sync_sequence(session, "states_state_id_seq", self._last_state_id)
+            self._sync_sequence(
+                session,
+                "state_attributes_attributes_id_seq",
+                self._last_attributes_id,
+            )
+            self._sync_sequence(session, "event_data_data_id_seq", self._last_data_id)
+
+    def _assign_ids(
+        self, event_row, state_row, has_new_state, state_attributes, event_data
+    ) -> None:
+        """Assign primary keys and link rows to the rows they reference."""
+        self._last_event_id += 1
+        event_row["event_id"] = self._last_event_id
+        event_row["created"] = event_row["time_fired"]
+        if state_row is None:
+            if event_data.data_id is None:
+                self._last_data_id += 1
+                event_data.data_id = self._last_data_id
+                self._pending_event_data.append(event_data)
+            event_row["data_id"] = event_data.data_id
+            return
+
+        event_row["data_id"] = None
+        self._last_state_id += 1
+        entity_id = state_row["entity_id"]
+        state_row["state_id"] = self._last_state_id
+        state_row["event_id"] = self._last_event_id
+        state_row["old_state_id"] = self._old_state_ids.pop(entity_id, None)
+        if state_attributes.attributes_id is None:
+            self._last_attributes_id += 1
+            state_attributes.attributes_id = self._last_attributes_id
+            self._pending_attributes.append(state_attributes)
+        state_row["attributes_id"] = state_attributes.attributes_id
+        if has_new_state:
+            self._old_state_ids[entity_id] = self._last_state_id
+
+    @staticmethod
+    def _sync_sequence(session, sequence: str, last_id: int) -> None:
+        """Move a PostgreSQL sequence past the ids we assigned."""
+        session.execute(
+            text(f"SELECT setval('{sequence}', GREATEST(:last_id, 1))"),
+            {"last_id": last_id},
+        )
+
+    def committed(self) -> None:
+        """Clear the written rows and update the throughput figures."""
+        if self._flush_started is None:
+            return
+
+        rows = self.pending_rows
+        duration = time.monotonic() - self._flush_started
+        self._pending = []
+        self._pending_attributes = []
+        self._pending_event_data = []
+        self._flush_started = None
+        self.rows_written += rows
+        if duration > 0:
+            self.rows_per_second = rows / duration
+        _LOGGER.debug(
+            "Bulk wrote %d rows in %.3fs (%.0f rows/s), queue depth %d",
+            rows,
+            duration,
+            self.rows_per_second,
+            self.queue_depth,
+        )
+
+    def reset(self) -> None:
+        """Drop pending rows and forget ids after the session was discarded."""
+        self._pending = []
+        self._pending_attributes = []
+        self._pending_event_data = []
+        self._flush_started = None
+        self._old_state_ids = {}
+        self._last_event_id = None
+        self._last_state_id = None
+        self._last_attributes_id = None
+        self._last_data_id = None
@@ -0,0 +1,130 @@
+"""Deduplication of JSON payloads shared between recorded rows."""
+from collections import OrderedDict
+import json
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from homeassistant.helpers.json import JSONEncoder
+
+from .models import EventData, StateAttributes, hash_shared_data
+
+SHARED_DATA_CACHE_SIZE = 2048
+
+
+class SharedDataManager:
+    """Map JSON payloads to the shared row that stores them.
+
+    The last payload seen for each key is remembered so an unchanged
+    payload is neither serialized nor looked up again. Other payloads
+    are found through a bounded LRU of recently used rows, then through
+    the database, and otherwise a new row is created.
+
+    Returned rows may not have been written yet, in which case their
+    primary key is still None.
+    """
+
+    row_class: Any = None
+    id_column = ""
+    shared_column = ""
+
+    def __init__(self, cache_size: int = SHARED_DATA_CACHE_SIZE) -> None:
+        """Initialize the manager."""
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._last_by_key: Dict[Hashable, Tuple[Any, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        session,
+        key: Optional[Hashable],
+        data: Any,
+        encode: Optional[Callable[[], str]] = None,
+    ) -> Any:
+        """Return the shared row for data.
+
+        Encode returns the JSON of data when it is already known.
+        Raises TypeError or ValueError when data is not JSON serializable.
+        """
+        if key is not None:
+            last = self._last_by_key.get(key)
+            if last is not None and (last[0] is data or last[0] == data):
+                self.hits += 1
+                return last[1]
+
+        if encode is not None:
+            shared = encode()
+        else:
+            shared = json.dumps(dict(data), cls=JSONEncoder)
+        row = self._cache.get(shared)
+        if row is not None:
+            self.hits += 1
+            self._cache.move_to_end(shared)
+        else:
+            self.misses += 1
+            row = self._find_or_create(session, shared)
+            self._cache[shared] = row
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        if key is not None:
+            self._last_by_key[key] = (data, row)
+        return row
+
+    def _find_or_create(self, session, shared: str) -> Any:
+        """Find the row for a payload in the database or create a new one."""
+        row_class = self.row_class
+        data_hash = hash_shared_data(shared)
+        with session.no_autoflush:
+            existing = (
+                session.query(getattr(row_class, self.id_column))
+                .filter(row_class.hash == data_hash)
+                .filter(getattr(row_class, self.shared_column) == shared)
+                .first()
+            )
+        row = row_class(hash=data_hash, **{self.shared_column: shared})
+        if existing is not None:
+            setattr(row, self.id_column, existing[0])
+        return row
+
+    def reset(self) -> None:
+        """Forget all rows, some of them may not exist anymore."""
+        self._cache.clear()
+        self._last_by_key.clear()
+
+
+class StateAttributesManager(SharedDataManager):
+    """Share state attributes between states."""
+
+    row_class = StateAttributes
+    id_column = "attributes_id"
+    shared_column = "shared_attrs"
+
+    def get_for_event(self, session, event) -> StateAttributes:
+        """Return the shared attributes for a state_changed event."""
+        state = event.data.get("new_state")
+        if state is None:
+            return self.get(session, event.data["entity_id"], {})
+        return self.get(
+            session,
+            event.data["entity_id"],
+            state.attributes,
+            lambda: StateAttributes.shared_attrs_from_event(event),
+        )
+
+
+class EventDataManager(SharedDataManager):
+    """Share event data between events."""
+
+    row_class = EventData
+    id_column = "data_id"
+    shared_column = "shared_data"
+
+    def get_for_event(self, session, event) -> EventData:
+        """Return the shared data for an event."""
+        return self.get(
+            session,
+            event.event_type,
+            event.data,
+            lambda: EventData.shared_data_from_event(event),
+        )
@@ -1,11 +1,14 @@
 """Models for SQLAlchemy."""
 import json
 import logging
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -25,14 +28,17 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 9
+SCHEMA_VERSION = 12
 
 _LOGGER = logging.getLogger(__name__)
 
 DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
+TABLE_EVENT_DATA = "event_data"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
+TABLE_STATISTICS = "statistics"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 
@@ -52,6 +58,8 @@ class Events(Base):  # type: ignore
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
     context_parent_id = Column(String(36), index=True)
+    data_id = Column(Integer, ForeignKey("event_data.data_id"), index=True)
+    event_data_rel = relationship("EventData")
 
     __table_args__ = (
         # Used for fetching events at a specific time
@@ -61,17 +69,32 @@ class Events(Base):  # type: ignore
 
     @staticmethod
     def from_event(event, event_data=None):
-        """Create an event database object from a native event."""
+        """Create an event database object from a native event.
+
+        The event data is stored inline, use EventData to share it.
+        """
         return Events(
-            event_type=event.event_type,
-            event_data=event_data or json.dumps(event.data, cls=JSONEncoder),
-            origin=str(event.origin.value),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
+            **Events.row_from_event(
+                event, event_data or EventData.shared_data_from_event(event)
+            )
         )
 
+    @staticmethod
+    def row_from_event(event, event_data=None):
+        """Create the column values of an event row from a native event.
+
+        The event data is only included when passed in.
+        """
+        return {
+            "event_type": event.event_type,
+            "event_data": event_data,
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
+
     def to_native(self, validate_entity_id=True):
         """Convert to a natve HA Event."""
         context = Context(
@@ -80,9 +103,12 @@ class Events(Base):  # type: ignore
             parent_id=self.context_parent_id,
         )
         try:
+            event_data = self.event_data
+            if event_data is None and self.event_data_rel is not None:
+                event_data = self.event_data_rel.shared_data
             return Event(
                 self.event_type,
-                json.loads(self.event_data),
+                json.loads(event_data) if event_data is not None else {},
                 EventOrigin(self.origin),
                 process_timestamp(self.time_fired),
                 context=context,
@@ -93,6 +119,39 @@ class Events(Base):  # type: ignore
             return None
 
 
+class EventData(Base):  # type: ignore
+    """Event data history, shared by events with equal data."""
+
+    __tablename__ = TABLE_EVENT_DATA
+    data_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_data = Column(Text)
+
+    @staticmethod
+    def from_event(event):
+        """Create object from an event."""
+        shared_data = EventData.shared_data_from_event(event)
+        return EventData(hash=hash_shared_data(shared_data), shared_data=shared_data)
+
+    @staticmethod
+    def shared_data_from_event(event):
+        """Serialize the data of an event, reusing the JSON of the event."""
+        try:
+            return event.data_json()
+        except ValueError:
+            # The memoized JSON does not allow NaN
+            return json.dumps(event.data, cls=JSONEncoder)
+
+    def to_native(self, validate_entity_id=True):
+        """Convert to the event data dict."""
+        try:
+            return json.loads(self.shared_data)
+        except ValueError:
+            # When json.loads fails
+            _LOGGER.exception("Error converting row to event data: %s", self)
+            return {}
+
+
 class States(Base):  # type: ignore
     """State change history."""
 
@@ -103,12 +162,16 @@ class States(Base):  # type: ignore
     state = Column(String(255))
     attributes = Column(Text)
     event_id = Column(Integer, ForeignKey("events.event_id"), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     last_changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
     last_updated = Column(DateTime(timezone=True), default=dt_util.utcnow, index=True)
     created = Column(DateTime(timezone=True), default=dt_util.utcnow)
-    old_state_id = Column(Integer, ForeignKey("states.state_id"))
+    old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes")
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -118,35 +181,53 @@ class States(Base):  # type: ignore
 
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are stored inline, use StateAttributes to share them.
+        """
+        dbstate = States(**States.row_from_event(event))
+        dbstate.attributes = StateAttributes.shared_attrs_from_event(event)
+        return dbstate
+
+    @staticmethod
+    def row_from_event(event):
+        """Create the column values of a state row from a state_changed event.
+
+        The attributes are not included.
+        """
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
-
-        return dbstate
+            return {
+                "entity_id": entity_id,
+                "state": "",
+                "domain": split_entity_id(entity_id)[0],
+                "attributes": None,
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+            }
+
+        return {
+            "entity_id": entity_id,
+            "state": state.state,
+            "domain": state.domain,
+            "attributes": None,
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
         try:
+            attributes = self.attributes
+            if attributes is None and self.state_attributes is not None:
+                attributes = self.state_attributes.shared_attrs
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(attributes) if attributes is not None else {},
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -160,6 +241,66 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """State attribute change history, shared by states with equal attributes."""
+
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        return StateAttributes(
+            hash=hash_shared_data(shared_attrs),
+            shared_attrs=shared_attrs,
+        )
+
+    @staticmethod
+    def shared_attrs_from_event(event):
+        """Serialize the attributes of the new state of a state_changed event."""
+        state = event.data.get("new_state")
+        if state is None:
+            return "{}"
+        try:
+            return state.attributes_json()
+        except ValueError:
+            # The memoized JSON does not allow NaN
+            return json.dumps(dict(state.attributes), cls=JSONEncoder)
+
+    def to_native(self, validate_entity_id=True):
+        """Convert to the attributes dict."""
+        try:
+            return json.loads(self.shared_attrs)
+        except ValueError:
+            # When json.loads fails
+            _LOGGER.exception("Error converting row to state attributes: %s", self)
+            return {}
+
+
+class Statistics(Base):  # type: ignore
+    """Aggregated numeric states of an entity over a fixed period."""
+
+    __tablename__ = TABLE_STATISTICS
+    id = Column(Integer, primary_key=True)
+    entity_id = Column(String(255))
+    period = Column(Integer)
+    start = Column(DateTime(timezone=True))
+    min = Column(Float)
+    max = Column(Float)
+    mean = Column(Float)
+    last = Column(Float)
+    count = Column(Integer)
+    unit_of_measurement = Column(String(255))
+
+    __table_args__ = (
+        Index("ix_statistics_entity_id_period_start", "entity_id", "period", "start"),
+        Index("ix_statistics_period_start", "period", "start"),
+    )
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -207,6 +348,11 @@ class SchemaChanges(Base):  # type: ignore
     changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
 
 
+def hash_shared_data(shared_data):
+    """Return the hash used to look up a serialized JSON payload."""
+    return zlib.crc32(shared_data.encode("utf-8"))
+
+
 def process_timestamp(ts):
     """Process a timestamp into datetime object."""
     if ts is None:
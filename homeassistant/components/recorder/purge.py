@@ -3,67 +3,86 @@ from datetime import timedelta
 import logging
 import time
 
+from sqlalchemy import distinct
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import EventData, Events, RecorderRuns, StateAttributes, States, Statistics
+from .statistics import PERIOD_5MINUTE
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rows deleted per batch, stays below the SQLite limit of 999 bound parameters
+MAX_ROWS_TO_PURGE = 998
+
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
+
+
+class PurgeProgress:
+    """Progress and timing of a purge that runs in batches."""
+
+    def __init__(self, purge_before) -> None:
+        """Initialize the purge progress."""
+        self.purge_before = purge_before
+        self.started = time.monotonic()
+        self.batches = 0
+        self.states_deleted = 0
+        self.events_deleted = 0
+        self.last_batch_duration = 0.0
+        self.finished = False
+
+    @property
+    def elapsed(self) -> float:
+        """Return the seconds since the purge started."""
+        return time.monotonic() - self.started
+
 
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Deletes at most MAX_ROWS_TO_PURGE states or events per call, oldest
+    primary keys first. Returns False when there is more to purge, the
+    recorder then schedules the next batch behind the events that queued
+    up in the meantime.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+    progress = instance.purge_progress
+    if progress is None or progress.finished:
+        progress = instance.purge_progress = PurgeProgress(purge_before)
     _LOGGER.debug("Purging states and events before target %s", purge_before)
 
+    batch_start = time.monotonic()
     try:
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
-                )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
-                )
-
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
-
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            states_deleted = _purge_states_batch(session, purge_before)
+            # States refer to their events, so events are only purged
+            # once all states before purge_before are gone
+            events_deleted = 0
+            if states_deleted < MAX_ROWS_TO_PURGE:
+                events_deleted = _purge_events_batch(session, purge_before)
+            # Hourly statistics are kept, they replace the purged states
+            statistics_deleted = _purge_statistics_batch(session, purge_before)
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+        progress.batches += 1
+        progress.states_deleted += states_deleted
+        progress.events_deleted += events_deleted
+        progress.last_batch_duration = time.monotonic() - batch_start
+        _LOGGER.debug(
+            "Purge batch %s deleted %s states and %s events in %.3fs",
+            progress.batches,
+            states_deleted,
+            events_deleted,
+            progress.last_batch_duration,
+        )
 
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
-                _LOGGER.debug("Purging hasn't fully completed yet")
-                return False
+        # A full batch means there may be more rows to purge
+        if MAX_ROWS_TO_PURGE in (states_deleted, events_deleted, statistics_deleted):
+            _LOGGER.debug("Purging hasn't fully completed yet")
+            return False
 
+        with session_scope(session=instance.get_session()) as session:
             # Recorder runs is small, no need to batch run it
             deleted_rows = (
                 session.query(RecorderRuns)
@@ -73,14 +92,16 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
         if repack:
-            # Execute sqlite or postgresql vacuum command to free up space on disk
-            if instance.engine.driver in ("pysqlite", "postgresql"):
-                _LOGGER.debug("Vacuuming SQL DB to free space")
-                instance.engine.execute("VACUUM")
-            # Optimize mysql / mariadb tables to free up space on disk
-            elif instance.engine.driver in ("mysqldb", "pymysql"):
-                _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+            _repack_database(instance)
+
+        progress.finished = True
+        _LOGGER.info(
+            "Purged %s states and %s events in %s batches in %.1fs",
+            progress.states_deleted,
+            progress.events_deleted,
+            progress.batches,
+            progress.elapsed,
+        )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -100,3 +121,139 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
     return True
+
+
+def _purge_states_batch(session, purge_before) -> int:
+    """Delete the oldest batch of states before purge_before."""
+    rows = (
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.last_updated < purge_before)
+        .order_by(States.state_id)
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
+    )
+    if not rows:
+        return 0
+
+    state_ids = [state_id for state_id, _ in rows]
+    attributes_ids = {attributes_id for _, attributes_id in rows if attributes_id}
+
+    # Newer states must not point to the states we delete
+    session.query(States).filter(States.old_state_id.in_(state_ids)).update(
+        {States.old_state_id: None}, synchronize_session=False
+    )
+    deleted_rows = (
+        session.query(States)
+        .filter(States.state_id.in_(state_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s states", deleted_rows)
+
+    deleted_shared = _purge_unused_shared_rows(
+        session, attributes_ids, StateAttributes.attributes_id, States.attributes_id
+    )
+    _LOGGER.debug("Deleted %s state attributes", deleted_shared)
+    return deleted_rows
+
+
+def _purge_events_batch(session, purge_before) -> int:
+    """Delete the oldest batch of events before purge_before."""
+    rows = (
+        session.query(Events.event_id, Events.data_id)
+        .filter(Events.time_fired < purge_before)
+        .order_by(Events.event_id)
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
+    )
+    if not rows:
+        return 0
+
+    event_ids = [event_id for event_id, _ in rows]
+    data_ids = {data_id for _, data_id in rows if data_id}
+
+    deleted_rows = (
+        session.query(Events)
+        .filter(Events.event_id.in_(event_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s events", deleted_rows)
+
+    deleted_shared = _purge_unused_shared_rows(
+        session, data_ids, EventData.data_id, Events.data_id
+    )
+    _LOGGER.debug("Deleted %s event data", deleted_shared)
+    return deleted_rows
+
+
+def _purge_statistics_batch(session, purge_before) -> int:
+    """Delete the oldest batch of 5-minute statistics before purge_before."""
+    statistic_ids = [
+        statistic_id
+        for statistic_id, in session.query(Statistics.id)
+        .filter(Statistics.period == PERIOD_5MINUTE)
+        .filter(Statistics.start < purge_before)
+        .order_by(Statistics.id)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    if not statistic_ids:
+        return 0
+
+    deleted_rows = (
+        session.query(Statistics)
+        .filter(Statistics.id.in_(statistic_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s statistics", deleted_rows)
+    return deleted_rows
+
+
+def _purge_unused_shared_rows(session, shared_ids, id_column, reference_column) -> int:
+    """Delete the shared rows with shared_ids that no remaining row refers to."""
+    if not shared_ids:
+        return 0
+
+    still_used = {
+        shared_id
+        for shared_id, in session.query(distinct(reference_column)).filter(
+            reference_column.in_(shared_ids)
+        )
+    }
+    unused = [shared_id for shared_id in shared_ids if shared_id not in still_used]
+    if not unused:
+        return 0
+
+    return (
+        session.query(id_column.class_)
+        .filter(id_column.in_(unused))
+        .delete(synchronize_session=False)
+    )
+
+
+def _repack_database(instance) -> None:
+    """Free up the space of the purged rows on disk."""
+    if instance.engine.driver == "pysqlite":
+        auto_vacuum = instance.engine.execute("PRAGMA auto_vacuum").scalar()
+        if auto_vacuum == SQLITE_AUTO_VACUUM_INCREMENTAL:
+            _LOGGER.debug("Incrementally vacuuming SQL DB to free space")
+            # Only a script runs the pragma to completion instead of
+            # releasing a single page
+            connection = instance.engine.raw_connection()
+            try:
+                connection.executescript("PRAGMA incremental_vacuum")
+            finally:
+                connection.close()
+            return
+
+        # Switching to incremental auto vacuum only takes effect after
+        # a full vacuum, all later repacks can then be incremental
+        _LOGGER.debug("Vacuuming SQL DB to free space")
+        instance.engine.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        instance.engine.execute("VACUUM")
+    # Execute postgresql vacuum command to free up space on disk
+    elif instance.engine.driver == "postgresql":
+        _LOGGER.debug("Vacuuming SQL DB to free space")
+        instance.engine.execute("VACUUM")
+    # Optimize mysql / mariadb tables to free up space on disk
+    elif instance.engine.driver in ("mysqldb", "pymysql"):
+        _LOGGER.debug("Optimizing SQL DB to free space")
+        instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
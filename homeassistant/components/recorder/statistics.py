@@ -0,0 +1,166 @@
+"""Incremental long-term statistics of numeric states."""
+from datetime import datetime
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+
+PERIOD_5MINUTE = 300
+PERIOD_HOUR = 3600
+
+STATISTICS_PERIODS = (PERIOD_5MINUTE, PERIOD_HOUR)
+
+
+class _Bucket:
+    """Running aggregate of the samples within one period."""
+
+    __slots__ = ("start", "end", "min", "max", "total", "count", "last", "unit")
+
+    def __init__(self, start: float, period: int, value: float, unit) -> None:
+        """Start a bucket with its first sample."""
+        self.start = start
+        self.end = start + period
+        self.min = value
+        self.max = value
+        self.total = value
+        self.count = 1
+        self.last = value
+        self.unit = unit
+
+    def add(self, value: float, unit) -> None:
+        """Add a sample."""
+        if value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.total += value
+        self.count += 1
+        self.last = value
+        self.unit = unit
+
+
+class StatisticsCompiler:
+    """Aggregate numeric states into 5-minute and hourly statistics.
+
+    Every state updates the open bucket of its entity for each period in
+    O(1). A bucket is turned into a row once a state of a later period
+    arrives or the period has ended, rows wait in pending until the
+    recorder wrote them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the compiler."""
+        self._buckets: Dict[Tuple[str, int], _Bucket] = {}
+        self._next_end: Optional[float] = None
+        self.pending: List[Dict[str, Any]] = []
+
+    def add_state(self, state: State) -> None:
+        """Add a state to the statistics of its entity if it is numeric."""
+        try:
+            value = float(state.state)
+        except ValueError:
+            return
+        if not math.isfinite(value):
+            return
+
+        entity_id = state.entity_id
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        timestamp = state.last_updated.timestamp()
+        for period in STATISTICS_PERIODS:
+            key = (entity_id, period)
+            start = timestamp - timestamp % period
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket.start == start:
+                bucket.add(value, unit)
+                continue
+            if bucket is not None:
+                self._close(entity_id, period, bucket)
+            bucket = self._buckets[key] = _Bucket(start, period, value, unit)
+            if self._next_end is None or bucket.end < self._next_end:
+                self._next_end = bucket.end
+
+    def close_ended(self, now: Optional[datetime] = None) -> None:
+        """Close the buckets of periods that ended before now.
+
+        Closes all buckets when now is None.
+        """
+        if now is None:
+            for (entity_id, period), bucket in self._buckets.items():
+                self._close(entity_id, period, bucket)
+            self._buckets = {}
+            self._next_end = None
+            return
+
+        timestamp = now.timestamp()
+        # All buckets of a period end at the same time, so this only
+        # walks the buckets once per 5 minutes
+        if self._next_end is None or timestamp < self._next_end:
+            return
+
+        next_end = None
+        for key, bucket in list(self._buckets.items()):
+            if bucket.end <= timestamp:
+                self._close(key[0], key[1], bucket)
+                del self._buckets[key]
+            elif next_end is None or bucket.end < next_end:
+                next_end = bucket.end
+        self._next_end = next_end
+
+    def _close(self, entity_id: str, period: int, bucket: _Bucket) -> None:
+        """Turn a bucket into a pending statistics row."""
+        self.pending.append(
+            {
+                "entity_id": entity_id,
+                "period": period,
+                "start": dt_util.utc_from_timestamp(bucket.start),
+                "min": bucket.min,
+                "max": bucket.max,
+                "mean": bucket.total / bucket.count,
+                "last": bucket.last,
+                "count": bucket.count,
+                "unit_of_measurement": bucket.unit,
+            }
+        )
+
+    def committed(self) -> None:
+        """Forget the rows that have been written."""
+        self.pending = []
+
+    def reset(self) -> None:
+        """Drop the rows that were lost with a discarded session."""
+        self.pending = []
+
+
+def merge_statistics_rows(rows) -> List[Dict[str, Any]]:
+    """Merge rows of one entity and period that share their start.
+
+    A restart writes the partial bucket it was in, the rest of the same
+    period is written as a second row later. Rows must be ordered by start
+    and id.
+    """
+    merged: List[Dict[str, Any]] = []
+    for row in rows:
+        if merged and merged[-1]["start"] == row.start:
+            last = merged[-1]
+            total = last["mean"] * last["count"] + row.mean * row.count
+            last["count"] += row.count
+            last["mean"] = total / last["count"]
+            last["min"] = min(last["min"], row.min)
+            last["max"] = max(last["max"], row.max)
+            last["last"] = row.last
+            last["unit_of_measurement"] = row.unit_of_measurement
+            continue
+        merged.append(
+            {
+                "start": row.start,
+                "min": row.min,
+                "max": row.max,
+                "mean": row.mean,
+                "last": row.last,
+                "count": row.count,
+                "unit_of_measurement": row.unit_of_measurement,
+            }
+        )
+    return merged
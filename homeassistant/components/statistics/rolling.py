@@ -0,0 +1,222 @@
+"""Rolling window statistics with incremental updates."""
+from collections import deque
+from datetime import datetime
+import heapq
+import math
+from typing import Deque, List, Optional, Set, Tuple
+
+
+class _RollingMedian:
+    """Median of a sliding window in O(log n) per update.
+
+    The lower half of the values is kept in a max-heap and the upper half
+    in a min-heap. Removed values are only marked and dropped once they
+    reach the top of their heap.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the median."""
+        self._low: List[Tuple[float, int]] = []
+        self._high: List[Tuple[float, int]] = []
+        self._in_low: Set[int] = set()
+        self._removed: Set[int] = set()
+        self._low_size = 0
+        self._high_size = 0
+
+    def add(self, value: float, seq: int) -> None:
+        """Add a value with its sequence number."""
+        if self._low_size and value > -self._low[0][0]:
+            heapq.heappush(self._high, (value, seq))
+            self._high_size += 1
+        else:
+            heapq.heappush(self._low, (-value, seq))
+            self._in_low.add(seq)
+            self._low_size += 1
+        self._rebalance()
+
+    def remove(self, seq: int) -> None:
+        """Remove the value with a sequence number."""
+        if seq in self._in_low:
+            self._in_low.discard(seq)
+            self._low_size -= 1
+        else:
+            self._high_size -= 1
+        self._removed.add(seq)
+        self._prune(self._low)
+        self._prune(self._high)
+        self._rebalance()
+        if len(self._removed) > self._low_size + self._high_size:
+            self._compact()
+
+    @property
+    def median(self) -> Optional[float]:
+        """Return the median, None when there are no values."""
+        if not self._low_size:
+            return None
+        if self._low_size > self._high_size:
+            return -self._low[0][0]
+        return (-self._low[0][0] + self._high[0][0]) / 2
+
+    def _prune(self, heap: List[Tuple[float, int]]) -> None:
+        """Drop removed values from the top of a heap."""
+        while heap and heap[0][1] in self._removed:
+            self._removed.discard(heapq.heappop(heap)[1])
+
+    def _rebalance(self) -> None:
+        """Keep the lower half equal to or one larger than the upper half."""
+        if self._low_size > self._high_size + 1:
+            value, seq = heapq.heappop(self._low)
+            self._in_low.discard(seq)
+            heapq.heappush(self._high, (-value, seq))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low)
+        elif self._high_size > self._low_size:
+            value, seq = heapq.heappop(self._high)
+            heapq.heappush(self._low, (-value, seq))
+            self._in_low.add(seq)
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high)
+
+    def _compact(self) -> None:
+        """Rebuild the heaps without the removed values."""
+        removed = self._removed
+        self._low = [entry for entry in self._low if entry[1] not in removed]
+        self._high = [entry for entry in self._high if entry[1] not in removed]
+        heapq.heapify(self._low)
+        heapq.heapify(self._high)
+        self._removed = set()
+
+
+class RollingStatistics:
+    """Statistics of the newest samples within a count and age limit.
+
+    Adding or removing a sample updates the running sums in O(1), the
+    minimum and maximum through monotonic deques in amortized O(1) and
+    the median in O(log n). The running sums are recomputed once per
+    window length of removals so rounding errors cannot build up.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        """Initialize an empty window of at most maxlen samples."""
+        self.maxlen = maxlen
+        self.values: Deque[float] = deque()
+        self.ages: Deque[datetime] = deque()
+        self._first_seq = 0
+        self._next_seq = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._total = 0.0
+        self._removals = 0
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._median = _RollingMedian()
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self.values)
+
+    def append(self, value: float, age: datetime) -> None:
+        """Add the newest sample, removing the oldest one if the window is full."""
+        if len(self.values) >= self.maxlen:
+            self.popleft()
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self.values.append(value)
+        self.ages.append(age)
+
+        count = len(self.values)
+        delta = value - self._mean
+        self._mean += delta / count
+        self._m2 += delta * (value - self._mean)
+        self._total += value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+        self._median.add(value, seq)
+
+    def popleft(self) -> None:
+        """Remove the oldest sample."""
+        value = self.values.popleft()
+        self.ages.popleft()
+        seq = self._first_seq
+        self._first_seq += 1
+
+        if self._min[0][0] == seq:
+            self._min.popleft()
+        if self._max[0][0] == seq:
+            self._max.popleft()
+        self._median.remove(seq)
+
+        count = len(self.values)
+        self._removals += 1
+        if not count or self._removals >= count:
+            self._resync()
+            return
+        delta = value - self._mean
+        self._mean -= delta / count
+        self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+        self._total -= value
+
+    def purge_before(self, oldest: datetime) -> int:
+        """Remove the samples older than oldest, return how many were removed."""
+        removed = 0
+        while self.ages and self.ages[0] < oldest:
+            self.popleft()
+            removed += 1
+        return removed
+
+    def _resync(self) -> None:
+        """Recompute the running sums from the samples."""
+        self._removals = 0
+        count = len(self.values)
+        if not count:
+            self._mean = self._m2 = self._total = 0.0
+            return
+        self._total = math.fsum(self.values)
+        self._mean = self._total / count
+        self._m2 = math.fsum((value - self._mean) ** 2 for value in self.values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean, None when there are no samples."""
+        return self._mean if self.values else None
+
+    @property
+    def median(self) -> Optional[float]:
+        """Return the median, None when there are no samples."""
+        return self._median.median
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Return the sample variance, None with less than two samples."""
+        if len(self.values) < 2:
+            return None
+        return self._m2 / (len(self.values) - 1)
+
+    @property
+    def stdev(self) -> Optional[float]:
+        """Return the sample standard deviation, None with less than two samples."""
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    @property
+    def total(self) -> float:
+        """Return the sum of the samples."""
+        return self._total
+
+    @property
+    def min(self) -> Optional[float]:
+        """Return the smallest sample, None when there are no samples."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """Return the largest sample, None when there are no samples."""
+        return self._max[0][1] if self._max else None
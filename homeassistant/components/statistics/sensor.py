@@ -1,12 +1,10 @@
 """Support for statistics for sensor values."""
-from collections import deque
 import logging
-import statistics
 
 import voluptuous as vol
 
-from homeassistant.components.recorder.models import States
-from homeassistant.components.recorder.util import execute, session_scope
+from homeassistant.components.recorder.models import States, process_timestamp
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
@@ -27,6 +25,7 @@ from homeassistant.helpers.reload import async_setup_reload_service
 from homeassistant.util import dt as dt_util
 
 from . import DOMAIN, PLATFORMS
+from .rolling import RollingStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -97,8 +96,7 @@ class StatisticsSensor(Entity):
         self._max_age = max_age
         self._precision = precision
         self._unit_of_measurement = None
-        self.states = deque(maxlen=self._sampling_size)
-        self.ages = deque(maxlen=self._sampling_size)
+        self._window = RollingStatistics(self._sampling_size)
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -146,22 +144,25 @@ class StatisticsSensor(Entity):
 
     def _add_state_to_queue(self, new_state):
         """Add the state to the queue."""
-        if new_state.state in [STATE_UNKNOWN, STATE_UNAVAILABLE]:
+        self._add_value_to_queue(new_state.state, new_state.last_updated)
+
+    def _add_value_to_queue(self, state, last_updated):
+        """Add a state value and the time it was set to the queue."""
+        if state in [STATE_UNKNOWN, STATE_UNAVAILABLE]:
             return
 
         try:
-            if self.is_binary:
-                self.states.append(new_state.state)
-            else:
-                self.states.append(float(new_state.state))
-
-            self.ages.append(new_state.last_updated)
+            # Binary sensors only count their states
+            value = 0.0 if self.is_binary else float(state)
         except ValueError:
             _LOGGER.error(
                 "%s: parsing error, expected number and received %s",
                 self.entity_id,
-                new_state.state,
+                state,
             )
+            return
+
+        self._window.append(value, last_updated)
 
     @property
     def name(self):
@@ -211,32 +212,26 @@ class StatisticsSensor(Entity):
 
     def _purge_old(self):
         """Remove states which are older than self._max_age."""
-        now = dt_util.utcnow()
+        oldest = dt_util.utcnow() - self._max_age
 
         _LOGGER.debug(
             "%s: purging records older then %s(%s)",
             self.entity_id,
-            dt_util.as_local(now - self._max_age),
+            dt_util.as_local(oldest),
             self._max_age,
         )
 
-        while self.ages and (now - self.ages[0]) > self._max_age:
-            _LOGGER.debug(
-                "%s: purging record with datetime %s(%s)",
-                self.entity_id,
-                dt_util.as_local(self.ages[0]),
-                (now - self.ages[0]),
-            )
-            self.ages.popleft()
-            self.states.popleft()
+        purged = self._window.purge_before(oldest)
+        _LOGGER.debug("%s: purged %s records", self.entity_id, purged)
 
     def _next_to_purge_timestamp(self):
         """Find the timestamp when the next purge would occur."""
-        if self.ages and self._max_age:
+        ages = self._window.ages
+        if ages and self._max_age:
             # Take the oldest entry from the ages list and add the configured max_age.
             # If executed after purging old states, the result is the next timestamp
             # in the future when the oldest state will expire.
-            return self.ages[0] + self._max_age
+            return ages[0] + self._max_age
         return None
 
     async def async_update(self):
@@ -245,37 +240,39 @@ class StatisticsSensor(Entity):
         if self._max_age is not None:
             self._purge_old()
 
-        self.count = len(self.states)
+        window = self._window
+        self.count = len(window)
 
         if not self.is_binary:
-            try:  # require only one data point
-                self.mean = round(statistics.mean(self.states), self._precision)
-                self.median = round(statistics.median(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if window:  # require only one data point
+                self.mean = round(window.mean, self._precision)
+                self.median = round(window.median, self._precision)
+            else:
+                _LOGGER.debug("%s: no data points", self.entity_id)
                 self.mean = self.median = STATE_UNKNOWN
 
-            try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states), self._precision)
-                self.variance = round(statistics.variance(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if len(window) > 1:  # require at least two data points
+                self.stdev = round(window.stdev, self._precision)
+                self.variance = round(window.variance, self._precision)
+            else:
+                _LOGGER.debug("%s: less than two data points", self.entity_id)
                 self.stdev = self.variance = STATE_UNKNOWN
 
-            if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+            if window:
+                values = window.values
+                self.total = round(window.total, self._precision)
+                self.min = round(window.min, self._precision)
+                self.max = round(window.max, self._precision)
 
-                self.min_age = self.ages[0]
-                self.max_age = self.ages[-1]
+                self.min_age = window.ages[0]
+                self.max_age = window.ages[-1]
 
-                self.change = self.states[-1] - self.states[0]
+                self.change = values[-1] - values[0]
                 self.average_change = self.change
                 self.change_rate = 0
 
-                if len(self.states) > 1:
-                    self.average_change /= len(self.states) - 1
+                if len(window) > 1:
+                    self.average_change /= len(window) - 1
 
                     time_diff = (self.max_age - self.min_age).total_seconds()
                     if time_diff > 0:
@@ -313,21 +310,31 @@ class StatisticsSensor(Entity):
             )
 
     async def _async_initialize_from_database(self):
-        """Initialize the list of states from the database.
+        """Initialize the list of states from the database."""
+        _LOGGER.debug("%s: initializing values from the database", self.entity_id)
+
+        rows = await self.hass.async_add_executor_job(self._fetch_recorded_states)
+        for state, last_updated in rows:
+            self._add_value_to_queue(state, process_timestamp(last_updated))
 
-        The query will get the list of states in DESCENDING order so that we
-        can limit the result to self._sample_size. Afterwards reverse the
-        list so that we get it in the right order again.
+        self.async_schedule_update_ha_state(True)
+
+        _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+
+    def _fetch_recorded_states(self):
+        """Return the recorded states and their update times, oldest first.
+
+        The query only reads the two columns the statistics need and gets
+        them in DESCENDING order so that we can limit the result to
+        self._sampling_size. Afterwards the list is reversed so that we
+        get it in the right order again.
 
         If MaxAge is provided then query will restrict to entries younger then
         current datetime - MaxAge.
         """
-
-        _LOGGER.debug("%s: initializing values from the database", self.entity_id)
-
         with session_scope(hass=self.hass) as session:
-            query = session.query(States).filter(
-                States.entity_id == self._entity_id.lower()
+            query = session.query(States.state, States.last_updated).filter(
+                States.entity_id == self._entity_id.lower(), States.state.isnot(None)
             )
 
             if self._max_age is not None:
@@ -344,11 +351,7 @@ class StatisticsSensor(Entity):
             query = query.order_by(States.last_updated.desc()).limit(
                 self._sampling_size
             )
-            states = execute(query, to_native=True, validate_entity_ids=False)
-
-        for state in reversed(states):
-            self._add_state_to_queue(state)
+            rows = query.all()
 
-        self.async_schedule_update_ha_state(True)
-
-        _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+        rows.reverse()
+        return rows
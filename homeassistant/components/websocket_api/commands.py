@@ -14,7 +14,12 @@ from homeassistant.exceptions import (
     Unauthorized,
 )
 from homeassistant.helpers import config_validation as cv, entity
-from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    async_track_state_change_event,
+    async_track_template_result,
+)
+from homeassistant.helpers.json import JSON_CACHE_INFO
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
 from homeassistant.loader import IntegrationNotFound, async_get_integration
@@ -29,6 +34,8 @@ def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
+    async_reg(hass, handle_update_entity_subscription)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -40,6 +47,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_event_bus_metrics)
 
 
 def pong_message(iden):
@@ -116,6 +124,207 @@ def handle_unsubscribe_events(hass, connection, msg):
         )
 
 
+class _EntitySubscription:
+    """Subscription to the state changes of a set of entities.
+
+    Every entity has its own listener in the state change index of
+    async_track_state_change_event, so changing the set only touches the
+    entities that were added or removed. Read permissions are checked
+    when entities are added instead of for every state change.
+    """
+
+    def __init__(self, hass, connection, iden):
+        """Initialize the subscription."""
+        self._hass = hass
+        self._connection = connection
+        self._iden = iden
+        self._unsubs = {}
+
+    @callback
+    def async_set_entity_ids(self, entity_ids):
+        """Subscribe to the readable entities of entity_ids only.
+
+        Returns the subscribed entity ids.
+        """
+        permissions = self._connection.user.permissions
+        if not permissions.access_all_entities(POLICY_READ):
+            entity_ids = [
+                entity_id
+                for entity_id in entity_ids
+                if permissions.check_entity(entity_id, POLICY_READ)
+            ]
+
+        wanted = set(entity_ids)
+        for entity_id in set(self._unsubs) - wanted:
+            self._unsubs.pop(entity_id)()
+        for entity_id in wanted - set(self._unsubs):
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self._hass, entity_id, self._async_forward
+            )
+        return sorted(self._unsubs)
+
+    @callback
+    def _async_forward(self, event):
+        """Forward a state changed event to the websocket."""
+        self._connection.send_message(messages.cached_event_message(self._iden, event))
+
+    @callback
+    def __call__(self):
+        """Unsubscribe from all entities."""
+        while self._unsubs:
+            self._unsubs.popitem()[1]()
+
+
+class _EntityDiffSubscription(_EntitySubscription):
+    """Entity subscription that sends coalesced state diffs.
+
+    The states of newly subscribed entities are sent in full under "a".
+    After that only the keys that changed since the last state sent for
+    an entity are sent under "c", removed entities are listed under "r".
+    State changes within ENTITY_DIFF_WINDOW are combined into a single
+    message that only contains the latest state of every entity.
+    """
+
+    def __init__(self, hass, connection, iden):
+        """Initialize the subscription."""
+        super().__init__(hass, connection, iden)
+        self._last_sent = {}
+        self._pending = {}
+        self._flush_handle = None
+
+    @callback
+    def async_set_entity_ids(self, entity_ids):
+        """Subscribe to the readable entities of entity_ids only.
+
+        The states of added entities are sent with the next message.
+        """
+        subscribed = super().async_set_entity_ids(entity_ids)
+        for entity_id in set(self._pending) - set(subscribed):
+            del self._pending[entity_id]
+        # The client still shows the entities it got a state of
+        for entity_id in set(self._last_sent) - set(subscribed):
+            self._pending[entity_id] = None
+
+        for entity_id in subscribed:
+            # Entities pending removal are subscribed again, the client
+            # gets their current state as it may have changed meanwhile
+            if self._pending.get(entity_id) is not None:
+                continue
+            if entity_id in self._last_sent and entity_id not in self._pending:
+                continue
+            state = self._hass.states.get(entity_id)
+            if state is not None:
+                self._pending[entity_id] = state
+        self._async_schedule_flush()
+        return subscribed
+
+    @callback
+    def _async_forward(self, event):
+        """Remember the latest state of the entity until the next flush."""
+        self._pending[event.data["entity_id"]] = event.data["new_state"]
+        self._async_schedule_flush()
+
+    @callback
+    def _async_schedule_flush(self):
+        """Flush the pending states at the end of the window."""
+        if self._flush_handle is None and self._pending:
+            self._flush_handle = self._hass.loop.call_later(
+                const.ENTITY_DIFF_WINDOW, self.async_flush
+            )
+
+    @callback
+    def async_flush(self):
+        """Send the changes of all pending states in one message."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        added = {}
+        changed = {}
+        removed = []
+        for entity_id, state in self._pending.items():
+            if state is None:
+                if self._last_sent.pop(entity_id, None) is not None:
+                    removed.append(entity_id)
+                continue
+
+            compressed = messages.compressed_state_dict(state)
+            last = self._last_sent.get(entity_id)
+            self._last_sent[entity_id] = compressed
+            if last is None:
+                added[entity_id] = compressed
+                continue
+            diff = messages.compressed_state_diff(last, compressed)
+            if diff:
+                changed[entity_id] = diff
+        self._pending = {}
+
+        event = {}
+        if added:
+            event["a"] = added
+        if changed:
+            event["c"] = changed
+        if removed:
+            event["r"] = removed
+        if event:
+            self._connection.send_message(messages.event_message(self._iden, event))
+
+    @callback
+    def __call__(self):
+        """Unsubscribe from all entities."""
+        super().__call__()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Required("entity_ids"): cv.entity_ids,
+        vol.Optional("diff", default=False): bool,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the state_changed events of the given entities only, or with
+    diff the coalesced changes of their states.
+    """
+    if msg["diff"]:
+        subscription = _EntityDiffSubscription(hass, connection, msg["id"])
+    else:
+        subscription = _EntitySubscription(hass, connection, msg["id"])
+    entity_ids = subscription.async_set_entity_ids(msg["entity_ids"])
+    connection.subscriptions[msg["id"]] = subscription
+    connection.send_result(msg["id"], {"entity_ids": entity_ids})
+
+    if msg["diff"]:
+        # Send the current states right away
+        subscription.async_flush()
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "update_entity_subscription",
+        vol.Required("subscription"): cv.positive_int,
+        vol.Required("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_update_entity_subscription(hass, connection, msg):
+    """Handle update entity subscription command."""
+    subscription = connection.subscriptions.get(msg["subscription"])
+
+    if not isinstance(subscription, _EntitySubscription):
+        connection.send_error(msg["id"], const.ERR_NOT_FOUND, "Subscription not found.")
+        return
+
+    entity_ids = subscription.async_set_entity_ids(msg["entity_ids"])
+    connection.send_result(msg["id"], {"entity_ids": entity_ids})
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "call_service",
@@ -409,3 +618,31 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "event_bus/metrics",
+        vol.Optional("enable"): bool,
+    }
+)
+@decorators.require_admin
+def handle_event_bus_metrics(hass, connection, msg):
+    """Handle event bus metrics command.
+
+    Optionally starts or stops recording the metrics first.
+    """
+    if "enable" in msg:
+        hass.bus.async_set_metrics_enabled(msg["enable"])
+
+    metrics = hass.bus.async_metrics()
+    connection.send_result(
+        msg["id"],
+        {
+            "enabled": metrics is not None,
+            "listeners": hass.bus.async_listeners(),
+            "event_types": metrics or {},
+            "json_cache": JSON_CACHE_INFO.as_dict(),
+        },
+    )
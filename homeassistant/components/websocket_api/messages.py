@@ -6,8 +6,9 @@ from typing import Any, Dict
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.json import json_dict_with_fragments
 from homeassistant.util.json import (
     find_paths_unserializable_data,
     format_unserializable_data,
@@ -28,6 +29,12 @@ MINIMAL_MESSAGE_SCHEMA = vol.Schema(
 # Base schema to extend by message handlers
 BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
 IDEN_TEMPLATE = "__IDEN__"
 IDEN_JSON_TEMPLATE = '"__IDEN__"'
 
@@ -71,7 +78,55 @@ def _cached_event_message(event: Event) -> str:
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
-    return message_to_json(event_message(IDEN_TEMPLATE, event))
+    message = event_message(IDEN_TEMPLATE, event)
+    try:
+        # The event JSON is shared with the other consumers of the event
+        return json_dict_with_fragments(message, {"event": event.as_json()})
+    except (ValueError, TypeError):
+        return message_to_json(message)
+
+
+def compressed_state_dict(state: State) -> Dict[str, Any]:
+    """Return a compact dict of a state with epoch timestamps."""
+    return {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: state.context.id,
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+        COMPRESSED_STATE_LAST_UPDATED: state.last_updated.timestamp(),
+    }
+
+
+def compressed_state_diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the changes from one compressed state dict to another.
+
+    Changed and added keys are under "+", with only the changed
+    attributes. Removed attributes are listed under "-". Returns an empty
+    dict when nothing changed.
+    """
+    additions = {
+        key: value
+        for key, value in new.items()
+        if key != COMPRESSED_STATE_ATTRIBUTES and old.get(key) != value
+    }
+    old_attributes = old[COMPRESSED_STATE_ATTRIBUTES]
+    new_attributes = new[COMPRESSED_STATE_ATTRIBUTES]
+    diff: Dict[str, Any] = {}
+
+    changed_attributes = {
+        key: value
+        for key, value in new_attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    if changed_attributes:
+        additions[COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+    removed_attributes = [key for key in old_attributes if key not in new_attributes]
+    if removed_attributes:
+        diff["-"] = {COMPRESSED_STATE_ATTRIBUTES: removed_attributes}
+
+    if additions:
+        diff["+"] = additions
+    return diff
 
 
 def message_to_json(message: Any) -> str:
@@ -14,7 +14,7 @@ import os
 import pathlib
 import re
 import threading
-from time import monotonic
+from time import monotonic, perf_counter
 from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
@@ -29,6 +29,7 @@ from typing import (
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -70,6 +71,11 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import (
+    JSON_CACHE_INFO,
+    JSON_DUMP,
+    json_dict_with_fragments,
+)
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
@@ -598,7 +604,15 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ["event_type", "data", "origin", "time_fired", "context"]
+    __slots__ = [
+        "event_type",
+        "data",
+        "origin",
+        "time_fired",
+        "context",
+        "_data_json",
+        "_as_json",
+    ]
 
     def __init__(
         self,
@@ -614,6 +628,8 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context()
+        self._data_json: Optional[str] = None
+        self._as_json: Optional[str] = None
 
     def __hash__(self) -> int:
         """Make hashable."""
@@ -633,6 +649,43 @@ class Event:
             "context": self.context.as_dict(),
         }
 
+    def data_json(self) -> str:
+        """Return the JSON of the event data, encoded once.
+
+        States in the data are inserted with their own memoized JSON.
+        Raises TypeError or ValueError when the data is not JSON serializable.
+        """
+        if self._data_json is not None:
+            JSON_CACHE_INFO.hits += 1
+            return self._data_json
+
+        JSON_CACHE_INFO.misses += 1
+        fragments = {
+            key: value.as_json()
+            for key, value in self.data.items()
+            if isinstance(value, State)
+        }
+        if fragments:
+            self._data_json = json_dict_with_fragments(self.data, fragments)
+        else:
+            self._data_json = JSON_DUMP(self.data)
+        return self._data_json
+
+    def as_json(self) -> str:
+        """Return the JSON of as_dict, encoded once and shared by all consumers.
+
+        Raises TypeError or ValueError when the data is not JSON serializable.
+        """
+        if self._as_json is not None:
+            JSON_CACHE_INFO.hits += 1
+            return self._as_json
+
+        JSON_CACHE_INFO.misses += 1
+        self._as_json = json_dict_with_fragments(
+            self.as_dict(), {"data": self.data_json()}
+        )
+        return self._as_json
+
     def __repr__(self) -> str:
         """Return the representation."""
         # pylint: disable=maybe-no-member
@@ -653,12 +706,50 @@ class Event:
         )
 
 
+class EventTypeMetrics:
+    """Dispatch metrics of an event type."""
+
+    __slots__ = ("fired", "listeners", "callbacks", "callback_time")
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.fired = 0
+        self.listeners = 0
+        self.callbacks = 0
+        self.callback_time = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the metrics."""
+        return {
+            "fired": self.fired,
+            "listeners": self.listeners,
+            "callbacks": self.callbacks,
+            "callback_time": self.callback_time,
+        }
+
+
+def _run_timed_callback(
+    metrics: EventTypeMetrics, target: Callable, event: "Event"
+) -> None:
+    """Run an event listener callback and record its run time."""
+    start = perf_counter()
+    try:
+        target(event)
+    finally:
+        metrics.callback_time += perf_counter() - start
+        metrics.callbacks += 1
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: Dict[str, List[HassJob]] = {}
+        # Jobs to run per fired event type, including the MATCH_ALL
+        # listeners. Rebuilt after the listeners changed.
+        self._dispatch_jobs: Dict[str, Tuple[HassJob, ...]] = {}
+        self._metrics: Optional[Dict[str, EventTypeMetrics]] = None
         self._hass = hass
 
     @callback
@@ -674,6 +765,34 @@ class EventBus:
         """Return dictionary with events and the number of listeners."""
         return run_callback_threadsafe(self._hass.loop, self.async_listeners).result()
 
+    @callback
+    def async_set_metrics_enabled(self, enabled: bool) -> None:
+        """Start or stop recording dispatch metrics per event type.
+
+        Stopping drops the recorded metrics. Only the run time of
+        callback listeners is measured, coroutine and executor listeners
+        are only counted.
+
+        This method must be run in the event loop.
+        """
+        if not enabled:
+            self._metrics = None
+        elif self._metrics is None:
+            self._metrics = {}
+
+    @callback
+    def async_metrics(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Return the dispatch metrics per event type, None when disabled.
+
+        This method must be run in the event loop.
+        """
+        if self._metrics is None:
+            return None
+        return {
+            event_type: metrics.as_dict()
+            for event_type, metrics in self._metrics.items()
+        }
+
     def fire(
         self,
         event_type: str,
@@ -699,23 +818,70 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
-
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        jobs = self._dispatch_jobs.get(event_type)
+        if jobs is None:
+            jobs = self._async_build_dispatch_jobs(event_type)
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
+        if self._metrics is not None:
+            self._async_fire_with_metrics(event, jobs)
             return
 
-        for job in listeners:
-            self._hass.async_add_hass_job(job, event)
+        if not jobs:
+            return
+
+        loop = self._hass.loop
+        for job in jobs:
+            # Callbacks are the common case, schedule them the way
+            # async_add_hass_job would without the extra call
+            if job.job_type == HassJobType.Callback:
+                loop.call_soon(job.target, event)
+            else:
+                self._hass.async_add_hass_job(job, event)
+
+    @callback
+    def _async_fire_with_metrics(
+        self, event: "Event", jobs: Tuple[HassJob, ...]
+    ) -> None:
+        """Schedule the jobs for an event and record the dispatch metrics."""
+        assert self._metrics is not None
+        metrics = self._metrics.get(event.event_type)
+        if metrics is None:
+            metrics = self._metrics[event.event_type] = EventTypeMetrics()
+        metrics.fired += 1
+        metrics.listeners = len(jobs)
+
+        loop = self._hass.loop
+        for job in jobs:
+            if job.job_type == HassJobType.Callback:
+                loop.call_soon(_run_timed_callback, metrics, job.target, event)
+            else:
+                self._hass.async_add_hass_job(job, event)
+
+    @callback
+    def _async_build_dispatch_jobs(self, event_type: str) -> Tuple[HassJob, ...]:
+        """Build and store the jobs to run when event_type is fired."""
+        listeners = self._listeners.get(event_type, [])
+
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        match_all_listeners = self._listeners.get(MATCH_ALL)
+        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
+            listeners = match_all_listeners + listeners
+
+        jobs = self._dispatch_jobs[event_type] = tuple(listeners)
+        return jobs
+
+    @callback
+    def _async_listeners_changed(self, event_type: str) -> None:
+        """Drop the dispatch jobs that include the listeners of event_type."""
+        if event_type == MATCH_ALL:
+            self._dispatch_jobs.clear()
+        else:
+            self._dispatch_jobs.pop(event_type, None)
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
@@ -747,6 +913,7 @@ class EventBus:
     @callback
     def _async_listen_job(self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(hassjob)
+        self._async_listeners_changed(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -813,6 +980,7 @@ class EventBus:
         """
         try:
             self._listeners[event_type].remove(hassjob)
+            self._async_listeners_changed(event_type)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
@@ -846,6 +1014,9 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
+        "_attributes_dict",
+        "_attributes_json",
     ]
 
     def __init__(
@@ -875,12 +1046,20 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        if isinstance(attributes, MappingProxyType):
+            # Already read-only, shared with the state it was taken from
+            self.attributes = attributes
+        else:
+            self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
+        self._as_json: Optional[str] = None
+        # Serialized attributes, shared by states that share their attributes
+        self._attributes_dict: Optional[Dict[str, Any]] = None
+        self._attributes_json: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -903,16 +1082,50 @@ class State:
                 last_updated_isoformat = last_changed_isoformat
             else:
                 last_updated_isoformat = self.last_updated.isoformat()
+            if self._attributes_dict is None:
+                self._attributes_dict = dict(self.attributes)
             self._as_dict = {
                 "entity_id": self.entity_id,
                 "state": self.state,
-                "attributes": dict(self.attributes),
+                "attributes": self._attributes_dict,
                 "last_changed": last_changed_isoformat,
                 "last_updated": last_updated_isoformat,
                 "context": self.context.as_dict(),
             }
         return self._as_dict
 
+    def attributes_json(self) -> str:
+        """Return the JSON of the attributes, encoded once.
+
+        Raises TypeError or ValueError when the attributes are not JSON
+        serializable.
+        """
+        if self._attributes_json is not None:
+            JSON_CACHE_INFO.hits += 1
+            return self._attributes_json
+
+        JSON_CACHE_INFO.misses += 1
+        if self._attributes_dict is None:
+            self._attributes_dict = dict(self.attributes)
+        self._attributes_json = JSON_DUMP(self._attributes_dict)
+        return self._attributes_json
+
+    def as_json(self) -> str:
+        """Return the JSON of as_dict, encoded once and shared by all consumers.
+
+        Raises TypeError or ValueError when the attributes are not JSON
+        serializable.
+        """
+        if self._as_json is not None:
+            JSON_CACHE_INFO.hits += 1
+            return self._as_json
+
+        JSON_CACHE_INFO.misses += 1
+        self._as_json = json_dict_with_fragments(
+            self.as_dict(), {"attributes": self.attributes_json()}
+        )
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -1099,7 +1312,7 @@ class StateMachine:
         self,
         entity_id: str,
         new_state: str,
-        attributes: Optional[Dict] = None,
+        attributes: Optional[Mapping] = None,
         force_update: bool = False,
         context: Optional[Context] = None,
     ) -> None:
@@ -1148,13 +1361,15 @@ class StateMachine:
         self,
         entity_id: str,
         new_state: str,
-        attributes: Optional[Dict] = None,
+        attributes: Optional[Mapping] = None,
         force_update: bool = False,
         context: Optional[Context] = None,
     ) -> None:
         """Set the state of an entity, add entity if it does not exist.
 
         Attributes is an optional dict to specify attributes of this state.
+        Passing the attributes of the current state marks them as unchanged
+        without comparing them.
 
         If you just update the attributes and not the state, last changed will
         not be affected.
@@ -1171,7 +1386,9 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = attributes is old_state.attributes or (
+                old_state.attributes == MappingProxyType(attributes)
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
@@ -1180,6 +1397,16 @@ class StateMachine:
         if context is None:
             context = Context()
 
+        attributes_dict = attributes_json = None
+        if same_attr:
+            # Consecutive states with equal attributes share one mapping
+            # and its serialized form instead of holding a copy each
+            assert old_state is not None
+            attributes = old_state.attributes
+            # pylint: disable=protected-access
+            attributes_dict = old_state._attributes_dict
+            attributes_json = old_state._attributes_json
+
         state = State(
             entity_id,
             new_state,
@@ -1189,6 +1416,9 @@ class StateMachine:
             context,
             old_state is None,
         )
+        # pylint: disable=protected-access
+        state._attributes_dict = attributes_dict
+        state._attributes_json = attributes_json
         self._states[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
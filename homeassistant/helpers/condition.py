@@ -204,11 +204,24 @@ def async_numeric_state(
     attribute: Optional[str] = None,
 ) -> bool:
     """Test a numeric state condition."""
+    return async_compile_numeric_state(hass, below, above, value_template, attribute)(
+        entity, variables
+    )
+
+
+def async_numeric_state_value(
+    hass: HomeAssistant,
+    entity: Union[None, str, State],
+    value_template: Optional[Template] = None,
+    variables: TemplateVarsType = None,
+    attribute: Optional[str] = None,
+) -> Optional[float]:
+    """Return the value a numeric state condition compares, None if it has none."""
     if isinstance(entity, str):
         entity = hass.states.get(entity)
 
     if entity is None or (attribute is not None and attribute not in entity.attributes):
-        return False
+        return None
 
     value: Any = None
     if value_template is None:
@@ -223,46 +236,111 @@ def async_numeric_state(
             value = value_template.async_render(variables)
         except TemplateError as ex:
             _LOGGER.error("Template error: %s", ex)
-            return False
+            return None
 
     if value in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-        return False
+        return None
 
     try:
-        fvalue = float(value)
+        return float(value)
     except ValueError:
         _LOGGER.warning(
             "Value cannot be processed as a number: %s (Offending entity: %s)",
             entity,
             value,
         )
-        return False
+        return None
 
-    if below is not None:
-        if isinstance(below, str):
-            below_entity = hass.states.get(below)
-            if (
-                not below_entity
-                or below_entity.state in (STATE_UNAVAILABLE, STATE_UNKNOWN)
-                or fvalue >= float(below_entity.state)
-            ):
+
+def _async_numeric_threshold(
+    hass: HomeAssistant, entity_id: str
+) -> Callable[[], Optional[float]]:
+    """Return a function returning the state of an entity as threshold.
+
+    The state is only converted again when the entity got a new state.
+    """
+    cached_state: Optional[State] = None
+    cached_value: Optional[float] = None
+
+    def threshold() -> Optional[float]:
+        """Return the threshold, None if the entity has no usable state."""
+        nonlocal cached_state, cached_value
+        state = hass.states.get(entity_id)
+        if state is not cached_state:
+            if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+                cached_value = None
+            else:
+                cached_value = float(state.state)
+            cached_state = state
+        return cached_value
+
+    return threshold
+
+
+def async_compile_numeric_range(
+    hass: HomeAssistant,
+    below: Optional[Union[float, str]] = None,
+    above: Optional[Union[float, str]] = None,
+) -> Callable[[float], bool]:
+    """Return a function testing if a value is within below and above.
+
+    Thresholds given as entity id use the state of the entity.
+    """
+    below_threshold: Optional[Callable[[], Optional[float]]] = None
+    below_value: Optional[float] = None
+    if isinstance(below, str):
+        below_threshold = _async_numeric_threshold(hass, below)
+    else:
+        below_value = below
+
+    above_threshold: Optional[Callable[[], Optional[float]]] = None
+    above_value: Optional[float] = None
+    if isinstance(above, str):
+        above_threshold = _async_numeric_threshold(hass, above)
+    else:
+        above_value = above
+
+    def in_range(value: float) -> bool:
+        """Test if the value is within the thresholds."""
+        if below_threshold is not None:
+            threshold = below_threshold()
+            if threshold is None or value >= threshold:
                 return False
-        elif fvalue >= below:
+        elif below_value is not None and value >= below_value:
             return False
 
-    if above is not None:
-        if isinstance(above, str):
-            above_entity = hass.states.get(above)
-            if (
-                not above_entity
-                or above_entity.state in (STATE_UNAVAILABLE, STATE_UNKNOWN)
-                or fvalue <= float(above_entity.state)
-            ):
+        if above_threshold is not None:
+            threshold = above_threshold()
+            if threshold is None or value <= threshold:
                 return False
-        elif fvalue <= above:
+        elif above_value is not None and value <= above_value:
             return False
 
-    return True
+        return True
+
+    return in_range
+
+
+def async_compile_numeric_state(
+    hass: HomeAssistant,
+    below: Optional[Union[float, str]] = None,
+    above: Optional[Union[float, str]] = None,
+    value_template: Optional[Template] = None,
+    attribute: Optional[str] = None,
+) -> Callable[[Union[None, str, State], TemplateVarsType], bool]:
+    """Compile a numeric state test for an entity and variables."""
+    in_range = async_compile_numeric_range(hass, below, above)
+
+    def test_numeric_state(
+        entity: Union[None, str, State], variables: TemplateVarsType = None
+    ) -> bool:
+        """Test the numeric state of an entity."""
+        value = async_numeric_state_value(
+            hass, entity, value_template, variables, attribute
+        )
+        return value is not None and in_range(value)
+
+    return test_numeric_state
 
 
 def async_numeric_state_from_config(
@@ -276,20 +354,24 @@ def async_numeric_state_from_config(
     below = config.get(CONF_BELOW)
     above = config.get(CONF_ABOVE)
     value_template = config.get(CONF_VALUE_TEMPLATE)
+    # Compiled with the first call, the factory doesn't get hass
+    test_numeric_state: Optional[
+        Callable[[Union[None, str, State], TemplateVarsType], bool]
+    ] = None
 
     def if_numeric_state(
         hass: HomeAssistant, variables: TemplateVarsType = None
     ) -> bool:
         """Test numeric state condition."""
-        if value_template is not None:
-            value_template.hass = hass
-
-        return all(
-            async_numeric_state(
-                hass, entity_id, below, above, value_template, variables, attribute
+        nonlocal test_numeric_state
+        if test_numeric_state is None:
+            if value_template is not None:
+                value_template.hass = hass
+            test_numeric_state = async_compile_numeric_state(
+                hass, below, above, value_template, attribute
             )
-            for entity_id in entity_ids
-        )
+
+        return all(test_numeric_state(entity_id, variables) for entity_id in entity_ids)
 
     return if_numeric_state
 
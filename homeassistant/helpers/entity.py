@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 from timeit import default_timer as timer
-from typing import Any, Awaitable, Dict, Iterable, List, Optional
+from typing import Any, Awaitable, Dict, Iterable, List, Mapping, Optional, Tuple
 
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import (
@@ -123,6 +123,12 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _added = False
 
+    # Attributes read once when static_attributes is True
+    _static_attributes_cache: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+
+    # Inputs and result of the last attribute assembly
+    _last_attributes: Optional[Tuple[Any, ...]] = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -227,6 +233,16 @@ class Entity(ABC):
         """Flag supported features."""
         return None
 
+    @property
+    def static_attributes(self) -> bool:
+        """Return True if only the state attributes change after the first write.
+
+        The capability attributes, unit of measurement, name, icon, entity
+        picture, assumed state, supported features and device class are then
+        read once and cached until async_invalidate_static_attributes.
+        """
+        return False
+
     @property
     def context_recent_time(self) -> timedelta:
         """Time that a context is considered recent."""
@@ -251,6 +267,11 @@ class Entity(ABC):
         """
         return self.registry_entry is None or not self.registry_entry.disabled
 
+    @callback
+    def async_invalidate_static_attributes(self) -> None:
+        """Read the static attributes again on the next write."""
+        self._static_attributes_cache = None
+
     @callback
     def async_set_context(self, context: Context) -> None:
         """Set the context the entity currently operates under."""
@@ -311,46 +332,22 @@ class Entity(ABC):
 
         start = timer()
 
-        attr = self.capability_attributes
-        attr = dict(attr) if attr else {}
+        static_attr = self._static_attributes_cache
+        if static_attr is None:
+            static_attr = self._async_read_static_attributes()
+            if self.static_attributes:
+                self._static_attributes_cache = static_attr
+        capability_attr, entity_attr = static_attr
 
-        if not self.available:
+        available = self.available
+        if not available:
             state = STATE_UNAVAILABLE
+            volatile_attr: Dict[str, Any] = {}
         else:
             sstate = self.state
             state = STATE_UNKNOWN if sstate is None else str(sstate)
-            attr.update(self.state_attributes or {})
-            attr.update(self.device_state_attributes or {})
-
-        unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
-        if name is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        icon = (entry and entry.icon) or self.icon
-        if icon is not None:
-            attr[ATTR_ICON] = icon
-
-        entity_picture = self.entity_picture
-        if entity_picture is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
-        assumed_state = self.assumed_state
-        if assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        supported_features = self.supported_features
-        if supported_features is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
-
-        device_class = self.device_class
-        if device_class is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
+            volatile_attr = dict(self.state_attributes or {})
+            volatile_attr.update(self.device_state_attributes or {})
 
         end = timer()
 
@@ -377,15 +374,42 @@ class Entity(ABC):
                 extra,
             )
 
-        # Overwrite properties that have been set in the config file.
         assert self.hass is not None
+        customize = None
         if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+            customize = self.hass.data[DATA_CUSTOMIZE].get(self.entity_id)
+        units = self.hass.config.units
+
+        # Reuse the attributes of the current state when nothing they are
+        # built from changed, the state machine then skips comparing them
+        attr: Optional[Mapping[str, Any]] = None
+        unit_of_measure = None
+        last = self._last_attributes
+        if (
+            last is not None
+            and last[0] is static_attr
+            and last[1] == available
+            and last[2] is customize
+            and last[3] is units
+            and last[4] == volatile_attr
+        ):
+            current = self.hass.states.get(self.entity_id)
+            if current is not None and current.attributes is last[5]:
+                attr = current.attributes
+                unit_of_measure = last[6]
+
+        new_attr = None
+        if attr is None:
+            attr = new_attr = dict(capability_attr)
+            new_attr.update(volatile_attr)
+            new_attr.update(entity_attr)
+            # Overwrite properties that have been set in the config file.
+            if customize:
+                new_attr.update(customize)
+            unit_of_measure = new_attr.get(ATTR_UNIT_OF_MEASUREMENT)
 
         # Convert temperature if we detect one
         try:
-            unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
-            units = self.hass.config.units
             if (
                 unit_of_measure in (TEMP_CELSIUS, TEMP_FAHRENHEIT)
                 and unit_of_measure != units.temperature_unit
@@ -393,7 +417,8 @@ class Entity(ABC):
                 prec = len(state) - state.index(".") - 1 if "." in state else 0
                 temp = units.temperature(float(state), unit_of_measure)
                 state = str(round(temp) if prec == 0 else round(temp, prec))
-                attr[ATTR_UNIT_OF_MEASUREMENT] = units.temperature_unit
+                if new_attr is not None:
+                    new_attr[ATTR_UNIT_OF_MEASUREMENT] = units.temperature_unit
         except ValueError:
             # Could not convert state to float
             pass
@@ -409,6 +434,60 @@ class Entity(ABC):
             self.entity_id, state, attr, self.force_update, self._context
         )
 
+        if self.static_attributes:
+            current = self.hass.states.get(self.entity_id)
+            if current is not None:
+                self._last_attributes = (
+                    static_attr,
+                    available,
+                    customize,
+                    units,
+                    volatile_attr,
+                    current.attributes,
+                    unit_of_measure,
+                )
+
+    @callback
+    def _async_read_static_attributes(
+        self,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return the capability attributes and the other static attributes."""
+        capability_attr = self.capability_attributes
+        capability_attr = dict(capability_attr) if capability_attr else {}
+        attr: Dict[str, Any] = {}
+
+        unit_of_measurement = self.unit_of_measurement
+        if unit_of_measurement is not None:
+            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        entry = self.registry_entry
+        # pylint: disable=consider-using-ternary
+        name = (entry and entry.name) or self.name
+        if name is not None:
+            attr[ATTR_FRIENDLY_NAME] = name
+
+        icon = (entry and entry.icon) or self.icon
+        if icon is not None:
+            attr[ATTR_ICON] = icon
+
+        entity_picture = self.entity_picture
+        if entity_picture is not None:
+            attr[ATTR_ENTITY_PICTURE] = entity_picture
+
+        assumed_state = self.assumed_state
+        if assumed_state:
+            attr[ATTR_ASSUMED_STATE] = assumed_state
+
+        supported_features = self.supported_features
+        if supported_features is not None:
+            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        device_class = self.device_class
+        if device_class is not None:
+            attr[ATTR_DEVICE_CLASS] = str(device_class)
+
+        return capability_attr, attr
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -621,6 +700,9 @@ class Entity(ABC):
             await self.async_remove()
             return
 
+        # Name and icon may have been changed in the registry
+        self.async_invalidate_static_attributes()
+
         assert old is not None
         if self.registry_entry.entity_id == old.entity_id:
             self.async_write_ha_state()
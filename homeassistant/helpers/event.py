@@ -4,6 +4,7 @@ import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
+import heapq
 import logging
 import time
 from typing import (
@@ -62,6 +63,13 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TEMPLATE_RENDER_SCHEDULER = "track_template_render_scheduler"
+
+TRACK_POINT_IN_TIME_WHEEL = "track_point_in_time_wheel"
+# Slots per level of the timer wheel, level n has buckets of 64**n seconds
+TIMER_WHEEL_SLOTS = 64
+TIMER_WHEEL_LEVELS = 3
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -730,6 +738,320 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class TemplateRenderStats:
+    """Re-render count and time of a tracked template."""
+
+    __slots__ = ("renders", "render_time", "first_render")
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.renders = 0
+        self.render_time = 0.0
+        self.first_render = time.monotonic()
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the statistics as a dict."""
+        elapsed = max(time.monotonic() - self.first_render, 1.0)
+        return {
+            "renders": self.renders,
+            "render_time": self.render_time,
+            "renders_per_second": self.renders / elapsed,
+        }
+
+
+class _TemplateRenderScheduler:
+    """Coalesce and order the re-renders that state changes trigger.
+
+    Trackers hand their state_changed events to the scheduler, which
+    refreshes every tracker triggered within the same loop iteration once,
+    in one batch. Trackers can declare the entity their action writes,
+    these form a dependency graph with the trackers that render that
+    entity. Within a batch producers refresh before their dependents, and
+    dependents of an entity that changed refresh in the same batch instead
+    of after its state_changed event arrived.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._pending: Dict[_TrackTemplateResultInfo, List[Event]] = {}
+        self._flush_scheduled = False
+        self._producers: Dict[str, _TrackTemplateResultInfo] = {}
+        self._domain_producers: Dict[str, Set[str]] = {}
+        self._dependencies: Dict[_TrackTemplateResultInfo, TrackStates] = {}
+        # Trackers by the entity, domain or all states they render, in the
+        # order they were added
+        self._entity_dependents: Dict[str, Dict[_TrackTemplateResultInfo, None]] = {}
+        self._domain_dependents: Dict[str, Dict[_TrackTemplateResultInfo, None]] = {}
+        self._all_dependents: Dict[_TrackTemplateResultInfo, None] = {}
+        self._depths: Dict[_TrackTemplateResultInfo, int] = {}
+        # Changes dependents already refreshed for, with the batch number
+        self._handled: Dict[
+            Tuple[_TrackTemplateResultInfo, str], Tuple[State, int]
+        ] = {}
+        self._batch = 0
+        self._template_refs: Dict[str, int] = {}
+        self.stats: Dict[str, TemplateRenderStats] = {}
+
+    @callback
+    def async_register(
+        self, tracker: "_TrackTemplateResultInfo", output_entity_id: Optional[str]
+    ) -> None:
+        """Register a tracker and the entity its action writes."""
+        if output_entity_id is not None:
+            self._producers[output_entity_id] = tracker
+            self._domain_producers.setdefault(
+                split_entity_id(output_entity_id)[0], set()
+            ).add(output_entity_id)
+            self._invalidate_depths(self._dependents(output_entity_id))
+        for track_template_ in tracker.track_templates:
+            source = track_template_.template.template
+            self._template_refs[source] = self._template_refs.get(source, 0) + 1
+
+    @callback
+    def async_unregister(self, tracker: "_TrackTemplateResultInfo") -> None:
+        """Forget a removed tracker."""
+        self._pending.pop(tracker, None)
+        self._async_unindex(tracker)
+        self._dependencies.pop(tracker, None)
+        self._depths.pop(tracker, None)
+        output_entity_id = tracker.output_entity_id
+        if (
+            output_entity_id is not None
+            and self._producers.get(output_entity_id) is tracker
+        ):
+            del self._producers[output_entity_id]
+            domain = split_entity_id(output_entity_id)[0]
+            self._domain_producers[domain].discard(output_entity_id)
+            if not self._domain_producers[domain]:
+                del self._domain_producers[domain]
+            self._invalidate_depths(self._dependents(output_entity_id))
+        for track_template_ in tracker.track_templates:
+            source = track_template_.template.template
+            refs = self._template_refs.get(source, 0) - 1
+            if refs > 0:
+                self._template_refs[source] = refs
+                continue
+            self._template_refs.pop(source, None)
+            self.stats.pop(source, None)
+
+    @callback
+    def async_set_dependencies(
+        self, tracker: "_TrackTemplateResultInfo", track_states: TrackStates
+    ) -> None:
+        """Update the states a tracker renders."""
+        self._async_unindex(tracker)
+        self._dependencies[tracker] = track_states
+        if track_states.all_states:
+            self._all_dependents[tracker] = None
+        for entity_id in track_states.entities:
+            self._entity_dependents.setdefault(entity_id, {})[tracker] = None
+        for domain in track_states.domains:
+            self._domain_dependents.setdefault(domain, {})[tracker] = None
+        if self._producers:
+            self._invalidate_depths([tracker])
+
+    @callback
+    def _async_unindex(self, tracker: "_TrackTemplateResultInfo") -> None:
+        """Remove a tracker from the index of the states it renders."""
+        track_states = self._dependencies.get(tracker)
+        if track_states is None:
+            return
+        self._all_dependents.pop(tracker, None)
+        for key, index in (
+            *(
+                (entity_id, self._entity_dependents)
+                for entity_id in track_states.entities
+            ),
+            *((domain, self._domain_dependents) for domain in track_states.domains),
+        ):
+            dependents = index.get(key)
+            if dependents is None:
+                continue
+            dependents.pop(tracker, None)
+            if not dependents:
+                del index[key]
+
+    @callback
+    def async_record_render(self, template: Template, duration: float) -> None:
+        """Count a render of a template."""
+        stats = self.stats.get(template.template)
+        if stats is None:
+            stats = self.stats[template.template] = TemplateRenderStats()
+        stats.renders += 1
+        stats.render_time += duration
+
+    @callback
+    def async_schedule(self, tracker: "_TrackTemplateResultInfo", event: Event) -> None:
+        """Refresh a tracker for an event in the next batch."""
+        handled = self._handled.pop((tracker, event.data[ATTR_ENTITY_ID]), None)
+        if handled is not None and handled[0] is event.data.get("new_state"):
+            # Already refreshed in the batch that wrote the state
+            return
+
+        events = self._pending.get(tracker)
+        if events is not None:
+            events.append(event)
+        elif not self._depth(tracker) and (
+            tracker.output_entity_id is None
+            or not self._dependents(tracker.output_entity_id)
+        ):
+            # Nothing to order the refresh against
+            tracker.async_refresh_events([event])
+            return
+        else:
+            self._pending[tracker] = [event]
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.async_create_task(self._async_flush())
+
+    async def _async_flush(self) -> None:
+        """Refresh the pending trackers, producers before dependents."""
+        self._flush_scheduled = False
+        self._batch += 1
+        if self._handled:
+            # Changes whose event never reached the dependent
+            self._handled = {
+                key: handled
+                for key, handled in self._handled.items()
+                if handled[1] >= self._batch - 1
+            }
+
+        queued, self._pending = self._pending, {}
+        heap = [
+            (self._depth(tracker), order, tracker)
+            for order, tracker in enumerate(queued)
+        ]
+        heapq.heapify(heap)
+        order = len(heap)
+        refreshed = set()
+
+        while heap:
+            tracker = heapq.heappop(heap)[2]
+            events = queued.pop(tracker)
+            refreshed.add(tracker)
+            output_entity_id = tracker.output_entity_id
+            old_state = None
+            if output_entity_id is not None:
+                old_state = self.hass.states.get(output_entity_id)
+
+            try:
+                tracker.async_refresh_events(events)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error refreshing templates %s", tracker)
+
+            if output_entity_id is None:
+                continue
+            new_state = self.hass.states.get(output_entity_id)
+            if new_state is None or new_state is old_state:
+                continue
+
+            event = Event(
+                EVENT_STATE_CHANGED,
+                {
+                    ATTR_ENTITY_ID: output_entity_id,
+                    "old_state": old_state,
+                    "new_state": new_state,
+                },
+                time_fired=new_state.last_updated,
+                context=new_state.context,
+            )
+            for dependent in self._dependents(output_entity_id):
+                if dependent is tracker or dependent in refreshed:
+                    # Cycles wait for the state_changed event
+                    continue
+                self._handled[(dependent, output_entity_id)] = (
+                    new_state,
+                    self._batch,
+                )
+                if dependent in queued:
+                    queued[dependent].append(event)
+                    continue
+                queued[dependent] = [event]
+                heapq.heappush(heap, (self._depth(dependent), order, dependent))
+                order += 1
+
+    def _dependents(self, entity_id: str) -> List["_TrackTemplateResultInfo"]:
+        """Return the trackers that render an entity."""
+        dependents = dict(self._entity_dependents.get(entity_id, {}))
+        dependents.update(
+            self._domain_dependents.get(split_entity_id(entity_id)[0], {})
+        )
+        dependents.update(self._all_dependents)
+        return list(dependents)
+
+    def _invalidate_depths(
+        self, trackers: Iterable["_TrackTemplateResultInfo"]
+    ) -> None:
+        """Forget the depth of trackers and of the trackers rendering them."""
+        stack = list(trackers)
+        seen = set(stack)
+        while stack:
+            tracker = stack.pop()
+            self._depths.pop(tracker, None)
+            if tracker.output_entity_id is None:
+                continue
+            for dependent in self._dependents(tracker.output_entity_id):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+
+    def _depth(
+        self,
+        tracker: "_TrackTemplateResultInfo",
+        visiting: Optional[Set["_TrackTemplateResultInfo"]] = None,
+    ) -> int:
+        """Return the length of the longest chain of producers of a tracker."""
+        if not self._producers:
+            return 0
+        depth = self._depths.get(tracker)
+        if depth is not None:
+            return depth
+
+        if visiting is None:
+            visiting = set()
+        visiting.add(tracker)
+        track_states = self._dependencies.get(tracker)
+        depth = 0
+        if track_states is not None:
+            if track_states.all_states:
+                sources: Iterable[str] = self._producers
+            else:
+                sources = set(track_states.entities)
+                for domain in track_states.domains:
+                    sources.update(self._domain_producers.get(domain, ()))
+            for entity_id in sources:
+                producer = self._producers.get(entity_id)
+                if producer is None or producer in visiting:
+                    continue
+                depth = max(depth, self._depth(producer, visiting) + 1)
+        visiting.discard(tracker)
+        self._depths[tracker] = depth
+        return depth
+
+
+@callback
+def _async_get_render_scheduler(hass: HomeAssistant) -> _TemplateRenderScheduler:
+    """Return the template render scheduler of hass."""
+    scheduler = hass.data.get(TRACK_TEMPLATE_RENDER_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[
+            TRACK_TEMPLATE_RENDER_SCHEDULER
+        ] = _TemplateRenderScheduler(hass)
+    return scheduler
+
+
+@callback
+@bind_hass
+def async_template_render_stats(hass: HomeAssistant) -> Dict[str, Dict[str, float]]:
+    """Return the render statistics of the tracked templates by template."""
+    scheduler = hass.data.get(TRACK_TEMPLATE_RENDER_SCHEDULER)
+    if scheduler is None:
+        return {}
+    return {source: stats.as_dict() for source, stats in scheduler.stats.items()}
+
+
 class _TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -738,6 +1060,7 @@ class _TrackTemplateResultInfo:
         hass: HomeAssistant,
         track_templates: Iterable[TrackTemplate],
         action: Callable,
+        output_entity_id: Optional[str] = None,
     ):
         """Handle removal / refresh of tracker init."""
         self.hass = hass
@@ -746,6 +1069,8 @@ class _TrackTemplateResultInfo:
         for track_template_ in track_templates:
             track_template_.template.hass = hass
         self._track_templates = track_templates
+        self.output_entity_id = output_entity_id
+        self._scheduler = _async_get_render_scheduler(hass)
 
         self._last_result: Dict[Template, Union[str, TemplateError]] = {}
 
@@ -770,9 +1095,12 @@ class _TrackTemplateResultInfo:
                     exc_info=info.exception,
                 )
 
+        track_states = _render_infos_to_track_states(self._info.values())
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass, track_states, self._async_schedule_refresh
         )
+        self._scheduler.async_register(self, self.output_entity_id)
+        self._scheduler.async_set_dependencies(self, track_states)
         self._update_time_listeners()
         _LOGGER.debug(
             "Template group %s listens for %s",
@@ -780,6 +1108,11 @@ class _TrackTemplateResultInfo:
             self.listeners,
         )
 
+    @property
+    def track_templates(self) -> Iterable[TrackTemplate]:
+        """Return the tracked templates."""
+        return self._track_templates
+
     @property
     def listeners(self) -> Dict:
         """State changes that will cause a re-render."""
@@ -824,6 +1157,7 @@ class _TrackTemplateResultInfo:
         """Cancel the listener."""
         assert self._track_state_changes
         self._track_state_changes.async_remove()
+        self._scheduler.async_unregister(self)
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
@@ -833,6 +1167,39 @@ class _TrackTemplateResultInfo:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _async_schedule_refresh(self, event: Event) -> None:
+        """Refresh for a state change together with the other trackers."""
+        self._scheduler.async_schedule(self, event)
+
+    @callback
+    def async_refresh_events(self, events: List[Event]) -> None:
+        """Refresh the templates triggered by any of the coalesced events.
+
+        Each template renders once, for the last event that triggers it
+        without a rate limit, or else for the last event that triggers it.
+        """
+        if len(events) == 1:
+            self._refresh(events[0])
+            return
+
+        renders = []
+        for track_template_ in self._track_templates:
+            info = self._info[track_template_.template]
+            render_event = None
+            for event in reversed(events):
+                if not _event_triggers_rerender(event, info):
+                    continue
+                if _rate_limit_for_event(event, info, track_template_) is None:
+                    render_event = event
+                    break
+                if render_event is None:
+                    render_event = event
+            if render_event is not None:
+                renders.append((track_template_, render_event))
+        if renders:
+            self._refresh_renders(renders, events[-1])
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -877,9 +1244,11 @@ class _TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
+        start = time.perf_counter()
         self._info[template] = info = template.async_render_to_info(
             track_template_.variables
         )
+        self._scheduler.async_record_render(template, time.perf_counter() - start)
 
         try:
             result: Union[str, TemplateError] = info.result()
@@ -916,12 +1285,33 @@ class _TrackTemplateResultInfo:
         replayed is True if the event is being replayed because the
         rate limit was hit.
         """
+        self._refresh_renders(
+            [
+                (track_template_, event)
+                for track_template_ in track_templates or self._track_templates
+            ],
+            event,
+            replayed,
+        )
+
+    @callback
+    def _refresh_renders(
+        self,
+        renders: Iterable[Tuple[TrackTemplate, Optional[Event]]],
+        event: Optional[Event],
+        replayed: Optional[bool] = False,
+    ) -> None:
+        """Render templates for the events that triggered them.
+
+        The action is called once with event for all changed results.
+        """
         updates = []
         info_changed = False
-        now = event.time_fired if not replayed and event else dt_util.utcnow()
+        utcnow = dt_util.utcnow()
 
-        for track_template_ in track_templates or self._track_templates:
-            update = self._render_template_if_ready(track_template_, now, event)
+        for track_template_, render_event in renders:
+            now = render_event.time_fired if not replayed and render_event else utcnow
+            update = self._render_template_if_ready(track_template_, now, render_event)
             if not update:
                 continue
 
@@ -935,16 +1325,16 @@ class _TrackTemplateResultInfo:
 
         if info_changed:
             assert self._track_state_changes
-            self._track_state_changes.async_update_listeners(
-                _render_infos_to_track_states(
-                    [
-                        _suppress_domain_all_in_render_info(self._info[template])
-                        if self._rate_limit.async_has_timer(template)
-                        else self._info[template]
-                        for template in self._info
-                    ]
-                )
+            track_states = _render_infos_to_track_states(
+                [
+                    _suppress_domain_all_in_render_info(self._info[template])
+                    if self._rate_limit.async_has_timer(template)
+                    else self._info[template]
+                    for template in self._info
+                ]
             )
+            self._track_state_changes.async_update_listeners(track_states)
+            self._scheduler.async_set_dependencies(self, track_states)
             _LOGGER.debug(
                 "Template group %s listens for %s",
                 self._track_templates,
@@ -986,6 +1376,7 @@ def async_track_template_result(
     track_templates: Iterable[TrackTemplate],
     action: TrackTemplateResultListener,
     raise_on_template_error: bool = False,
+    output_entity_id: Optional[str] = None,
 ) -> _TrackTemplateResultInfo:
     """Add a listener that fires when the result of a template changes.
 
@@ -1014,13 +1405,17 @@ def async_track_template_result(
         processing the template during setup, the system
         will raise the exception instead of setting up
         tracking.
+    output_entity_id
+        The entity whose state the action writes. Templates
+        that depend on it are re-rendered after this one
+        within the same batch.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = _TrackTemplateResultInfo(hass, track_templates, action)
+    tracker = _TrackTemplateResultInfo(hass, track_templates, action, output_entity_id)
     tracker.async_setup(raise_on_template_error)
     return tracker
 
@@ -1117,6 +1512,202 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
+class _WheelTimer:
+    """Timer in the timer wheel."""
+
+    __slots__ = ("deadline", "point_in_time", "job", "seq", "bucket", "cancelled")
+
+    def __init__(
+        self, deadline: float, point_in_time: datetime, job: HassJob, seq: int
+    ) -> None:
+        """Initialize the timer."""
+        self.deadline = deadline
+        self.point_in_time = point_in_time
+        self.job = job
+        self.seq = seq
+        self.bucket: Optional[Dict["_WheelTimer", None]] = None
+        self.cancelled = False
+
+
+class _TimerWheel:
+    """Hierarchical timer wheel that drives a single loop timer.
+
+    Timers go into buckets of 1 second when due within 64 seconds, of 64
+    seconds when due within 4096 seconds and of 4096 seconds otherwise.
+    Adding and cancelling a timer is a dict operation. The loop timer is
+    set to the first deadline in the earliest 1 second bucket, or to the
+    start of the earliest coarse bucket, whose timers then move to the
+    finer level below.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the wheel."""
+        self.hass = hass
+        self._spans = [
+            TIMER_WHEEL_SLOTS ** level for level in range(TIMER_WHEEL_LEVELS)
+        ]
+        self._buckets: List[Dict[int, Dict[_WheelTimer, None]]] = [
+            {} for _ in range(TIMER_WHEEL_LEVELS)
+        ]
+        # Keys of the buckets per level, may contain keys of removed buckets
+        self._keys: List[List[int]] = [[] for _ in range(TIMER_WHEEL_LEVELS)]
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._wakeup: Optional[float] = None
+        self._seq = 0
+        self.size = 0
+        self.fired = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+    @callback
+    def async_add(self, point_in_time: datetime, job: HassJob) -> _WheelTimer:
+        """Add a timer."""
+        deadline = point_in_time.timestamp()
+        timer = _WheelTimer(deadline, point_in_time, job, self._seq)
+        self._seq += 1
+        self.size += 1
+
+        delta = deadline - time.time()
+        level = 0
+        while level < TIMER_WHEEL_LEVELS - 1 and delta >= self._spans[level + 1]:
+            level += 1
+        key = self._insert(timer, level)
+
+        # Coarse buckets need a wake up when they start
+        wakeup = deadline if level == 0 else key * self._spans[level]
+        if self._wakeup is None or wakeup < self._wakeup:
+            self._schedule(wakeup)
+        return timer
+
+    @callback
+    def async_cancel(self, timer: _WheelTimer) -> None:
+        """Cancel a timer, the loop timer is updated when it fires."""
+        # Also set for timers that already left their bucket to run with
+        # the current batch, they are skipped like a cancelled TimerHandle
+        timer.cancelled = True
+        if timer.bucket is None:
+            return
+        del timer.bucket[timer]
+        timer.bucket = None
+        self.size -= 1
+        if not self.size and self._handle is not None:
+            self._handle.cancel()
+            self._handle = self._wakeup = None
+
+    def _insert(self, timer: _WheelTimer, level: int) -> int:
+        """Put a timer in its bucket of a level, return the key of the bucket."""
+        key = int(timer.deadline // self._spans[level])
+        buckets = self._buckets[level]
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {}
+            heapq.heappush(self._keys[level], key)
+        bucket[timer] = None
+        timer.bucket = bucket
+        return key
+
+    def _first_bucket(self, level: int) -> Optional[int]:
+        """Return the key of the earliest bucket of a level."""
+        keys = self._keys[level]
+        buckets = self._buckets[level]
+        while keys:
+            key = keys[0]
+            if buckets.get(key):
+                return key
+            heapq.heappop(keys)
+            if key in buckets and not buckets[key]:
+                del buckets[key]
+        return None
+
+    def _schedule(self, wakeup: float, now: Optional[float] = None) -> None:
+        """Set the loop timer."""
+        if self._handle is not None:
+            self._handle.cancel()
+        if now is None:
+            now = time.time()
+        self._wakeup = wakeup
+        self._handle = self.hass.loop.call_later(wakeup - now, self._run)
+
+    @callback
+    def _run(self) -> None:
+        """Run the timers that are due."""
+        self._handle = self._wakeup = None
+        now = time_tracker_utcnow().timestamp()
+
+        # Move the timers of coarse buckets that started to the level below
+        for level in range(TIMER_WHEEL_LEVELS - 1, 0, -1):
+            span = self._spans[level]
+            buckets = self._buckets[level]
+            while True:
+                key = self._first_bucket(level)
+                if key is None or key * span > now:
+                    break
+                heapq.heappop(self._keys[level])
+                for timer in buckets.pop(key):
+                    self._insert(timer, level - 1)
+
+        due: List[_WheelTimer] = []
+        buckets = self._buckets[0]
+        while True:
+            key = self._first_bucket(0)
+            if key is None or key > now:
+                break
+            bucket = buckets[key]
+            ready = [timer for timer in bucket if timer.deadline <= now]
+            for timer in ready:
+                del bucket[timer]
+                timer.bucket = None
+            due.extend(ready)
+            if bucket:
+                # The rest of the bucket is due later in this second
+                break
+        self.size -= len(due)
+
+        if len(due) > 1:
+            due.sort(key=lambda timer: (timer.deadline, timer.seq))
+        for timer in due:
+            if timer.cancelled:
+                # Cancelled by a job that ran before it in this batch
+                continue
+            latency = max(now - timer.deadline, 0.0)
+            self.fired += 1
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+            try:
+                self.hass.async_run_hass_job(timer.job, timer.point_in_time)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running timer for %s", timer.job)
+
+        wakeups = []
+        key = self._first_bucket(0)
+        if key is not None:
+            wakeups.append(min(timer.deadline for timer in buckets[key]))
+        for level in range(1, TIMER_WHEEL_LEVELS):
+            key = self._first_bucket(level)
+            if key is not None:
+                wakeups.append(key * self._spans[level])
+        # Timers added by the jobs may have set the loop timer already. The
+        # loop clock can run ahead of utcnow, the timer is rearmed for the
+        # time that is left according to utcnow.
+        if wakeups and (self._wakeup is None or min(wakeups) < self._wakeup):
+            self._schedule(min(wakeups), now)
+
+
+@callback
+@bind_hass
+def async_timer_wheel_stats(hass: HomeAssistant) -> Dict[str, float]:
+    """Return the number of pending timers and how late timers fire."""
+    wheel = hass.data.get(TRACK_POINT_IN_TIME_WHEEL)
+    if wheel is None:
+        return {"size": 0, "fired": 0, "last_latency": 0.0, "max_latency": 0.0}
+    return {
+        "size": wheel.size,
+        "fired": wheel.fired,
+        "last_latency": wheel.last_latency,
+        "max_latency": wheel.max_latency,
+    }
+
+
 @callback
 @bind_hass
 def async_track_point_in_utc_time(
@@ -1132,37 +1723,16 @@ def async_track_point_in_utc_time(
     # having to figure out how to call the action every time its called.
     job = action if isinstance(action, HassJob) else HassJob(action)
 
-    cancel_callback: Optional[asyncio.TimerHandle] = None
-
-    @callback
-    def run_action() -> None:
-        """Call the action."""
-        nonlocal cancel_callback
-
-        now = time_tracker_utcnow()
-
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        delta = (utc_point_in_time - now).total_seconds()
-        if delta > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action)
-            return
-
-        hass.async_run_hass_job(job, utc_point_in_time)
+    wheel = hass.data.get(TRACK_POINT_IN_TIME_WHEEL)
+    if wheel is None:
+        wheel = hass.data[TRACK_POINT_IN_TIME_WHEEL] = _TimerWheel(hass)
 
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action)
+    timer = wheel.async_add(utc_point_in_time, job)
 
     @callback
     def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
+        """Cancel the timer."""
+        wheel.async_cancel(timer)
 
     return unsub_point_in_time_listener
 
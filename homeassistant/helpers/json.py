@@ -1,7 +1,8 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
 from datetime import datetime
+from functools import partial
 import json
-from typing import Any
+from typing import Any, Dict, Mapping
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -20,3 +21,46 @@ class JSONEncoder(json.JSONEncoder):
             return o.as_dict()
 
         return json.JSONEncoder.default(self, o)
+
+
+JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+
+
+class JSONCacheInfo:
+    """Hits and misses of the JSON memoized by states and events."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a dict."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+JSON_CACHE_INFO = JSONCacheInfo()
+
+
+def json_dict_with_fragments(
+    obj: Mapping[str, Any], fragments: Mapping[str, str]
+) -> str:
+    """Encode a dict like JSON_DUMP, inserting already encoded values.
+
+    Fragments maps keys of obj to the JSON of their value. Dicts with keys
+    that are not strings are encoded as a whole, as JSON_DUMP converts
+    those keys to strings.
+    """
+    if not all(isinstance(key, str) for key in obj):
+        return JSON_DUMP(obj)
+    return (
+        "{"
+        + ", ".join(
+            f"{JSON_DUMP(key)}: "
+            + (fragments[key] if key in fragments else JSON_DUMP(value))
+            for key, value in obj.items()
+        )
+        + "}"
+    )
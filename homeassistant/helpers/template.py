@@ -4,7 +4,7 @@ import asyncio
 import base64
 import collections.abc
 from datetime import datetime, timedelta
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 import json
 import logging
 import math
@@ -13,7 +13,6 @@ import random
 import re
 from typing import Any, Dict, Generator, Iterable, Optional, Type, Union
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 import jinja2
 from jinja2 import contextfilter, contextfunction
@@ -50,6 +49,12 @@ _ENVIRONMENT = "template.environment"
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 
+# Compiled sources kept per environment, survives reloading the templates
+COMPILE_CACHE_SIZE = 1024
+# Parsed render results kept for all templates, longer results are not kept
+PARSE_RESULT_CACHE_SIZE = 1024
+MAX_CACHED_RESULT_LENGTH = 255
+
 _RESERVED_NAMES = {"contextfunction", "evalcontextfunction", "environmentfunction"}
 
 _GROUP_DOMAIN_PREFIX = "group."
@@ -175,6 +180,31 @@ RESULT_WRAPPERS: Dict[Type, Type] = {
 }
 RESULT_WRAPPERS[tuple] = TupleWrapper
 
+_CONTAINER_RESULT = object()
+
+
+@lru_cache(maxsize=PARSE_RESULT_CACHE_SIZE)
+def _parse_immutable_result(render_result: str) -> Any:
+    """Parse a render result unless it evaluates to a container.
+
+    Numbers, constants and strings are shared by all renders with the same
+    result. Containers return _CONTAINER_RESULT and are parsed again for
+    every render.
+    """
+    try:
+        result = literal_eval(render_result)
+    except (ValueError, TypeError, SyntaxError, MemoryError):
+        return render_result
+
+    if type(result) in RESULT_WRAPPERS:
+        return _CONTAINER_RESULT
+
+    # If the literal_eval result is a string, use the original render
+    if isinstance(result, str):
+        return render_result
+
+    return result
+
 
 def _true(arg: Any) -> bool:
     return True
@@ -277,6 +307,7 @@ class Template:
         "is_static",
         "_compiled_code",
         "_compiled",
+        "_static_result",
     )
 
     def __init__(self, template, hass=None):
@@ -287,6 +318,7 @@ class Template:
         self.template: str = template.strip()
         self._compiled_code = None
         self._compiled = None
+        self._static_result = _SENTINEL
         self.hass = hass
         self.is_static = not is_template_string(template)
 
@@ -319,7 +351,7 @@ class Template:
         if self.is_static:
             if self.hass.config.legacy_templates or not parse_result:
                 return self.template
-            return self._parse_result(self.template)
+            return self._parse_static_result()
 
         return run_callback_threadsafe(
             self.hass.loop,
@@ -340,7 +372,7 @@ class Template:
         if self.is_static:
             if self.hass.config.legacy_templates or not parse_result:
                 return self.template
-            return self._parse_result(self.template)
+            return self._parse_static_result()
 
         compiled = self._compiled or self._ensure_compiled()
 
@@ -359,8 +391,27 @@ class Template:
 
         return self._parse_result(render_result)
 
+    def _parse_static_result(self) -> Any:
+        """Parse the template of a static template once."""
+        if self._static_result is not _SENTINEL:
+            return self._static_result
+
+        # The template keeps the result, bypass the shared cache
+        result = _parse_immutable_result.__wrapped__(self.template)
+        if result is _CONTAINER_RESULT:
+            # Every render returns a new container that may be modified
+            return self._parse_result(self.template)
+
+        self._static_result = result
+        return result
+
     def _parse_result(self, render_result: str) -> Any:  # pylint: disable=no-self-use
         """Parse the result."""
+        if len(render_result) <= MAX_CACHED_RESULT_LENGTH:
+            result = _parse_immutable_result(render_result)
+            if result is not _CONTAINER_RESULT:
+                return result
+
         try:
             result = literal_eval(render_result)
 
@@ -1282,7 +1333,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__()
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        self._compile_cached = lru_cache(maxsize=COMPILE_CACHE_SIZE)(super().compile)
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1383,18 +1434,16 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             or filename is not None
             or raw is not False
             or defer_init is not False
+            or not isinstance(source, str)
         ):
             # If there are any non-default keywords args, we do
             # not cache.  In prodution we currently do not have
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        cached = self.template_cache.get(source)
-
-        if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
-
-        return cached
+        # Templates with the same source share the compiled code, also
+        # after the templates using it were reloaded
+        return self._compile_cached(source)
 
 
 _NO_HASS_ENV = TemplateEnvironment(None)
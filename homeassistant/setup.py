@@ -3,7 +3,7 @@ import asyncio
 import logging.handlers
 from timeit import default_timer as timer
 from types import ModuleType
-from typing import Awaitable, Callable, Optional, Set
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
 
 from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
@@ -20,6 +20,11 @@ DATA_SETUP_DONE = "setup_done"
 DATA_SETUP_STARTED = "setup_started"
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
+DATA_PREIMPORT = "preimport_tasks"
+# Seconds per integration, and the platforms loaded from each integration
+DATA_IMPORT_TIME = "import_time"
+DATA_SETUP_TIME = "setup_time"
+DATA_PLATFORMS_LOADED = "platforms_loaded"
 
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 300
@@ -34,6 +39,57 @@ def async_set_domains_to_be_loaded(hass: core.HomeAssistant, domains: Set[str])
     hass.data[DATA_SETUP_DONE] = {domain: asyncio.Event() for domain in domains}
 
 
+@core.callback
+def async_preimport_integrations(
+    hass: core.HomeAssistant,
+    integrations: Iterable[loader.Integration],
+    platforms: Dict[str, Set[str]],
+) -> None:
+    """Import integrations and their platforms in the executor.
+
+    An integration is imported once its dependencies are, the imports that
+    can run are started in the order of integrations. Platforms maps the
+    domain of an integration to the platforms to import with it.
+
+    Failed imports are retried by setup, for example once the requirements
+    of the integration are installed.
+    """
+    tasks = hass.data.setdefault(DATA_PREIMPORT, {})
+    import_time = hass.data.setdefault(DATA_IMPORT_TIME, {})
+
+    def import_integration(integration: loader.Integration) -> float:
+        """Import an integration and its platforms, return the time it took."""
+        start = timer()
+        integration.get_component()
+        for platform_name in platforms.get(integration.domain, ()):
+            integration.get_platform(platform_name)
+        return timer() - start  # type: ignore
+
+    async def preimport(integration: loader.Integration) -> None:
+        """Import an integration after its dependencies."""
+        dependencies = [tasks[dep] for dep in integration.dependencies if dep in tasks]
+        if dependencies:
+            await asyncio.wait(dependencies)
+        try:
+            import_time[integration.domain] = await hass.loop.run_in_executor(
+                None, import_integration, integration
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Unable to import %s ahead of setup: %s", integration, err)
+
+    for integration in integrations:
+        # Dependencies with a cycle would wait for each other forever
+        if integration.all_dependencies_resolved and integration.domain not in tasks:
+            tasks[integration.domain] = hass.async_create_task(preimport(integration))
+
+
+async def _async_wait_preimport(hass: core.HomeAssistant, domain: str) -> None:
+    """Wait until the executor is done importing an integration."""
+    task = hass.data.get(DATA_PREIMPORT, {}).get(domain)
+    if task is not None:
+        await task
+
+
 def setup_component(hass: core.HomeAssistant, domain: str, config: ConfigType) -> bool:
     """Set up a component and all its dependencies."""
     return asyncio.run_coroutine_threadsafe(
@@ -160,6 +216,8 @@ async def _async_setup_component(
         log_error(str(err), integration.documentation)
         return False
 
+    await _async_wait_preimport(hass, domain)
+
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
@@ -229,6 +287,7 @@ async def _async_setup_component(
         end = timer()
         if warn_task:
             warn_task.cancel()
+        hass.data.setdefault(DATA_SETUP_TIME, {})[domain] = end - start
     _LOGGER.info("Setup of domain %s took %.1f seconds", domain, end - start)
 
     if result is False:
@@ -294,11 +353,16 @@ async def async_prepare_setup_platform(
         log_error(str(err))
         return None
 
+    await _async_wait_preimport(hass, platform_name)
+
     try:
         platform = integration.get_platform(domain)
     except ImportError as exc:
         log_error(f"Platform not found ({exc}).")
         return None
+    hass.data.setdefault(DATA_PLATFORMS_LOADED, {}).setdefault(
+        platform_name, set()
+    ).add(domain)
 
     # Already loaded
     if platform_path in hass.config.components:
@@ -9,6 +9,7 @@ from homeassistant.components.filter.sensor import (
     LowPassFilter,
     OutlierFilter,
     RangeFilter,
+    SensorFilter,
     ThrottleFilter,
     TimeSMAFilter,
     TimeThrottleFilter,
@@ -291,6 +292,49 @@ class TestFilterSensor(unittest.TestCase):
                 filtered.append(new_state)
         assert [20, 21] == [f.state for f in filtered]
 
+    def test_filter_values(self):
+        """Test filtering a batch of values gives the same results as one by one."""
+        samples = [(float(state.state), state.last_updated) for state in self.values]
+        filt = ThrottleFilter(window_size=3, precision=2, entity=None)
+        assert [20, 21] == [value for value, _ in filt.filter_values(samples)]
+
+        filt = LowPassFilter(window_size=10, precision=2, entity=None, time_constant=10)
+        batch = filt.filter_values([("unknown", None)] + samples)
+        filt = LowPassFilter(window_size=10, precision=2, entity=None, time_constant=10)
+        assert batch == [
+            (filt.filter_value(value, timestamp), timestamp)
+            for value, timestamp in samples
+        ]
+        assert 18.05 == batch[-1][0]
+        assert filt.states is filt.values
+
+    def test_replay_history_attributes(self):
+        """Test the icon and unit come from the first state passing the chain."""
+        sensor = SensorFilter(
+            "test",
+            "sensor.test_monitored",
+            [RangeFilter(entity=None, precision=2, lower_bound=10, upper_bound=None)],
+        )
+        sensor._replay_history(
+            [
+                ha.State("sensor.test_monitored", "unknown", {"icon": "mdi:unknown"}),
+                ha.State("sensor.test_monitored", "on", {"icon": "mdi:text"}),
+                ha.State(
+                    "sensor.test_monitored",
+                    5,
+                    {"icon": "mdi:first", "unit_of_measurement": "°C"},
+                ),
+                ha.State(
+                    "sensor.test_monitored",
+                    20,
+                    {"icon": "mdi:last", "unit_of_measurement": "°F"},
+                ),
+            ]
+        )
+        assert sensor.state == 20
+        assert sensor.icon == "mdi:first"
+        assert sensor.unit_of_measurement == "°C"
+
     def test_time_throttle(self):
         """Test if lowpass filter works."""
         filt = TimeThrottleFilter(
@@ -268,6 +268,35 @@ class TestComponentHistory(unittest.TestCase):
 
         assert states == hist
 
+    def test_get_significant_states_compact_response(self):
+        """Test the compact response only repeats attributes that changed."""
+        zero, four, states = self.record_states()
+        hist = history.get_significant_states(
+            self.hass, zero, four, filters=history.Filters(), compact_response=True
+        )
+
+        expected = {}
+        for entity_id, entity_states in states.items():
+            attributes = []
+            for index, state in enumerate(entity_states):
+                if not attributes or attributes[-1][1] != state.attributes:
+                    attributes.append([index, dict(state.attributes)])
+            expected[entity_id] = {
+                "entity_id": entity_id,
+                "state": [state.state for state in entity_states],
+                "last_changed": [
+                    state.last_changed.timestamp() for state in entity_states
+                ],
+                "attributes": attributes,
+            }
+        assert hist == expected
+        assert hist["thermostat.test"]["state"] == ["20", "21", "21"]
+        assert [index for index, _ in hist["thermostat.test"]["attributes"]] == [
+            0,
+            1,
+            2,
+        ]
+
     def test_get_significant_states_with_initial(self):
         """Test that only significant states are returned.
 
@@ -1008,3 +1037,183 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_fetch_period_api_with_resolution(hass, hass_client):
+    """Test the fetch period view serves numeric entities from statistics."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = (dt_util.utcnow() - timedelta(hours=3)).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+    def set_state(entity_id, state, point):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=point
+        ):
+            hass.states.async_set(
+                entity_id, state, {"unit_of_measurement": "W", "friendly_name": "Power"}
+            )
+
+    set_state("sensor.power", "10", start)
+    set_state("sensor.power", "30", start + timedelta(minutes=1))
+    set_state("sensor.power", "50", start + timedelta(hours=1))
+    set_state("light.kitchen", "on", start + timedelta(minutes=1))
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={
+            "filter_entity_id": "sensor.power,light.kitchen",
+            "resolution": "hour",
+        },
+    )
+    assert response.status == 200
+    power, kitchen = await response.json()
+
+    assert [state["state"] for state in power] == ["20.0", "50.0"]
+    assert power[0]["entity_id"] == "sensor.power"
+    assert power[0]["attributes"] == {
+        "min": 10,
+        "max": 30,
+        "last": 30,
+        "unit_of_measurement": "W",
+        "friendly_name": "Power",
+    }
+    assert kitchen[-1]["entity_id"] == "light.kitchen"
+    assert kitchen[-1]["state"] == "on"
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={
+            "filter_entity_id": "sensor.power,light.kitchen",
+            "resolution": "hour",
+            "compact_response": "",
+        },
+    )
+    assert response.status == 200
+    power, kitchen = await response.json()
+    assert power["entity_id"] == "sensor.power"
+    assert power["state"] == ["20.0", "50.0"]
+    assert power["last_changed"] == [
+        start.timestamp(),
+        (start + timedelta(hours=1)).timestamp(),
+    ]
+    assert power["attributes"][0] == [
+        0,
+        {
+            "min": 10,
+            "max": 30,
+            "last": 30,
+            "unit_of_measurement": "W",
+            "friendly_name": "Power",
+        },
+    ]
+    assert kitchen["entity_id"] == "light.kitchen"
+    assert kitchen["state"][-1] == "on"
+
+    # Entities without statistics fall back to their states
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}", params={"resolution": "5minute"}
+    )
+    assert response.status == 200
+    kitchen, power = await response.json()
+    assert [state["entity_id"] for state in kitchen] == ["light.kitchen"]
+    assert kitchen[-1]["state"] == "on"
+    assert [state["state"] for state in power] == ["20.0", "50.0"]
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"resolution": "5minute", "compact_response": ""},
+    )
+    assert response.status == 200
+    kitchen, power = await response.json()
+    assert kitchen["entity_id"] == "light.kitchen"
+    assert kitchen["state"][-1] == "on"
+    assert power["state"] == ["20.0", "50.0"]
+
+
+async def test_fetch_period_api_with_invalid_resolution(hass, hass_client):
+    """Test the fetch period view rejects an unknown resolution."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}?resolution=day"
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_with_stream(hass, hass_client):
+    """Test the streamed fetch period view returns the same states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.cow", "off")
+    hass.states.async_set("sensor.power", "5", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    url = f"/api/history/period/{(dt_util.utcnow() - timedelta(hours=1)).isoformat()}"
+    for params in ({}, {"minimal_response": ""}, {"filter_entity_id": "light.cow"}):
+        response = await client.get(url, params=params)
+        assert response.status == 200
+        expected = await response.json()
+
+        response = await client.get(url, params={**params, "stream": ""})
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "application/json"
+        streamed = await response.json()
+
+        assert sorted(streamed, key=lambda states: states[0]["entity_id"]) == sorted(
+            expected, key=lambda states: states[0]["entity_id"]
+        )
+    assert len(streamed) == 1
+    assert [state["state"] for state in streamed[0]] == ["on", "off"]
+
+
+async def test_fetch_period_api_with_compact_response(hass, hass_client):
+    """Test the fetch period view only sends attributes when they change."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    for state in ("1", "2", "3"):
+        hass.states.async_set("sensor.power", state, {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "3", {"unit_of_measurement": "kW"})
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    url = f"/api/history/period/{(start - timedelta(seconds=1)).isoformat()}"
+    for params in ({"compact_response": ""}, {"compact_response": "", "stream": ""}):
+        response = await client.get(
+            url, params={**params, "significant_changes_only": "0"}
+        )
+        assert response.status == 200
+        power = (await response.json())[0]
+        assert power["entity_id"] == "sensor.power"
+        assert power["state"] == ["1", "2", "3", "3"]
+        assert all(
+            start.timestamp() <= last_changed <= dt_util.utcnow().timestamp()
+            for last_changed in power["last_changed"]
+        )
+        assert power["attributes"] == [
+            [0, {"unit_of_measurement": "W"}],
+            [3, {"unit_of_measurement": "kW"}],
+        ]
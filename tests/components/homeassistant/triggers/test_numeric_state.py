@@ -1305,3 +1305,40 @@ async def test_attribute_if_not_fires_on_entities_change_with_for_after_stop(
     async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
     await hass.async_block_till_done()
     assert len(calls) == 1
+
+
+async def test_triggers_share_entity(hass):
+    """Test triggers on the same entity are evaluated together in order."""
+    hass.states.async_set("test.entity", 11, {"test-measurement": 1})
+    runs = []
+    unsubs = {}
+    for name, config in (
+        ("below", {"below": 10}),
+        ("above", {"above": 5}),
+        ("attribute", {"above": 5, "attribute": "test-measurement"}),
+    ):
+        config = numeric_state_trigger.TRIGGER_SCHEMA(
+            {"platform": "numeric_state", "entity_id": "test.entity", **config}
+        )
+        unsubs[name] = await numeric_state_trigger.async_attach_trigger(
+            hass,
+            config,
+            lambda variables, context, name=name: runs.append(name),
+            {"name": name},
+        )
+
+    hass.states.async_set("test.entity", 9, {"test-measurement": 6})
+    await hass.async_block_till_done()
+    assert runs == ["below", "above", "attribute"]
+
+    unsubs.pop("above")()
+    hass.states.async_set("test.entity", 4, {"test-measurement": 2})
+    hass.states.async_set("test.entity", 8, {"test-measurement": 7})
+    await hass.async_block_till_done()
+    assert runs == ["below", "above", "attribute", "attribute"]
+
+    dispatcher = hass.data[numeric_state_trigger.DATA_NUMERIC_STATE_TRIGGERS]
+    assert len(dispatcher._index["test.entity"]) == 2
+    for unsub in unsubs.values():
+        unsub()
+    assert "test.entity" not in dispatcher._index
@@ -6,7 +6,8 @@ import pytest
 import homeassistant.components.automation as automation
 from homeassistant.components.homeassistant.triggers import state as state_trigger
 from homeassistant.const import ATTR_ENTITY_ID, ENTITY_MATCH_ALL, SERVICE_TURN_OFF
-from homeassistant.core import Context
+from homeassistant.core import Context, callback
+from homeassistant.helpers.event import async_timer_wheel_stats
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 
@@ -1269,3 +1270,100 @@ async def test_attribute_if_fires_on_entity_change_with_both_filters_boolean(
     hass.states.async_set("test.entity", "bla", {"happening": True})
     await hass.async_block_till_done()
     assert len(calls) == 1
+
+
+async def test_triggers_share_dispatcher(hass):
+    """Test triggers on the same entity run from one listener in order."""
+    calls = []
+
+    def make_action(name):
+        @callback
+        def action(variables, context=None):
+            calls.append((name, variables["trigger"]["for"]))
+
+        return action
+
+    configs = {
+        "to_world": {"to": "world"},
+        "to_list": {"to": ["planet", "world"]},
+        "any": {},
+        "to_planet": {"to": "planet"},
+        "for_5": {"to": "world", "for": {"seconds": 5}},
+        "for_10": {"to": "world", "for": {"seconds": 10}},
+        "attribute": {"attribute": "name", "to": "earth"},
+    }
+    removes = []
+    for name, config in configs.items():
+        config = state_trigger.TRIGGER_SCHEMA(
+            {"platform": "state", "entity_id": "test.entity", **config}
+        )
+        removes.append(
+            await state_trigger.async_attach_trigger(
+                hass, config, make_action(name), {"name": name}
+            )
+        )
+
+    hass.states.async_set("test.entity", "world", {"name": "earth"})
+    await hass.async_block_till_done()
+    assert calls == [
+        ("to_world", None),
+        ("to_list", None),
+        ("any", None),
+        ("attribute", None),
+    ]
+
+    calls.clear()
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert calls == [("for_5", timedelta(seconds=5))]
+    async_fire_time_changed(hass, now + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert calls == [("for_5", timedelta(seconds=5)), ("for_10", timedelta(seconds=10))]
+
+    dispatcher = hass.data[state_trigger.DATA_STATE_TRIGGERS]
+    assert set(dispatcher.evaluation_time) == set(configs) - {"to_planet"}
+
+    for remove in removes:
+        remove()
+    calls.clear()
+    hass.states.async_set("test.entity", "planet")
+    await hass.async_block_till_done()
+    assert calls == []
+
+
+async def test_for_cancelled_on_state_change(hass):
+    """Test a pending for is cancelled when the state changes."""
+    calls = []
+
+    @callback
+    def action(variables, context=None):
+        calls.append(variables["trigger"]["to_state"].state)
+
+    config = state_trigger.TRIGGER_SCHEMA(
+        {
+            "platform": "state",
+            "entity_id": "test.entity",
+            "to": "world",
+            "for": {"seconds": 5},
+        }
+    )
+    await state_trigger.async_attach_trigger(hass, config, action, {"name": "test"})
+
+    now = dt_util.utcnow()
+    hass.states.async_set("test.entity", "world")
+    await hass.async_block_till_done()
+    assert async_timer_wheel_stats(hass)["size"] == 1
+    hass.states.async_set("test.entity", "hello")
+    await hass.async_block_till_done()
+    # The cancelled for doesn't stay on the timer wheel
+    assert async_timer_wheel_stats(hass)["size"] == 0
+    async_fire_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert calls == []
+
+    hass.states.async_set("test.entity", "world")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert calls == ["world"]
@@ -2,9 +2,11 @@
 from dataclasses import dataclass
 import datetime
 
+from influxdb.line_protocol import make_lines
 import pytest
 
 import homeassistant.components.influxdb as influxdb
+from homeassistant.components.influxdb import line_protocol
 from homeassistant.components.influxdb.const import DEFAULT_BUCKET
 from homeassistant.const import (
     EVENT_STATE_CHANGED,
@@ -37,9 +39,11 @@ class FilterTest:
 
 
 @pytest.fixture(autouse=True)
-def mock_batch_timeout(hass, monkeypatch):
+def mock_batch_timeout(hass, monkeypatch, tmp_path):
     """Mock the event bus listener and the batch timeout for tests."""
     hass.bus.listen = MagicMock()
+    # Keep the spill buffer out of the shared test config dir
+    hass.config.config_dir = str(tmp_path)
     monkeypatch.setattr(
         f"{INFLUX_PATH}.InfluxThread.batch_timeout",
         Mock(return_value=0),
@@ -63,7 +67,7 @@ def get_mock_call_fixture(request):
     """Get version specific lambda to make write API call mock."""
 
     def v2_call(body, precision):
-        data = {"bucket": DEFAULT_BUCKET, "record": body}
+        data = {"bucket": DEFAULT_BUCKET, "record": _lines(body)}
 
         if precision is not None:
             data["write_precision"] = precision
@@ -72,8 +76,27 @@ def get_mock_call_fixture(request):
 
     if request.param == influxdb.API_VERSION_2:
         return lambda body, precision=None: v2_call(body, precision)
-    # pylint: disable=unnecessary-lambda
-    return lambda body, precision=None: call(body, time_precision=precision)
+    return lambda body, precision=None: call(
+        _lines(body), time_precision=precision, protocol="line"
+    )
+
+
+def _lines(body):
+    """Return the line protocol the InfluxDB client makes of json points.
+
+    Numeric values are always written as floats.
+    """
+    points = [
+        {
+            **point,
+            "fields": {
+                key: float(value) if isinstance(value, int) else value
+                for key, value in point["fields"].items()
+            },
+        }
+        for point in body
+    ]
+    return make_lines({"points": points}).splitlines()
 
 
 def _get_write_api_mock_v1(mock_influx_client):
@@ -1322,23 +1345,37 @@ async def test_event_listener_scheduled_write(
         attributes={},
     )
     event = MagicMock(data={"new_state": state}, time_fired=12345)
+    body = [
+        {
+            "measurement": "entity.id",
+            "tags": {"domain": "fake", "entity_id": "entity"},
+            "time": 12345,
+            "fields": {"value": 1},
+        }
+    ]
     write_api = get_write_api(mock_client)
     write_api.side_effect = IOError("foo")
+    instance = hass.data[influxdb.DOMAIN]
 
-    # Write fails
+    # Write fails, the event is kept on disk
     with patch.object(influxdb.time, "sleep") as mock_sleep:
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        instance.block_till_done()
         assert mock_sleep.called
     assert write_api.call_count == 2
+    assert instance.metrics["points_spilled"] == 1
+    assert instance.metrics["spill_size"] > 0
 
-    # Write works again
+    # Write works again, the kept event is written after the new one
     write_api.side_effect = None
     with patch.object(influxdb.time, "sleep") as mock_sleep:
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        instance.block_till_done()
         assert not mock_sleep.called
-    assert write_api.call_count == 3
+    assert write_api.call_count == 4
+    assert write_api.call_args == get_mock_call(body)
+    assert instance.metrics["points_written"] == 2
+    assert instance.metrics["spill_size"] == 0
 
 
 @pytest.mark.parametrize(
@@ -1362,7 +1399,7 @@ async def test_event_listener_scheduled_write(
 async def test_event_listener_backlog_full(
     hass, mock_client, config_ext, get_write_api, get_mock_call
 ):
-    """Test the event listener drops old events when backlog gets full."""
+    """Test the event listener keeps old events on disk when backlog gets full."""
     handler_method = await _setup(hass, mock_client, config_ext, get_write_api)
 
     state = MagicMock(
@@ -1382,11 +1419,22 @@ async def test_event_listener_backlog_full(
         monotonic_time += 60
         return monotonic_time
 
+    instance = hass.data[influxdb.DOMAIN]
+    write_api = get_write_api(mock_client)
     with patch("homeassistant.components.influxdb.time.monotonic", new=fast_monotonic):
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        instance.block_till_done()
+
+        assert write_api.call_count == 0
+        assert instance.metrics["points_spilled"] == 1
+        assert instance.metrics["points_dropped"] == 0
 
-        assert get_write_api(mock_client).call_count == 0
+    # The old event is written once a write succeeds
+    handler_method(event)
+    instance.block_till_done()
+
+    assert write_api.call_count == 2
+    assert instance.metrics["points_written"] == 2
 
 
 @pytest.mark.parametrize(
@@ -1657,3 +1705,24 @@ async def test_precision(
     assert write_api.call_count == 1
     assert write_api.call_args == get_mock_call(body, precision)
     write_api.reset_mock()
+
+
+@pytest.mark.parametrize("precision", [None, "ns", "us", "ms", "s"])
+def test_line_protocol_timestamp(precision):
+    """Test datetimes are encoded in the write precision."""
+    time_fired = datetime.datetime(
+        2020, 10, 1, 12, 30, 15, tzinfo=datetime.timezone.utc
+    )
+    point = {"measurement": "m", "fields": {"value": 1.0}, "time": time_fired}
+    client_precision = {"ns": "n", "us": "u"}.get(precision, precision)
+
+    assert [
+        line_protocol.encode_line(
+            "m",
+            {},
+            {"value": 1.0},
+            line_protocol.encode_timestamp(
+                time_fired, line_protocol.PRECISION_DIVISORS[precision]
+            ),
+        )
+    ] == make_lines({"points": [point]}, client_precision).splitlines()
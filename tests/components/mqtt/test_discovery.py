@@ -118,6 +118,27 @@ async def test_correct_config_discovery(hass, mqtt_mock, caplog):
     assert ("binary_sensor", "bla") in hass.data[ALREADY_DISCOVERED]
 
 
+async def test_discovery_batch(hass, mqtt_mock):
+    """Test a burst of discovery messages sets up the platform once."""
+    with patch.object(
+        hass.config_entries,
+        "async_forward_entry_setup",
+        wraps=hass.config_entries.async_forward_entry_setup,
+    ) as forward_entry_setup:
+        for name in ("Beer", "Milk", "Wine"):
+            async_fire_mqtt_message(
+                hass,
+                f"homeassistant/binary_sensor/{name.lower()}/config",
+                f'{{ "name": "{name}", "state_topic": "test-topic" }}',
+            )
+        await hass.async_block_till_done()
+
+    assert forward_entry_setup.call_count == 1
+    for name in ("beer", "milk", "wine"):
+        assert hass.states.get(f"binary_sensor.{name}") is not None
+        assert ("binary_sensor", name) in hass.data[ALREADY_DISCOVERED]
+
+
 async def test_discover_fan(hass, mqtt_mock, caplog):
     """Test discovering an MQTT fan."""
     async_fire_mqtt_message(
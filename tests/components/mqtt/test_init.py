@@ -643,6 +643,61 @@ async def test_restore_subscriptions_on_reconnect(hass, mqtt_client_mock, mqtt_m
     assert mqtt_client_mock.subscribe.call_count == 2
 
 
+async def test_messages_handled_in_batches(hass, mqtt_mock):
+    """Test messages from the network thread are handled in batches."""
+    calls = []
+
+    @callback
+    def record_calls(msg):
+        calls.append(msg.topic)
+
+    await mqtt.async_subscribe(hass, "test/+", record_calls)
+
+    with patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as call_soon_threadsafe, patch(
+        "homeassistant.components.mqtt.MAX_MESSAGES_PER_DRAIN", 2
+    ):
+        for index in range(3):
+            mqtt_mock._mqtt_on_message(
+                None, None, mqtt.Message(f"test/{index}", b"on", 0, False)
+            )
+        assert mqtt_mock().message_backlog == 3
+        assert call_soon_threadsafe.call_count == 1
+
+        await hass.async_block_till_done()
+        assert calls == ["test/0", "test/1"]
+        # The rest is handled after other jobs had a turn
+        await hass.async_block_till_done()
+
+    assert calls == ["test/0", "test/1", "test/2"]
+    assert mqtt_mock().message_backlog == 0
+    assert mqtt_mock().messages_received == 3
+
+
+async def test_failing_subscriber_does_not_stop_batch(hass, mqtt_mock, caplog):
+    """Test a subscriber raising does not keep the other messages waiting."""
+    calls = []
+
+    @callback
+    def record_calls(msg):
+        if msg.payload == "fail":
+            raise ValueError("Oops")
+        calls.append(msg.payload)
+
+    await mqtt.async_subscribe(hass, "test/topic", record_calls)
+
+    for payload in (b"fail", b"one", b"two"):
+        mqtt_mock._mqtt_on_message(
+            None, None, mqtt.Message("test/topic", payload, 0, False)
+        )
+    await hass.async_block_till_done()
+
+    assert calls == ["one", "two"]
+    assert mqtt_mock().message_backlog == 0
+    assert "Error handling message on topic test/topic" in caplog.text
+
+
 @pytest.mark.parametrize(
     "mqtt_config",
     [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_DISCOVERY: False}],
@@ -0,0 +1,62 @@
+"""The tests for the MQTT topic trie."""
+import pytest
+
+from homeassistant.components.mqtt.trie import TopicTrie
+
+
+@pytest.mark.parametrize(
+    "topic_filter, topic, matches",
+    [
+        ("sport/tennis", "sport/tennis", True),
+        ("sport/tennis", "sport/tennis/player1", False),
+        ("sport/+", "sport/tennis", True),
+        ("sport/+", "sport/", True),
+        ("sport/+", "sport", False),
+        ("sport/+/player1", "sport/tennis/player1", True),
+        ("sport/+/player1", "sport/tennis/player2", False),
+        ("sport/#", "sport", True),
+        ("sport/#", "sport/tennis/player1", True),
+        ("sport/#", "sports", False),
+        ("+/+", "/finance", True),
+        ("/+", "/finance", True),
+        ("+", "/finance", False),
+        ("#", "sport/tennis", True),
+        ("#", "$SYS/broker", False),
+        ("+/broker", "$SYS/broker", False),
+        ("$SYS/#", "$SYS/broker", True),
+        ("$SYS/+", "$SYS/broker", True),
+    ],
+)
+def test_match(topic_filter, topic, matches):
+    """Test matching topics against filters."""
+    trie = TopicTrie()
+    trie.add(topic_filter, "value")
+    assert trie.match(topic) == (["value"] if matches else [])
+
+
+def test_add_remove():
+    """Test values are returned in the order they were added."""
+    trie = TopicTrie()
+    first, second, third, fourth = object(), object(), object(), object()
+    trie.add("home/+/temperature", first)
+    trie.add("home/#", second)
+    trie.add("home/kitchen/temperature", third)
+    trie.add("home/#", fourth)
+
+    assert trie.match("home/kitchen/temperature") == [first, second, third, fourth]
+    assert trie.match("home/kitchen") == [second, fourth]
+
+    trie.remove("home/#", second)
+    assert trie.match("home/kitchen/temperature") == [first, third, fourth]
+
+    with pytest.raises(KeyError):
+        trie.remove("home/#", second)
+    with pytest.raises(KeyError):
+        trie.remove("garden/#", first)
+
+    trie.remove("home/+/temperature", first)
+    trie.remove("home/kitchen/temperature", third)
+    trie.remove("home/#", fourth)
+    assert trie.match("home/kitchen/temperature") == []
+    assert not trie._root.children
+    assert trie.lookups == 4
@@ -365,3 +365,94 @@ async def test_filtered_denylist(hass, mock_client):
         was_called = mock_client.labels.call_count == 1
         assert test.should_pass == was_called
         mock_client.labels.reset_mock()
+
+
+async def test_incremental_scrape(hass, hass_client):
+    """Test only changed metrics are rendered again and labels are cached."""
+    assert await async_setup_component(hass, prometheus.DOMAIN, {prometheus.DOMAIN: {}})
+    client = await hass_client()
+
+    hass.states.async_set(
+        "sensor.outside", "12", {"friendly_name": "Outside", "unit_of_measurement": "W"}
+    )
+    hass.states.async_set(
+        "sensor.inside", "21", {"friendly_name": "Inside", "unit_of_measurement": "W"}
+    )
+    await hass.async_block_till_done()
+
+    body = (await (await client.get(prometheus.API_ENDPOINT)).text()).split("\n")
+    assert (
+        'sensor_unit_w{domain="sensor",entity="sensor.outside",'
+        'friendly_name="Outside"} 12.0' in body
+    )
+
+    with mock.patch(
+        f"{PROMETHEUS_PATH}.prometheus_client.generate_latest",
+        wraps=prometheus.prometheus_client.generate_latest,
+    ) as generate_latest:
+        await client.get(prometheus.API_ENDPOINT)
+        # Only the default collectors, nothing changed
+        assert generate_latest.call_count == 1
+
+        hass.states.async_set(
+            "sensor.outside",
+            "13",
+            {"friendly_name": "Outside", "unit_of_measurement": "W"},
+        )
+        await hass.async_block_till_done()
+        generate_latest.reset_mock()
+        body = (await (await client.get(prometheus.API_ENDPOINT)).text()).split("\n")
+        # The default collectors and the sensor_unit_w, state_change,
+        # entity_available and last_updated_time_seconds series of the
+        # changed entity only
+        assert generate_latest.call_count == 5
+        for call in generate_latest.call_args_list:
+            if not call[0]:
+                continue
+            (family,) = call[0][0].collect()
+            assert {sample.labels["entity"] for sample in family.samples} == {
+                "sensor.outside"
+            }
+
+    assert (
+        'sensor_unit_w{domain="sensor",entity="sensor.outside",'
+        'friendly_name="Outside"} 13.0' in body
+    )
+    assert (
+        'sensor_unit_w{domain="sensor",entity="sensor.inside",'
+        'friendly_name="Inside"} 21.0' in body
+    )
+    assert (
+        'state_change_total{domain="sensor",entity="sensor.outside",'
+        'friendly_name="Outside"} 2.0' in body
+    )
+
+    hass.states.async_set(
+        "sensor.outside", "14", {"friendly_name": "Garden", "unit_of_measurement": "W"}
+    )
+    await hass.async_block_till_done()
+    body = (await (await client.get(prometheus.API_ENDPOINT)).text()).split("\n")
+    assert (
+        'sensor_unit_w{domain="sensor",entity="sensor.outside",'
+        'friendly_name="Garden"} 14.0' in body
+    )
+    assert (
+        'state_change_total{domain="sensor",entity="sensor.outside",'
+        'friendly_name="Garden"} 1.0' in body
+    )
+
+
+@pytest.mark.usefixtures("mock_bus")
+async def test_labels_cached(hass, mock_client):
+    """Test the labels of an entity are only looked up once."""
+    handler_method = await _setup(hass, {})
+
+    event = make_event("fake.cached")
+    handler_method(event)
+    handler_method(event)
+    assert mock_client.labels.call_count == 1
+    mock_client.labels.assert_called_with("fake.cached", None, "fake")
+
+    handler_method(mock.MagicMock(data={"entity_id": "fake.cached", "new_state": None}))
+    handler_method(event)
+    assert mock_client.labels.call_count == 2
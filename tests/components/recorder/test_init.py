@@ -13,7 +13,16 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    EventData,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    Statistics,
+    process_timestamp,
+)
+from homeassistant.components.recorder.statistics import PERIOD_5MINUTE, PERIOD_HOUR
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
 from homeassistant.core import Context, callback
@@ -403,6 +412,145 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_bulk_write_saves_states_and_events(hass_recorder):
+    """Test bulk writing saves states, events and sets old state."""
+    hass = hass_recorder({"bulk_write": True})
+
+    hass.states.set("test.one", "on", {"test_attr": 5})
+    hass.states.set("test.one", "off", {"test_attr": 5})
+    hass.bus.fire("EVENT_TEST", {"test_attr": 5})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "on", {"test_attr": 6})
+    hass.states.remove("test.one")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 4
+        assert [state.state for state in states] == ["on", "off", "on", None]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert states[2].old_state_id == states[1].state_id
+        assert states[3].old_state_id == states[2].state_id
+        assert states[2].to_native().attributes == {"test_attr": 6}
+
+        for state in states:
+            db_event = session.query(Events).get(state.event_id)
+            assert db_event.event_type == "state_changed"
+
+        db_events = list(session.query(Events).filter_by(event_type="EVENT_TEST"))
+        assert len(db_events) == 1
+        assert db_events[0].to_native().data == {"test_attr": 5}
+
+    bulk_writer = hass.data[DATA_INSTANCE].bulk_writer
+    assert bulk_writer.pending_rows == 0
+    assert bulk_writer.rows_written >= 9
+
+
+def test_saving_state_shares_attributes(hass_recorder):
+    """Test states with equal attributes share the attributes row."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"test_attr": 5})
+    hass.states.set("test.two", "on", {"test_attr": 5})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {"test_attr": 5})
+    hass.states.set("test.two", "off", {"test_attr": 6})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 4
+        assert all(state.attributes is None for state in states)
+        assert states[0].attributes_id == states[1].attributes_id
+        assert states[0].attributes_id == states[2].attributes_id
+        assert states[3].attributes_id != states[0].attributes_id
+        assert states[3].to_native().attributes == {"test_attr": 6}
+        assert session.query(StateAttributes).count() == 2
+
+
+def test_saving_numeric_states_compiles_statistics(hass_recorder):
+    """Test numeric states are aggregated into 5-minute and hourly statistics."""
+    hass = hass_recorder()
+    start = datetime(2020, 11, 1, 12, 0, tzinfo=dt_util.UTC)
+
+    for minutes, state in ((1, "1"), (2, "3"), (3, "unknown"), (7, "8")):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=start + timedelta(minutes=minutes),
+        ):
+            hass.states.set("sensor.temp", state, {"unit_of_measurement": "°C"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        five_minutes = list(
+            session.query(Statistics)
+            .filter_by(period=PERIOD_5MINUTE)
+            .order_by(Statistics.start)
+        )
+        assert [
+            (stat.min, stat.max, stat.mean, stat.last, stat.count)
+            for stat in five_minutes
+        ] == [(1, 3, 2, 3, 2), (8, 8, 8, 8, 1)]
+        assert five_minutes[0].entity_id == "sensor.temp"
+        assert five_minutes[0].unit_of_measurement == "°C"
+        assert process_timestamp(five_minutes[1].start) == start + timedelta(minutes=5)
+
+        hour = session.query(Statistics).filter_by(period=PERIOD_HOUR).one()
+        assert (hour.min, hour.max, hour.mean, hour.last, hour.count) == (
+            1,
+            8,
+            4,
+            8,
+            3,
+        )
+        assert process_timestamp(hour.start) == start
+
+
+def test_statistics_error_does_not_stop_recording(hass_recorder):
+    """Test an error compiling statistics still records the state."""
+    hass = hass_recorder()
+
+    with patch(
+        "homeassistant.components.recorder.statistics.StatisticsCompiler.add_state",
+        side_effect=ValueError,
+    ):
+        hass.states.set("sensor.temp", "1")
+        wait_recording_done(hass)
+    hass.states.set("sensor.temp", "2")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).filter_by(entity_id="sensor.temp"))
+        assert [state.state for state in states] == ["1", "2"]
+
+
+def test_saving_event_shares_event_data(hass_recorder):
+    """Test events with equal data share the event data row."""
+    hass = hass_recorder()
+
+    hass.bus.fire("EVENT_TEST", {"test_attr": 5})
+    hass.bus.fire("EVENT_TEST", {"test_attr": 5})
+    wait_recording_done(hass)
+    hass.bus.fire("EVENT_TEST", {"test_attr": 5})
+    hass.bus.fire("EVENT_TEST", {"test_attr": 6})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        events = list(session.query(Events).filter_by(event_type="EVENT_TEST"))
+        assert len(events) == 4
+        assert all(event.event_data is None for event in events)
+        assert events[0].data_id == events[1].data_id == events[2].data_id
+        assert events[3].data_id != events[0].data_id
+        assert events[3].to_native().data == {"test_attr": 6}
+        assert (
+            session.query(EventData)
+            .filter(EventData.data_id.in_([events[0].data_id, events[3].data_id]))
+            .count()
+            == 2
+        )
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
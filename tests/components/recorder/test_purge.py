@@ -4,8 +4,15 @@ import json
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    Statistics,
+)
 from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.statistics import PERIOD_5MINUTE, PERIOD_HOUR
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
 
@@ -26,16 +33,89 @@ def test_purge_old_states(hass, hass_recorder):
 
         # run purge_old_data()
         finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
-        assert not finished
-        assert states.count() == 4
+        assert finished
+        assert states.count() == 2
 
-        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
-        assert not finished
+    progress = hass.data[DATA_INSTANCE].purge_progress
+    assert progress.finished
+    assert progress.batches == 1
+    assert progress.states_deleted == 4
+
+
+def test_purge_old_states_in_batches(hass, hass_recorder):
+    """Test deleting old states in batches unlinks newer states."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States).order_by(States.state_id).all()
+        states[4].old_state_id = states[3].state_id
+
+    with session_scope(hass=hass) as session, patch(
+        "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 3
+    ):
+        states = session.query(States)
+        assert not purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        assert states.count() == 3
+
+        assert purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
         assert states.count() == 2
+        assert all(state.old_state_id is None for state in states)
+
+    progress = hass.data[DATA_INSTANCE].purge_progress
+    assert progress.finished
+    assert progress.batches == 2
+    assert progress.states_deleted == 4
+
+
+def test_purge_unused_state_attributes(hass, hass_recorder):
+    """Test shared attributes are deleted with the last state using them."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        attributes = [
+            StateAttributes(attributes_id=1, hash=1, shared_attrs="{}"),
+            StateAttributes(attributes_id=2, hash=2, shared_attrs="{}"),
+        ]
+        session.add_all(attributes)
+        states = session.query(States).order_by(States.last_updated).all()
+        states[0].attributes_id = 1
+        states[1].attributes_id = 2
+        states[5].attributes_id = 2
 
+    with session_scope(hass=hass) as session:
         finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
         assert finished
-        assert states.count() == 2
+        remaining = [row.attributes_id for row in session.query(StateAttributes)]
+        assert remaining == [2]
+
+
+def test_purge_old_5minute_statistics(hass, hass_recorder):
+    """Test deleting old 5-minute statistics keeps the hourly statistics."""
+    hass = hass_recorder()
+    eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+
+    with session_scope(hass=hass) as session:
+        for period in (PERIOD_5MINUTE, PERIOD_HOUR):
+            for start in (eleven_days_ago, dt_util.utcnow()):
+                session.add(
+                    Statistics(
+                        entity_id="sensor.test",
+                        period=period,
+                        start=start,
+                        min=1,
+                        max=1,
+                        mean=1,
+                        last=1,
+                        count=1,
+                    )
+                )
+
+    with session_scope(hass=hass) as session:
+        assert purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        assert session.query(Statistics).filter_by(period=PERIOD_5MINUTE).count() == 1
+        assert session.query(Statistics).filter_by(period=PERIOD_HOUR).count() == 2
 
 
 def test_purge_old_events(hass, hass_recorder):
@@ -49,16 +129,8 @@ def test_purge_old_events(hass, hass_recorder):
 
         # run purge_old_data()
         finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
-        assert not finished
-        assert events.count() == 4
-
-        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
-        assert not finished
-        assert events.count() == 2
-
-        # we should only have 2 events left
-        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
         assert finished
+        # we should only have 2 events left
         assert events.count() == 2
 
 
@@ -122,10 +194,9 @@ def test_purge_method(hass, hass_recorder):
             hass.block_till_done()
             hass.data[DATA_INSTANCE].block_till_done()
             wait_recording_done(hass)
-            assert (
-                mock_logger.debug.mock_calls[5][1][0]
-                == "Vacuuming SQL DB to free space"
-            )
+            assert "Incrementally vacuuming SQL DB to free space" in [
+                call[1][0] for call in mock_logger.debug.mock_calls
+            ]
 
 
 def _add_test_states(hass):
@@ -0,0 +1,65 @@
+"""The tests for the rolling statistics of the statistics sensor."""
+from datetime import timedelta
+import random
+import statistics
+
+import pytest
+
+from homeassistant.components.statistics.rolling import RollingStatistics
+from homeassistant.util import dt as dt_util
+
+
+def _assert_matches(window, values):
+    """Assert the window statistics match those computed from scratch."""
+    assert len(window) == len(values)
+    assert list(window.values) == values
+    assert window.mean == pytest.approx(statistics.mean(values))
+    assert window.median == statistics.median(values)
+    assert window.total == pytest.approx(sum(values))
+    assert window.min == min(values)
+    assert window.max == max(values)
+    if len(values) > 1:
+        assert window.variance == pytest.approx(statistics.variance(values), abs=1e-9)
+        assert window.stdev == pytest.approx(statistics.stdev(values), abs=1e-9)
+    else:
+        assert window.variance is None
+        assert window.stdev is None
+
+
+@pytest.mark.parametrize("maxlen", [1, 2, 7, 50])
+def test_sliding_window(maxlen):
+    """Test the statistics follow a window limited by count."""
+    rand = random.Random(maxlen)
+    now = dt_util.utcnow()
+    window = RollingStatistics(maxlen)
+    values = []
+
+    for index in range(300):
+        # Few distinct values to exercise duplicates in the median
+        value = float(rand.randint(-20, 20))
+        window.append(value, now + timedelta(seconds=index))
+        values = (values + [value])[-maxlen:]
+        _assert_matches(window, values)
+
+
+def test_purge_before():
+    """Test removing samples by age."""
+    now = dt_util.utcnow()
+    window = RollingStatistics(100)
+    for index, value in enumerate([5.0, 1.0, 9.0, 3.0, 7.0]):
+        window.append(value, now + timedelta(minutes=index))
+
+    assert window.purge_before(now + timedelta(minutes=2)) == 2
+    _assert_matches(window, [9.0, 3.0, 7.0])
+    assert window.ages[0] == now + timedelta(minutes=2)
+
+    assert window.purge_before(now + timedelta(hours=1)) == 3
+    assert len(window) == 0
+    assert window.mean is None
+    assert window.median is None
+    assert window.min is None
+    assert window.max is None
+    assert window.total == 0
+
+    window.append(4.0, now)
+    _assert_matches(window, [4.0])
@@ -320,6 +320,170 @@ async def test_states_filters_visible(hass, hass_admin_user, websocket_client):
     assert msg["result"][0]["entity_id"] == "test.entity"
 
 
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribing to and updating the entities of a subscription."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.other": True}}}
+    )
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.permitted", "light.not_permitted"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+    assert msg["result"] == {"entity_ids": ["light.permitted"]}
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.permitted", "on")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == "event"
+    assert msg["event"]["event_type"] == "state_changed"
+    assert msg["event"]["data"]["entity_id"] == "light.permitted"
+
+    await websocket_client.send_json(
+        {
+            "id": 6,
+            "type": "update_entity_subscription",
+            "subscription": 5,
+            "entity_ids": ["light.other"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+    assert msg["result"] == {"entity_ids": ["light.other"]}
+
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "off")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["event"]["data"]["entity_id"] == "light.other"
+    assert msg["event"]["data"]["new_state"]["state"] == "off"
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["success"]
+
+
+async def test_subscribe_entities_diff(hass, websocket_client):
+    """Test a diff subscription sends coalesced changes."""
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "color": "red"})
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen", "light.hall"],
+            "diff": True,
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == "event"
+    kitchen = msg["event"]["a"]["light.kitchen"]
+    assert kitchen["s"] == "on"
+    assert kitchen["a"] == {"brightness": 100, "color": "red"}
+
+    hass.states.async_set("light.kitchen", "off", {"brightness": 100, "color": "red"})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 50})
+    hass.states.async_set("light.hall", "on")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["event"]["a"]["light.hall"]["s"] == "on"
+    diff = msg["event"]["c"]["light.kitchen"]
+    assert "s" not in diff["+"]
+    assert diff["+"]["a"] == {"brightness": 50}
+    assert diff["-"] == {"a": ["color"]}
+
+    hass.states.async_remove("light.hall")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.hall"]}
+
+
+async def test_update_entity_subscription_diff(hass, websocket_client):
+    """Test updating a diff subscription adds and removes entities."""
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.hall", "off")
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen"],
+            "diff": True,
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.kitchen"]
+
+    await websocket_client.send_json(
+        {
+            "id": 6,
+            "type": "update_entity_subscription",
+            "subscription": 5,
+            "entity_ids": ["light.hall"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["result"] == {"entity_ids": ["light.hall"]}
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert list(msg["event"]["a"]) == ["light.hall"]
+    assert msg["event"]["r"] == ["light.kitchen"]
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hall", "on")
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]) == ["c"]
+    assert list(msg["event"]["c"]) == ["light.hall"]
+    assert msg["event"]["c"]["light.hall"]["+"]["s"] == "on"
+
+
+async def test_update_entity_subscription_not_found(hass, websocket_client):
+    """Test updating an unknown entity subscription."""
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    for subscription in (5, 99):
+        await websocket_client.send_json(
+            {
+                "id": subscription + 1,
+                "type": "update_entity_subscription",
+                "subscription": subscription,
+                "entity_ids": ["light.kitchen"],
+            }
+        )
+        msg = await websocket_client.receive_json()
+        assert not msg["success"]
+        assert msg["error"]["code"] == const.ERR_NOT_FOUND
+
+
 async def test_get_states_not_allows_nan(hass, websocket_client):
     """Test get_states command not allows NaN floats."""
     hass.states.async_set("greeting.hello", "world", {"hello": float("NaN")})
@@ -863,3 +1027,58 @@ async def test_test_condition(hass, websocket_client):
     assert msg["type"] == const.TYPE_RESULT
     assert msg["success"]
     assert msg["result"]["result"] is True
+
+
+async def test_event_bus_metrics(hass, websocket_client):
+    """Test enabling and reading the event bus metrics."""
+    await websocket_client.send_json({"id": 5, "type": "event_bus/metrics"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["enabled"] is False
+    assert msg["result"]["event_types"] == {}
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "event_bus/metrics", "enable": True}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["enabled"] is True
+
+    hass.bus.async_listen("test_event", callback(lambda event: None))
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 7, "type": "event_bus/metrics"})
+    msg = await websocket_client.receive_json()
+    metrics = msg["result"]["event_types"]["test_event"]
+    assert metrics["fired"] == 2
+    assert metrics["listeners"] == 1
+    assert metrics["callbacks"] == 2
+    assert metrics["callback_time"] >= 0
+    assert msg["result"]["listeners"]["test_event"] == 1
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "event_bus/metrics", "enable": False}
+    )
+    msg = await websocket_client.receive_json()
+    assert set(msg["result"].pop("json_cache")) == {"hits", "misses"}
+    assert msg["result"] == {
+        "enabled": False,
+        "listeners": hass.bus.async_listeners(),
+        "event_types": {},
+    }
+
+
+async def test_event_bus_metrics_requires_admin(
+    hass, websocket_client, hass_admin_user
+):
+    """Test the event bus metrics are only available to admins."""
+    hass_admin_user.groups = []
+    await websocket_client.send_json(
+        {"id": 5, "type": "event_bus/metrics", "enable": True}
+    )
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+    assert hass.bus.async_metrics() is None
@@ -3,10 +3,13 @@
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
     cached_event_message,
+    compressed_state_dict,
+    compressed_state_diff,
     message_to_json,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.core import callback
+from homeassistant.core import State, callback
+import homeassistant.util.dt as dt_util
 
 
 async def test_cached_event_message(hass):
@@ -96,3 +99,25 @@ async def test_message_to_json(caplog):
 
 class _Unserializeable:
     """A class that cannot be serialized."""
+
+
+def test_compressed_state_diff():
+    """Test the diff of compressed states only contains changes."""
+    now = dt_util.utcnow()
+    old = compressed_state_dict(
+        State("light.window", "on", {"brightness": 100, "color": "red"}, now, now)
+    )
+    assert old == {
+        "s": "on",
+        "a": {"brightness": 100, "color": "red"},
+        "c": old["c"],
+        "lc": now.timestamp(),
+        "lu": now.timestamp(),
+    }
+    assert compressed_state_diff(old, old) == {}
+
+    new = dict(old, a={"brightness": 50, "effect": "none"}, lu=now.timestamp() + 1)
+    assert compressed_state_diff(old, new) == {
+        "+": {"a": {"brightness": 50, "effect": "none"}, "lu": now.timestamp() + 1},
+        "-": {"a": ["color"]},
+    }
@@ -669,6 +669,58 @@ async def test_numeric_state_using_input_number(hass):
     )
 
 
+async def test_compile_numeric_range(hass):
+    """Test compiled numeric ranges follow the state of threshold entities."""
+    in_range = condition.async_compile_numeric_range(
+        hass, below="input_number.high", above=10
+    )
+    # No threshold entity
+    assert not in_range(42)
+
+    hass.states.async_set("input_number.high", 100)
+    assert in_range(42)
+    assert not in_range(10)
+    assert not in_range(100)
+
+    with patch(
+        "homeassistant.helpers.condition.float", side_effect=float, create=True
+    ) as mock_float:
+        assert in_range(42)
+        assert in_range(43)
+        # The threshold is converted once per state of the entity
+        assert mock_float.call_count == 0
+
+        hass.states.async_set("input_number.high", 40)
+        assert not in_range(42)
+        assert in_range(39)
+        assert mock_float.call_count == 1
+
+    hass.states.async_set("input_number.high", "unavailable")
+    assert not in_range(42)
+
+
+async def test_compile_numeric_state(hass):
+    """Test compiled numeric state tests."""
+    test = condition.async_compile_numeric_state(hass, below=10, attribute="attribute1")
+    hass.states.async_set("sensor.temperature", 100, {"attribute1": 5})
+    assert test("sensor.temperature", None)
+    assert test(hass.states.get("sensor.temperature"), None)
+
+    hass.states.async_set("sensor.temperature", 5, {"attribute1": 15})
+    assert not test("sensor.temperature", None)
+    assert not test("sensor.not_exist", None)
+
+    assert condition.async_numeric_state_value(hass, "sensor.temperature") == 5
+    assert (
+        condition.async_numeric_state_value(
+            hass, "sensor.temperature", attribute="attribute1"
+        )
+        == 15
+    )
+    hass.states.async_set("sensor.temperature", "unknown")
+    assert condition.async_numeric_state_value(hass, "sensor.temperature") is None
+
+
 async def test_zone_multiple_entities(hass):
     """Test with multiple entities in condition."""
     test = await condition.async_from_config(
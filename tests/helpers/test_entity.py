@@ -650,6 +650,52 @@ async def test_capability_attrs(hass):
     assert state.attributes["always"] == "there"
 
 
+async def test_static_attributes_cached(hass):
+    """Test static attributes are read once and unchanged attributes reused."""
+    icon = PropertyMock(return_value="mdi:flash")
+    with patch.object(
+        entity.Entity, "static_attributes", PropertyMock(return_value=True)
+    ), patch.object(entity.Entity, "icon", icon), patch.object(
+        entity.Entity, "unit_of_measurement", PropertyMock(return_value="W")
+    ), patch.object(
+        entity.Entity, "state", PropertyMock(side_effect=["1", "2", "3"])
+    ):
+        ent = entity.Entity()
+        ent.hass = hass
+        ent.entity_id = "sensor.power"
+        ent.async_write_ha_state()
+        first = hass.states.get("sensor.power")
+
+        ent.async_write_ha_state()
+        second = hass.states.get("sensor.power")
+
+        icon.return_value = "mdi:lightning-bolt"
+        ent.async_invalidate_static_attributes()
+        ent.async_write_ha_state()
+        third = hass.states.get("sensor.power")
+
+    assert icon.call_count == 2
+    assert first.attributes == {"icon": "mdi:flash", "unit_of_measurement": "W"}
+    assert second.state == "2"
+    assert second.attributes is first.attributes
+    assert third.attributes["icon"] == "mdi:lightning-bolt"
+
+
+async def test_static_attributes_not_reused_after_external_set(hass):
+    """Test attributes are rebuilt when the state was set by someone else."""
+    with patch.object(
+        entity.Entity, "static_attributes", PropertyMock(return_value=True)
+    ), patch.object(entity.Entity, "icon", PropertyMock(return_value="mdi:flash")):
+        ent = entity.Entity()
+        ent.hass = hass
+        ent.entity_id = "sensor.power"
+        ent.async_write_ha_state()
+        hass.states.async_set("sensor.power", "unknown", {"other": True})
+        ent.async_write_ha_state()
+
+    assert hass.states.get("sensor.power").attributes == {"icon": "mdi:flash"}
+
+
 async def test_warn_slow_write_state(hass, caplog):
     """Check that we log a warning if reading properties takes too long."""
     mock_entity = entity.Entity()
@@ -14,10 +14,13 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_TEMPLATE_RENDER_SCHEDULER,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_template_render_stats,
+    async_timer_wheel_stats,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -93,6 +96,82 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_utc_time_wheel(hass):
+    """Test point in time listeners of all levels of the timer wheel."""
+    now = dt_util.utcnow()
+    runs = []
+
+    for delay in (100, 2, 5000, 3, 2):
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda _, delay=delay: runs.append(delay)),
+            now + timedelta(seconds=delay),
+        )
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda _: runs.append("cancelled")), now + timedelta(seconds=50)
+    )
+    unsub()
+    assert async_timer_wheel_stats(hass)["size"] == 5
+
+    async_fire_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert runs == [2, 2, 3]
+
+    async_fire_time_changed(hass, now + timedelta(seconds=6000))
+    await hass.async_block_till_done()
+    assert runs == [2, 2, 3, 100, 5000]
+
+    stats = async_timer_wheel_stats(hass)
+    assert stats["size"] == 0
+    assert stats["fired"] == 5
+    assert stats["max_latency"] >= 5900
+
+
+async def test_track_point_in_utc_time_wheel_error(hass, caplog):
+    """Test a failing point in time listener does not stop the others."""
+    now = dt_util.utcnow()
+    runs = []
+
+    @callback
+    def fail(_):
+        raise ValueError("Oops")
+
+    async_track_point_in_utc_time(hass, fail, now + timedelta(seconds=1))
+    async_track_point_in_utc_time(
+        hass, callback(lambda _: runs.append(1)), now + timedelta(seconds=1)
+    )
+
+    async_fire_time_changed(hass, now + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert runs == [1]
+    assert "Error running timer" in caplog.text
+
+
+async def test_track_point_in_utc_time_wheel_cancel_due(hass):
+    """Test a due listener cancelled by an earlier one in the batch is skipped."""
+    now = dt_util.utcnow()
+    runs = []
+
+    @callback
+    def first(_):
+        runs.append("a")
+        unsub_second()
+
+    async_track_point_in_utc_time(hass, first, now + timedelta(seconds=1))
+    unsub_second = async_track_point_in_utc_time(
+        hass,
+        callback(lambda _: runs.append("b")),
+        now + timedelta(seconds=1, milliseconds=1),
+    )
+
+    async_fire_time_changed(hass, now + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert runs == ["a"]
+    stats = async_timer_wheel_stats(hass)
+    assert stats["size"] == 0
+    assert stats["fired"] == 1
+
+
 async def test_track_point_in_time_drift_rearm(hass):
     """Test tasks with the time rolling backwards."""
     specific_runs = []
@@ -2294,6 +2373,131 @@ async def test_async_track_template_result_multiple_templates_mixing_listeners(h
     ]
 
 
+async def test_track_template_result_coalesces_changes(hass):
+    """Test changes within the same loop iteration render producers once."""
+    template = Template("{{ states('sensor.a') }}-{{ states('sensor.b') }}", hass)
+    dependent_template = Template("{{ states('sensor.ab') }}", hass)
+    independent_template = Template(
+        "{{ states('sensor.b') }}-{{ states('sensor.a') }}", hass
+    )
+    runs = []
+    independent_runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        runs.append(updates.pop().result)
+        hass.states.async_set("sensor.ab", runs[-1])
+
+    @ha.callback
+    def independent_listener(event, updates):
+        independent_runs.append(updates.pop().result)
+
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "1")
+    async_track_template_result(
+        hass,
+        [TrackTemplate(template, None)],
+        refresh_listener,
+        output_entity_id="sensor.ab",
+    )
+    async_track_template_result(
+        hass, [TrackTemplate(dependent_template, None)], lambda *args: None
+    )
+    async_track_template_result(
+        hass, [TrackTemplate(independent_template, None)], independent_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.a", "2")
+    hass.states.async_set("sensor.b", "3")
+    # Trackers nothing depends on refresh right away
+    await hass.async_block_till_done()
+
+    assert runs == ["2-3"]
+    assert independent_runs == ["3-2"]
+    stats = async_template_render_stats(hass)
+    assert stats[template.template]["renders"] == 1
+    assert stats[template.template]["render_time"] >= 0
+    assert stats[independent_template.template]["renders"] == 2
+
+
+async def test_track_template_result_dependency_index(hass):
+    """Test the depth of trackers follows producers added and removed."""
+    hass.states.async_set("sensor.source", "1")
+    first = async_track_template_result(
+        hass,
+        [TrackTemplate(Template("{{ states('sensor.source') }}", hass), None)],
+        lambda *args: None,
+        output_entity_id="sensor.first",
+    )
+    last = async_track_template_result(
+        hass,
+        [TrackTemplate(Template("{{ states.sensor | count }}", hass), None)],
+        lambda *args: None,
+    )
+    scheduler = hass.data[TRACK_TEMPLATE_RENDER_SCHEDULER]
+    assert scheduler._depth(last) == 1
+
+    second = async_track_template_result(
+        hass,
+        [TrackTemplate(Template("{{ states('sensor.first') }}", hass), None)],
+        lambda *args: None,
+        output_entity_id="sensor.second",
+    )
+    assert scheduler._depth(second) == 1
+    assert scheduler._depth(last) == 2
+
+    first.async_remove()
+    assert scheduler._depth(second) == 0
+    assert scheduler._depth(last) == 1
+    assert scheduler._dependents("sensor.first") == [second, last]
+
+    second.async_remove()
+    last.async_remove()
+    assert not scheduler._domain_dependents
+    assert not scheduler._entity_dependents
+
+
+async def test_track_template_result_output_entity_order(hass):
+    """Test trackers that render an output entity refresh after its producer."""
+    producer_template = Template("{{ states('sensor.source') | int * 2 }}", hass)
+    dependent_template = Template(
+        "{{ states('sensor.source') }}-{{ states('sensor.double') }}", hass
+    )
+    dependent_runs = []
+
+    @ha.callback
+    def dependent_listener(event, updates):
+        dependent_runs.append(updates.pop().result)
+
+    @ha.callback
+    def producer_listener(event, updates):
+        hass.states.async_set("sensor.double", updates.pop().result)
+
+    hass.states.async_set("sensor.source", "1")
+    hass.states.async_set("sensor.double", "2")
+    # Registered first so it would otherwise refresh before the producer
+    dependent = async_track_template_result(
+        hass, [TrackTemplate(dependent_template, None)], dependent_listener
+    )
+    async_track_template_result(
+        hass,
+        [TrackTemplate(producer_template, None)],
+        producer_listener,
+        output_entity_id="sensor.double",
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.source", "5")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.double").state == "10"
+    assert dependent_runs == ["5-10"]
+
+    dependent.async_remove()
+    assert dependent_template.template not in async_template_render_stats(hass)
+
+
 async def test_track_same_state_simple_no_trigger(hass):
     """Test track_same_change with no trigger."""
     callback_runs = []
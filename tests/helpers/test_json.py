@@ -1,8 +1,10 @@
 """Test Home Assistant remote methods and classes."""
+import json
+
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_dict_with_fragments
 from homeassistant.util import dt as dt_util
 
 
@@ -19,3 +21,14 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_dict_with_fragments():
+    """Test encoding a dict with already encoded values."""
+    obj = {"a": 1, "b": {"c": [1, 2]}, "d": None}
+    encoded = json_dict_with_fragments(obj, {"b": '{"c": [1, 2]}'})
+    assert json.loads(encoded) == obj
+
+    obj = {1: "one", "b": {"c": 2}, None: True}
+    encoded = json_dict_with_fragments(obj, {"b": '{"c": 2}'})
+    assert json.loads(encoded) == {"1": "one", "b": {"c": 2}, "null": True}
@@ -2056,35 +2056,40 @@ def test_urlencode(hass):
     assert tpl.async_render() == "the%20quick%20brown%20fox%20%3D%20true"
 
 
-async def test_cache_garbage_collection():
-    """Test caching a template."""
+async def test_compile_cache():
+    """Test templates share compiled code, also after they are gone."""
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
-    tpl = template.Template(
-        (template_string),
-    )
+    tpl = template.Template(template_string)
     tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-
-    tpl2 = template.Template(
-        (template_string),
-    )
+    tpl2 = template.Template(template_string)
     tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-
-    del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-    del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    # pylint: disable=protected-access
+    code = tpl._compiled_code
+    assert tpl2._compiled_code is code
+
+    del tpl, tpl2
+    tpl3 = template.Template(template_string)
+    tpl3.ensure_valid()
+    assert tpl3._compiled_code is code
+
+
+async def test_parse_result_cache(hass):
+    """Test parsed results are shared unless they are containers."""
+    tpl = template.Template("{{ 40 + 2 }}", hass)
+    assert tpl.async_render() == 42
+    assert tpl.async_render() == 42
+
+    static = template.Template("[1, 2]", hass)
+    result = static.async_render()
+    assert result == [1, 2]
+    result.append(3)
+    assert static.async_render() == [1, 2]
+
+    tpl = template.Template("{{ states('sensor.missing') }}", hass)
+    assert tpl.async_render() == "unknown"
+    assert template.Template("12.5", hass).async_render() == 12.5
 
 
 def test_is_template_string():
@@ -240,6 +240,43 @@ async def test_setup_after_deps_via_platform(hass):
     assert order == ["after_dep_of_platform_int", "platform_int"]
 
 
+async def test_import_profile(hass, hass_storage):
+    """Test slowest imports start first and import times are stored."""
+    hass_storage[bootstrap.IMPORT_PROFILE_STORAGE_KEY] = {
+        "version": bootstrap.IMPORT_PROFILE_STORAGE_VERSION,
+        "key": bootstrap.IMPORT_PROFILE_STORAGE_KEY,
+        "data": {
+            "fast_int": {"import": 0.1, "setup": 0.1},
+            "slow_int": {"import": 5.0, "setup": 0.1},
+            "removed_int": {"import": 9.0, "setup": 0.1},
+        },
+    }
+    mock_integration(hass, MockModule(domain="fast_int"))
+    mock_integration(hass, MockModule(domain="slow_int"))
+    mock_integration(hass, MockModule(domain="platform_int"))
+    mock_entity_platform(hass, "light.platform_int", MockPlatform())
+
+    with patch(
+        "homeassistant.bootstrap.async_preimport_integrations",
+        wraps=bootstrap.async_preimport_integrations,
+    ) as preimport:
+        await bootstrap._async_set_up_integrations(
+            hass,
+            {"fast_int": {}, "slow_int": {}, "light": {"platform": "platform_int"}},
+        )
+        await hass.async_block_till_done()
+
+    integrations, platforms = preimport.call_args[0][1:]
+    assert [itg.domain for itg in integrations][:2] == ["slow_int", "fast_int"]
+    assert platforms["platform_int"] == {"light"}
+
+    profile = hass_storage[bootstrap.IMPORT_PROFILE_STORAGE_KEY]["data"]
+    assert "removed_int" not in profile
+    assert set(profile["fast_int"]) == {"import", "setup"}
+    assert profile["slow_int"]["setup"] != 0.1
+    assert profile["platform_int"]["platforms"] == ["light"]
+
+
 async def test_setup_after_deps_not_trigger_load(hass):
     """Test after_dependencies does not trigger loading it."""
     order = []
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -34,6 +35,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError, InvalidStateError
+from homeassistant.helpers.json import JSON_CACHE_INFO, JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -484,6 +486,77 @@ class TestEventBus(unittest.TestCase):
         assert len(coroutine_calls) == 1
 
 
+async def test_eventbus_rebuilds_dispatch_on_listener_changes(hass):
+    """Test fired events reach listeners added and removed in between."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(("test", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        calls.append((MATCH_ALL, event.event_type))
+
+    unsub = hass.bus.async_listen("test", listener)
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert calls == [("test", "test")]
+
+    unsub_all = hass.bus.async_listen(MATCH_ALL, match_all_listener)
+    hass.bus.async_fire("test")
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert calls[1:] == [(MATCH_ALL, "test"), ("test", "test")]
+
+    unsub()
+    unsub_all()
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+
+async def test_eventbus_metrics(hass):
+    """Test the event bus records dispatch metrics when enabled."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Listen in a callback."""
+        calls.append(event)
+
+    async def coro_listener(event):
+        """Listen in a coroutine."""
+
+    hass.bus.async_listen("test", listener)
+    hass.bus.async_listen("test", coro_listener)
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert hass.bus.async_metrics() is None
+
+    hass.bus.async_set_metrics_enabled(True)
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    metrics = hass.bus.async_metrics()
+    assert metrics["test"]["fired"] == 2
+    assert metrics["test"]["listeners"] == 2
+    assert metrics["test"]["callbacks"] == 2
+    assert metrics["test"]["callback_time"] > 0
+    assert metrics["other"] == {
+        "fired": 1,
+        "listeners": 0,
+        "callbacks": 0,
+        "callback_time": 0.0,
+    }
+
+    hass.bus.async_set_metrics_enabled(False)
+    assert hass.bus.async_metrics() is None
+
+
 def test_state_init():
     """Test state.init."""
     with pytest.raises(InvalidEntityFormatError):
@@ -1563,6 +1636,45 @@ async def test_hassjob_forbid_coroutine():
     await coro
 
 
+async def test_statemachine_shares_unchanged_attributes(hass):
+    """Test states with equal attributes share the mapping and its copy."""
+    hass.states.async_set("light.bedroom", "on", {"brightness": 100})
+    first = hass.states.get("light.bedroom")
+    first_dict = first.as_dict()
+
+    hass.states.async_set("light.bedroom", "off", {"brightness": 100})
+    second = hass.states.get("light.bedroom")
+    assert second.attributes is first.attributes
+    assert second.as_dict()["attributes"] is first_dict["attributes"]
+    assert second.as_dict()["state"] == "off"
+
+    hass.states.async_set("light.bedroom", "on", {"brightness": 50})
+    third = hass.states.get("light.bedroom")
+    assert third.attributes is not second.attributes
+    assert third.as_dict()["attributes"] == {"brightness": 50}
+
+
+def test_state_and_event_as_json():
+    """Test the memoized JSON matches encoding the dicts."""
+    dump = functools.partial(json.dumps, cls=JSONEncoder)
+    old_state = ha.State("light.bedroom", "off", {"brightness": 50})
+    new_state = ha.State("light.bedroom", "on", {"brightness": 100})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.bedroom", "old_state": old_state, "new_state": new_state},
+    )
+    hits = JSON_CACHE_INFO.hits
+
+    assert new_state.as_json() == dump(new_state.as_dict())
+    assert new_state.attributes_json() == dump({"brightness": 100})
+    assert event.as_json() == dump(event.as_dict())
+    assert event.data_json() == dump(event.data)
+    assert json.loads(event.as_json())["data"]["new_state"]["state"] == "on"
+    # The event reused the JSON of the new state
+    assert JSON_CACHE_INFO.hits > hits
+    assert event.as_json() is event.as_json()
+
+
 async def test_reserving_states(hass):
     """Test we can reserve a state in the state machine."""
 